@@ -8,6 +8,7 @@
 """
 
 import os
+import sys
 import json
 import pandas as pd
 from pathlib import Path
@@ -25,6 +26,12 @@ def get_project_root() -> Path:
     return script_path.parent.parent
 
 
+# 添加src目录到Python路径，以便复用国家代码表
+sys.path.append(os.path.join(get_project_root(), "src"))
+
+from data.country_codes import ISO3_CODES, COUNTRY_ALIASES, country_iso3
+
+
 def load_military_data(json_file: str) -> pd.DataFrame:
     """
     加载已转换的军事数据JSON文件
@@ -51,70 +58,15 @@ def generate_country_codes() -> Dict[str, str]:
     生成国家名称到ISO代码的映射
     
     Returns:
-        国家名称到ISO代码的字典映射
+        国家名称（含常见别名）到ISO-3代码的字典映射
     """
-    # 常用国家名称到ISO代码的映射
-    # 这里只包含一部分主要国家，实际应用中可能需要更完整的映射
-    return {
-        "United States": "USA",
-        "China": "CHN",
-        "Russia": "RUS",
-        "United Kingdom": "GBR",
-        "UK": "GBR",
-        "India": "IND",
-        "France": "FRA",
-        "Germany": "DEU",
-        "Japan": "JPN",
-        "South Korea": "KOR",
-        "Korea, South": "KOR",
-        "North Korea": "PRK",
-        "Korea, North": "PRK",
-        "Italy": "ITA",
-        "Brazil": "BRA",
-        "Canada": "CAN",
-        "Australia": "AUS",
-        "Spain": "ESP",
-        "Turkey": "TUR",
-        "Israel": "ISR",
-        "Iran": "IRN",
-        "Indonesia": "IDN",
-        "Pakistan": "PAK",
-        "Saudi Arabia": "SAU",
-        "Poland": "POL",
-        "Ukraine": "UKR",
-        "Egypt": "EGY",
-        "Thailand": "THA",
-        "Colombia": "COL",
-        "Mexico": "MEX",
-        "Malaysia": "MYS",
-        "Netherlands": "NLD",
-        "Argentina": "ARG",
-        "Sweden": "SWE",
-        "Switzerland": "CHE",
-        "Belgium": "BEL",
-        "Norway": "NOR",
-        "Vietnam": "VNM",
-        "Portugal": "PRT",
-        "Romania": "ROU",
-        "Bangladesh": "BGD",
-        "Greece": "GRC",
-        "Czech Republic": "CZE",
-        "Denmark": "DNK",
-        "Finland": "FIN",
-        "Austria": "AUT",
-        "New Zealand": "NZL",
-        "Singapore": "SGP",
-        "South Africa": "ZAF",
-        "Algeria": "DZA",
-        "Chile": "CHL",
-        "Hungary": "HUN",
-        "Iraq": "IRQ",
-        "Peru": "PER",
-        "Philippines": "PHL",
-        "Kazakhstan": "KAZ",
-        "Morocco": "MAR"
-        # 实际应用中应该添加更多国家
-    }
+    # 完整的代码表和别名表与DataLoader共用（src/data/country_codes.py）
+    codes = dict(ISO3_CODES)
+    for alias in COUNTRY_ALIASES:
+        code = country_iso3(alias)
+        if code:
+            codes[alias] = code
+    return codes
 
 
 def generate_country_coordinates() -> Dict[str, Dict[str, float]]:
@@ -201,15 +153,14 @@ def generate_country_metadata():
     # 加载从军事数据中提取的国家列表
     countries = load_countries_from_data(output_dir)
     
-    # 获取国家代码和坐标映射
-    country_codes = generate_country_codes()
+    # 获取坐标映射（ISO代码按归一化名称查表，数据中的任意写法都能匹配）
     country_coordinates = generate_country_coordinates()
     
     # 创建元数据字典
     metadata = {}
     for country in countries:
         metadata[country] = {
-            "iso_code": country_codes.get(country, ""),
+            "iso_code": country_iso3(country) or "",
             "coordinates": country_coordinates.get(country, {"lat": 0, "lon": 0})
         }
     
@@ -26,6 +26,15 @@ def get_project_root() -> Path:
     return script_path.parent.parent
 
 
+# 添加src目录到Python路径，以便与DataLoader共用数据清洗步骤
+sys.path.append(os.path.join(get_project_root(), "src"))
+
+from data.ingest import header_years, ingest_frame
+
+# 没有表头行的Excel文件的年份范围（见rbdata/README.md）
+DEFAULT_YEARS = list(range(1948, 2024))
+
+
 def load_excel_data(file_path: str) -> pd.DataFrame:
     """
     加载Excel数据文件
@@ -63,8 +72,9 @@ def process_dataframe(df: pd.DataFrame, file_name: str) -> pd.DataFrame:
     # 设置列名
     continent = file_name.split('.')[0]
     
-    # 使用1960-2022年的年份范围作为列名（与data_loader.py中一致）
-    years = list(range(1960, 2023))
+    # 有年份表头行（如current_data.xlsx的第一行）时以表头中的年份作为列名，
+    # 否则使用1948-2023年的年份范围（与data_loader.py中一致）
+    years = [year for year in (header_years(df) or []) if year is not None] or DEFAULT_YEARS
     column_names = ['Country'] + [str(year) for year in years]
     
     # 确保列数匹配（如果不匹配，进行调整）
@@ -88,6 +98,11 @@ def process_dataframe(df: pd.DataFrame, file_name: str) -> pd.DataFrame:
         if str(col).isdigit():
             df[col] = pd.to_numeric(df[col], errors='coerce')
     
+    # 删除表头行、国家名称为空的行和重复的国家
+    df, _, dropped = ingest_frame(df)
+    if any(dropped.values()):
+        print(f"{file_name}: 删除表头行 {dropped['header']} 行、空行 {dropped['blank']} 行、重复国家 {dropped['duplicate']} 行")
+    
     # 添加大洲信息列
     df['Continent'] = continent
     
@@ -157,7 +172,8 @@ def convert_single_file(input_file: str, output_dir: str):
     # 输出数据基本信息
     print(f"文件 {file_base} 统计信息:")
     print(f"- 国家数量: {len(df)}")
-    print(f"- 年份范围: 1960-2022")
+    years = [int(col) for col in df.columns if str(col).isdigit()]
+    print(f"- 年份范围: {years[0]}-{years[-1]}")
     print(f"- 输出JSON文件: {output_file}")
     print("-" * 50)
 
@@ -189,6 +205,9 @@ def convert_all_files():
         print(f"警告: 在 {input_dir} 中未找到Excel文件！")
         return
     
+    # 各大洲文件排在合并文件current_data.xlsx之前：同一国家以所在大洲的文件为准
+    excel_files.sort(key=lambda f: (os.path.basename(f) == "current_data.xlsx", os.path.basename(f)))
+    
     print(f"找到 {len(excel_files)} 个Excel文件:")
     for file in excel_files:
         print(f"- {os.path.basename(file)}")
@@ -209,13 +228,17 @@ def convert_all_files():
     if all_dfs:
         combined_df = pd.concat(all_dfs, ignore_index=True)
         
+        # 每个国家只保留一条记录（取排在前面的文件），避免汇总和导出时重复计算
+        combined_df, _, dropped = ingest_frame(combined_df)
+        print(f"合并数据: 删除重复国家 {dropped['duplicate']} 行，保留 {len(combined_df)} 行")
+        
         # 转换合并后的数据为JSON
         output_file = os.path.join(output_dir, "all_military_data.json")
         convert_to_json(combined_df, output_file)
         
         # 创建按年份组织的数据
         years_data = {}
-        for year in range(1960, 2023):
+        for year in [int(col) for col in combined_df.columns if str(col).isdigit()]:
             year_str = str(year)
             year_df = combined_df[['Country', 'Continent', year_str]].copy()
             year_df.rename(columns={year_str: 'Expenditure'}, inplace=True)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+内存占用报告脚本
+分别以常规模式和紧凑模式加载数据，比较缓存数据的内存占用和加载过程中的峰值分配
+"""
+
+import os
+import sys
+import argparse
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+def get_project_root() -> Path:
+    """
+    获取项目根目录
+
+    Returns:
+        项目根目录的Path对象
+    """
+    script_path = Path(os.path.abspath(__file__))
+    return script_path.parent.parent
+
+
+# 添加src目录到Python路径，以便复用DataLoader
+sys.path.append(os.path.join(get_project_root(), "src"))
+
+from data.data_loader import DataLoader
+
+
+def measure(data_dir: str, compact: bool, backend: str,
+            year_window: Optional[Tuple[int, int]] = None) -> Tuple[Dict[str, int], int]:
+    """
+    加载数据并统计内存占用
+
+    Args:
+        data_dir: 数据目录
+        compact: 是否使用紧凑模式
+        backend: 存储后端
+        year_window: 只加载的年份范围，默认加载所有年份
+
+    Returns:
+        (各缓存项字节数, 加载过程中的峰值分配字节数)
+    """
+    tracemalloc.start()
+    try:
+        loader = DataLoader(data_dir=data_dir, backend=backend, compact=compact, year_window=year_window)
+        loader.get_all_data()
+        loader.get_matrix()
+        loader.get_continent_totals()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return loader.memory_report(), peak
+
+
+def format_size(size: int) -> str:
+    """
+    格式化字节数
+
+    Args:
+        size: 字节数
+
+    Returns:
+        格式化后的字符串
+    """
+    if size >= 1 << 20:
+        return f"{size / (1 << 20):.2f} MB"
+    return f"{size / 1024:.1f} KB"
+
+
+def parse_years(text: str) -> Tuple[int, int]:
+    """
+    解析年份范围参数
+
+    Args:
+        text: 形如"2000-2022"的年份范围
+
+    Returns:
+        (起始年份, 结束年份)
+    """
+    try:
+        start, end = (int(part) for part in text.split("-"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"年份范围格式应为 起始年份-结束年份: {text}")
+    return start, end
+
+
+def main():
+    """
+    主函数
+    """
+    parser = argparse.ArgumentParser(description="比较常规模式与紧凑模式的内存占用")
+    parser.add_argument("--data-dir", default=None, help="数据目录，默认为项目根目录下的rbdata")
+    parser.add_argument("--backend", default="pandas", choices=["pandas", "mmap"], help="存储后端")
+    parser.add_argument("--years", type=parse_years, default=None,
+                        help="只加载的年份范围，如2000-2022，默认加载所有年份")
+    args = parser.parse_args()
+
+    regular, regular_peak = measure(args.data_dir, False, args.backend, args.years)
+    compact, compact_peak = measure(args.data_dir, True, args.backend, args.years)
+
+    keys = list(dict.fromkeys(list(regular) + list(compact)))
+    name_width = max(len(key) for key in keys + ["峰值分配"]) + 2
+
+    print(f"{'缓存项':<{name_width}}{'常规模式':>14}{'紧凑模式':>14}{'节省':>10}")
+    for key in keys + ["合计", "峰值分配"]:
+        if key == "合计":
+            before, after = sum(regular.values()), sum(compact.values())
+        elif key == "峰值分配":
+            before, after = regular_peak, compact_peak
+        else:
+            before, after = regular.get(key, 0), compact.get(key, 0)
+        saved = f"{(1 - after / before) * 100:.1f}%" if before else "-"
+        print(f"{key:<{name_width}}{format_size(before):>14}{format_size(after):>14}{saved:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+数据快照管理脚本
+重建或校验rbdata目录中Excel数据文件对应的二进制快照
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+
+def get_project_root() -> Path:
+    """
+    获取项目根目录
+
+    Returns:
+        项目根目录的Path对象
+    """
+    script_path = Path(os.path.abspath(__file__))
+    return script_path.parent.parent
+
+
+# 添加src目录到Python路径，以便复用DataLoader
+sys.path.append(os.path.join(get_project_root(), "src"))
+
+from data.data_loader import DataLoader
+
+
+def rebuild(loader: DataLoader) -> bool:
+    """
+    重建所有快照
+
+    Args:
+        loader: 数据加载器
+
+    Returns:
+        是否成功
+    """
+    start_time = time.time()
+    try:
+        written = loader.rebuild_snapshots()
+    except Exception as e:
+        print(f"重建快照失败: {e}")
+        return False
+
+    for file_path in written:
+        print(f"- 已写入: {file_path}")
+    print(f"共重建 {len(written)} 个快照，用时 {time.time() - start_time:.2f} 秒")
+    return True
+
+
+def verify(loader: DataLoader) -> bool:
+    """
+    校验所有快照
+
+    Args:
+        loader: 数据加载器
+
+    Returns:
+        所有快照是否都与源文件一致
+    """
+    results = loader.verify_snapshots()
+    if not results:
+        print(f"错误: 在 {loader.data_dir} 中未找到源数据文件！")
+        return False
+
+    for name, status in results.items():
+        print(f"- {name}: {status}")
+
+    failed = [name for name, status in results.items() if status != 'ok']
+    if failed:
+        print(f"{len(failed)} 个快照需要重建，请运行: python snapshot_cache.py rebuild")
+        return False
+
+    print("所有快照均与源文件一致")
+    return True
+
+
+def main():
+    """
+    主函数
+    """
+    parser = argparse.ArgumentParser(description="重建或校验rbdata数据快照")
+    parser.add_argument("action", choices=["rebuild", "verify"], help="rebuild: 重建快照; verify: 校验快照")
+    parser.add_argument("--data-dir", default=None, help="数据目录，默认为项目根目录下的rbdata")
+    parser.add_argument("--snapshot-dir", default=None, help="快照目录，默认为数据目录下的.snapshots")
+    args = parser.parse_args()
+
+    loader = DataLoader(data_dir=args.data_dir, snapshot_dir=args.snapshot_dir)
+    print(f"快照目录: {loader.snapshot_dir}")
+
+    if args.action == "rebuild":
+        ok = rebuild(loader)
+    else:
+        ok = verify(loader)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
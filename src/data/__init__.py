@@ -7,5 +7,14 @@
 
 from .data_loader import DataLoader
 from .data_analyzer import DataAnalyzer
+from .milex_matrix import MilexMatrix
+from .metric_store import MetricStore, SIPRI_METRICS
+from .imputation import Imputer, register_strategy
+from .country_stats import COUNTRY_METRICS
+from .aggregates import PrecomputedAggregates, AGGREGATE_METRICS
+from .async_access import AsyncDataLoader, AsyncDataAnalyzer
+from .memory_cache import MemoryCache
 
-__all__ = ['DataLoader', 'DataAnalyzer'] 
\ No newline at end of file
+__all__ = ['DataLoader', 'DataAnalyzer', 'MilexMatrix', 'MetricStore', 'SIPRI_METRICS',
+           'Imputer', 'register_strategy', 'COUNTRY_METRICS', 'PrecomputedAggregates', 'AGGREGATE_METRICS',
+           'AsyncDataLoader', 'AsyncDataAnalyzer', 'MemoryCache'] 
\ No newline at end of file
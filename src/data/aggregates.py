@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+预先汇总模块
+每个数据版本一次性计算仪表盘、趋势和地图反复用到的汇总结果：
+全球年度总额、大洲×年份总额、每年的降序排名和每个单元格占全球的比例
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+from data.milex_matrix import MilexMatrix
+
+# 由预先汇总结果提供的指标名称
+AGGREGATE_METRICS = ['share_of_world']
+
+
+class PrecomputedAggregates:
+    """预先汇总结果类，由军费矩阵和大洲总额一次向量化计算得到，之后只读"""
+
+    def __init__(self, matrix: MilexMatrix, continent_totals: MilexMatrix):
+        """
+        计算预先汇总结果
+
+        Args:
+            matrix: 国家×年份军费矩阵
+            continent_totals: 大洲×年份总额矩阵（见DataLoader.get_continent_totals，
+                由加载器按大洲编号汇总并随append_year/patch_cells增量更新），年份轴与matrix一致
+        """
+        values = np.asarray(matrix.values, dtype=np.float64)
+
+        self.matrix = matrix
+        self.years = list(matrix.years)
+
+        # 全球年度总额（缺失值按0计）
+        self.global_totals = np.nan_to_num(values).sum(axis=0)
+
+        # 大洲×年份总额直接沿用加载器的汇总结果
+        self.continent_totals = continent_totals
+
+        # 每年按军费降序排列的行号（缺失值排在最后，并列时保持原行顺序），
+        # 以及每年有记录的国家数，前N名即order[:min(N, valid_counts[列]), 列]
+        self.order = np.argsort(-values, axis=0, kind='stable').astype(np.int32)
+        self.valid_counts = np.count_nonzero(~np.isnan(values), axis=0)
+
+        # 每个单元格占当年全球总额的比例（总额为0的年份为NaN）
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shares = values / np.where(self.global_totals != 0, self.global_totals, np.nan)
+        self.shares = MilexMatrix(matrix.countries, self.years, shares)
+
+    @property
+    def nbytes(self) -> int:
+        """汇总结果占用的字节数（不含与加载器共享的军费矩阵和大洲总额）"""
+        return self.global_totals.nbytes + self.order.nbytes + self.valid_counts.nbytes + self.shares.nbytes
+
+    def has_year(self, year: int) -> bool:
+        """
+        检查年份是否在汇总范围内
+
+        Args:
+            year: 年份
+
+        Returns:
+            是否存在该年份
+        """
+        return self.matrix.has_year(year)
+
+    def top_rows(self, year: int, top_n: int) -> np.ndarray:
+        """
+        获取指定年份军费支出最高的国家所在的行
+
+        Args:
+            year: 年份
+            top_n: 国家数量
+
+        Returns:
+            按军费降序排列的行号数组（只含有记录的国家）
+        """
+        col = self.matrix.col_of(year)
+        return self.order[:min(top_n, self.valid_counts[col]), col]
+
+    def top_countries(self, year: int, top_n: int) -> pd.DataFrame:
+        """
+        获取指定年份军费支出最高的国家
+
+        Args:
+            year: 年份
+            top_n: 国家数量
+
+        Returns:
+            包含Country列和年份列的DataFrame，索引为矩阵行号
+        """
+        # 行号按int64返回，与其它指标的排名和SQLite后端的结果一致
+        rows = self.top_rows(year, top_n).astype(np.int64)
+        column = self.matrix.column(year)
+        return pd.DataFrame(
+            {'Country': [self.matrix.countries[i] for i in rows], str(year): column[rows]},
+            index=rows
+        )
+
+    def global_total(self, year: int) -> float:
+        """
+        获取指定年份的全球总额
+
+        Args:
+            year: 年份
+
+        Returns:
+            全球军费支出总额
+        """
+        return float(self.global_totals[self.matrix.col_of(year)])
+
+    def global_trend(self, start_year: int, end_year: int) -> Optional[pd.DataFrame]:
+        """
+        获取年份范围内的全球总额
+
+        Args:
+            start_year: 起始年份
+            end_year: 结束年份
+
+        Returns:
+            包含Year列和Total Military Expenditure列的DataFrame，范围内没有年份时返回None
+        """
+        years = self.matrix.years_in_range(start_year, end_year)
+        if not years:
+            return None
+        cols = slice(self.matrix.col_of(years[0]), self.matrix.col_of(years[-1]) + 1)
+        return pd.DataFrame({'Year': years, 'Total Military Expenditure': self.global_totals[cols]})
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+应用状态快照模块
+应用退出时保存已解析的数据、预先汇总的结果和各视图最后渲染的图像，
+下次启动时直接恢复，首屏无需等待数据解析和图表计算
+"""
+
+import os
+import json
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+
+# 应用状态格式版本，格式变化时递增，旧文件会被自动忽略
+APP_STATE_FORMAT = 1
+
+# 应用状态文件名（位于数据快照目录下）
+APP_STATE_FILE = 'app_state.npz'
+
+
+def save_app_state(file_path: str, data_state: Dict[str, Any], views: Dict[str, Dict[str, Any]]):
+    """
+    保存应用状态
+
+    所有内容以数组形式写入一个.npz文件（不使用pickle），元数据以JSON字符串保存
+
+    Args:
+        file_path: 状态文件路径
+        data_state: DataLoader.export_state返回的数据状态
+        views: 视图名称到视图状态的映射，视图状态包含'meta'（可JSON序列化的字典）
+            和'images'（图像名称到PNG字节的映射）
+    """
+    directory = os.path.dirname(file_path)
+    os.makedirs(directory, exist_ok=True)
+
+    arrays = {}
+    datasets = {}
+    for key, dataset in data_state['datasets'].items():
+        df = dataset['frame']
+        arrays[f"data.{key}.countries"] = df.iloc[:, 0].astype(str).to_numpy(dtype=str)
+        arrays[f"data.{key}.values"] = df.iloc[:, 1:].to_numpy(dtype=np.float64)
+        if dataset['provenance'] is not None:
+            arrays[f"data.{key}.provenance"] = np.asarray(dataset['provenance'], dtype=np.uint8)
+        datasets[key] = {
+            'columns': [str(col) for col in df.columns],
+            'stamps': {path: list(stamp) if stamp else None for path, stamp in dataset['stamps'].items()},
+            'version': dataset['version']
+        }
+    arrays['continents.labels'] = np.asarray(data_state['labels'], dtype=np.int64)
+    arrays['continents.totals'] = np.asarray(data_state['totals'], dtype=np.float64)
+
+    view_meta = {}
+    for name, view in views.items():
+        view_meta[name] = view.get('meta', {})
+        for image_name, image in view.get('images', {}).items():
+            arrays[f"image.{name}.{image_name}"] = np.frombuffer(image, dtype=np.uint8)
+
+    meta = {
+        'data_version': data_state['data_version'],
+        'config': data_state['config'],
+        'datasets': datasets,
+        'continent_years': list(data_state['years']),
+        'views': view_meta
+    }
+
+    # 先写入临时文件再替换，避免退出时被中断留下写了一半的文件
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, format=np.array(APP_STATE_FORMAT), meta=np.array(json.dumps(meta, ensure_ascii=False)),
+                     **arrays)
+        os.replace(tmp_path, file_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_app_state(file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    加载应用状态
+
+    Args:
+        file_path: 状态文件路径
+
+    Returns:
+        包含'data'（可传给DataLoader.restore_state的数据状态）和'views'
+        （视图名称到{'meta', 'images'}的映射）的字典，文件不存在或格式不兼容时返回None
+    """
+    try:
+        with np.load(file_path, allow_pickle=False) as state:
+            if int(state['format']) != APP_STATE_FORMAT:
+                return None
+            meta = json.loads(str(state['meta']))
+
+            datasets = {}
+            for key, info in meta['datasets'].items():
+                columns = info['columns']
+                df = pd.DataFrame(state[f"data.{key}.values"], columns=columns[1:])
+                df.insert(0, columns[0], state[f"data.{key}.countries"].astype(object))
+                provenance_key = f"data.{key}.provenance"
+                datasets[key] = {
+                    'frame': df,
+                    'provenance': state[provenance_key] if provenance_key in state.files else None,
+                    'stamps': {path: tuple(stamp) if stamp else None for path, stamp in info['stamps'].items()},
+                    'version': info['version']
+                }
+
+            views = {name: {'meta': view_meta, 'images': {}} for name, view_meta in meta['views'].items()}
+            for array_name in state.files:
+                if array_name.startswith('image.'):
+                    _, name, image_name = array_name.split('.', 2)
+                    views.setdefault(name, {'meta': {}, 'images': {}})['images'][image_name] = state[array_name].tobytes()
+
+            data_state = {
+                'data_version': meta['data_version'],
+                'config': meta['config'],
+                'datasets': datasets,
+                'labels': state['continents.labels'],
+                'totals': state['continents.totals'],
+                'years': meta['continent_years']
+            }
+    except (OSError, KeyError, ValueError) as e:
+        if os.path.exists(file_path):
+            print(f"读取应用状态失败: {e}")
+        return None
+
+    return {'data': data_state, 'views': views}
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+异步数据访问模块
+为DataLoader和DataAnalyzer提供asyncio协程接口：阻塞的解析和分析在线程池中执行，
+不阻塞事件循环；同一查询的并发await合并为一次执行，
+合并进来的调用方各自得到结果的副本（DataFrame、Series、数组、列表和字典），
+修改副本不会影响其它调用方
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data.data_loader import DataLoader
+from data.data_analyzer import DataAnalyzer
+from data.milex_matrix import MilexMatrix
+from data.metric_store import MetricStore
+from data.imputation import Imputer
+from data.aggregates import PrecomputedAggregates
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    将参数转换为可哈希的形式，用作合并查询的键
+
+    Args:
+        value: 参数值
+
+    Returns:
+        可哈希的值（列表和元组逐项转换为元组）
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _private_copy(value: Any) -> Any:
+    """
+    为合并进已有查询的调用方复制结果
+
+    DataFrame、Series、数组、列表和字典返回副本；MilexMatrix、MetricStore等
+    与同步接口一样是加载器缓存中共享的对象，按只读对象使用，不复制
+
+    Args:
+        value: 查询结果
+
+    Returns:
+        调用方独有的结果
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return value.copy()
+    if isinstance(value, (list, dict)):
+        return value.copy()
+    return value
+
+
+class _AsyncFacade:
+    """异步接口基类，负责在线程池中执行同步方法并合并相同的并发查询"""
+
+    def __init__(self, target: Any, executor: Optional[Executor] = None):
+        """
+        初始化异步接口
+
+        Args:
+            target: 被包装的同步对象
+            executor: 执行阻塞调用的线程池，默认为事件循环的默认线程池
+        """
+        self._target = target
+        self._executor = executor
+        # 正在执行的查询 {(方法名, 参数): asyncio.Future}
+        self._pending: Dict[Tuple, asyncio.Future] = {}
+
+    async def _call(self, name: str, *args) -> Any:
+        """
+        在线程池中执行同步方法，相同方法和参数的并发调用只执行一次
+
+        Args:
+            name: 同步对象的方法名
+            *args: 方法参数
+
+        Returns:
+            方法的返回值
+        """
+        return await self._coalesce((name, _freeze(args)), getattr(self._target, name), *args)
+
+    async def _coalesce(self, key: Tuple, func: Callable, *args) -> Any:
+        """
+        在线程池中执行阻塞函数，键相同的并发调用共享同一次执行
+
+        发起执行的调用方得到函数的返回值本身（与同步接口一致），
+        合并进来的调用方得到其副本（见_private_copy）
+
+        Args:
+            key: 查询键
+            func: 阻塞函数
+            *args: 函数参数
+
+        Returns:
+            函数的返回值
+        """
+        loop = asyncio.get_running_loop()
+
+        future = self._pending.get(key)
+        joined = future is not None and future.get_loop() is loop
+        if not joined:
+            future = loop.run_in_executor(self._executor, functools.partial(func, *args))
+            self._pending[key] = future
+            future.add_done_callback(functools.partial(self._forget, key))
+
+        # 某个调用方被取消时不影响正在等待同一结果的其它调用方
+        result = await asyncio.shield(future)
+        return _private_copy(result) if joined else result
+
+    def _forget(self, key: Tuple, future: asyncio.Future):
+        """
+        查询完成后移除记录，之后的调用重新执行（由同步对象的缓存保证结果一致）
+
+        Args:
+            key: 查询键
+            future: 已完成的查询
+        """
+        if self._pending.get(key) is future:
+            del self._pending[key]
+
+    async def run(self, func: Callable, *args) -> Any:
+        """
+        在线程池中执行任意阻塞函数（不合并）
+
+        Args:
+            func: 阻塞函数
+            *args: 函数参数
+
+        Returns:
+            函数的返回值
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(func, *args))
+
+
+class AsyncDataLoader(_AsyncFacade):
+    """DataLoader的异步接口类"""
+
+    def __init__(self, data_loader: DataLoader = None, executor: Optional[Executor] = None):
+        """
+        初始化异步数据加载器
+
+        Args:
+            data_loader: 数据加载器实例，如果为None则创建新实例
+            executor: 执行阻塞调用的线程池，默认为事件循环的默认线程池
+        """
+        self.data_loader = data_loader if data_loader else DataLoader()
+        super().__init__(self.data_loader, executor)
+
+    async def get_all_data(self) -> pd.DataFrame:
+        """见DataLoader.get_all_data"""
+        return await self._call('get_all_data')
+
+    async def get_continent_data(self, continent: str) -> pd.DataFrame:
+        """见DataLoader.get_continent_data"""
+        return await self._call('get_continent_data', continent)
+
+    async def get_matrix(self, continent: str = None) -> MilexMatrix:
+        """见DataLoader.get_matrix"""
+        return await self._call('get_matrix', continent)
+
+    async def get_imputed_matrix(self, continent: str = None, imputer: Imputer = None) -> MilexMatrix:
+        """见DataLoader.get_imputed_matrix（按插补配置合并查询）"""
+        imputer = imputer if imputer is not None else Imputer()
+        return await self._coalesce(('get_imputed_matrix', continent, imputer.key),
+                                    self.data_loader.get_imputed_matrix, continent, imputer)
+
+    async def get_continent_labels(self) -> np.ndarray:
+        """见DataLoader.get_continent_labels"""
+        return await self._call('get_continent_labels')
+
+    async def get_continent_totals(self) -> MilexMatrix:
+        """见DataLoader.get_continent_totals"""
+        return await self._call('get_continent_totals')
+
+    async def get_aggregates(self) -> PrecomputedAggregates:
+        """见DataLoader.get_aggregates"""
+        return await self._call('get_aggregates')
+
+    async def get_metric_store(self) -> MetricStore:
+        """见DataLoader.get_metric_store"""
+        return await self._call('get_metric_store')
+
+    async def get_country_stats(self) -> pd.DataFrame:
+        """见DataLoader.get_country_stats"""
+        return await self._call('get_country_stats')
+
+    async def get_country_metric_store(self) -> MetricStore:
+        """见DataLoader.get_country_metric_store"""
+        return await self._call('get_country_metric_store')
+
+    async def data_version(self) -> str:
+        """见DataLoader.data_version"""
+        return await self._coalesce(('data_version',), lambda: self.data_loader.data_version)
+
+    async def get_country_data(self, country_name: str) -> pd.DataFrame:
+        """见DataLoader.get_country_data"""
+        return await self._call('get_country_data', country_name)
+
+    async def get_countries_data(self, countries: List[str]) -> pd.DataFrame:
+        """见DataLoader.get_countries_data（行按数据中的位置排列）"""
+        return await self._call('get_countries_data', list(countries))
+
+    async def get_countries_list(self) -> List[str]:
+        """见DataLoader.get_countries_list"""
+        return await self._call('get_countries_list')
+
+    async def get_years_list(self) -> List[int]:
+        """见DataLoader.get_years_list"""
+        return await self._call('get_years_list')
+
+    async def get_data_by_year_range(self, start_year: int, end_year: int) -> pd.DataFrame:
+        """见DataLoader.get_data_by_year_range"""
+        return await self._call('get_data_by_year_range', start_year, end_year)
+
+    async def get_block(self, countries: List[str], start_year: int, end_year: int) -> pd.DataFrame:
+        """见DataLoader.get_block"""
+        return await self._call('get_block', list(countries), start_year, end_year)
+
+
+class AsyncDataAnalyzer(_AsyncFacade):
+    """DataAnalyzer的异步接口类"""
+
+    def __init__(self, data_analyzer: DataAnalyzer = None, executor: Optional[Executor] = None):
+        """
+        初始化异步数据分析器
+
+        Args:
+            data_analyzer: 数据分析器实例，如果为None则创建新实例
+            executor: 执行阻塞调用的线程池，默认为事件循环的默认线程池
+        """
+        self.data_analyzer = data_analyzer if data_analyzer else DataAnalyzer()
+        super().__init__(self.data_analyzer, executor)
+        # 与分析器共用同一个数据加载器和线程池
+        self.data_loader = AsyncDataLoader(self.data_analyzer.data_loader, executor)
+
+    async def get_top_countries(self, year: int, top_n: int = 10, metric: str = None) -> pd.DataFrame:
+        """见DataAnalyzer.get_top_countries"""
+        return await self._call('get_top_countries', year, top_n, metric)
+
+    async def get_metric_by_year(self, metric: str, year: int, iso3: bool = False) -> pd.DataFrame:
+        """见DataAnalyzer.get_metric_by_year"""
+        return await self._call('get_metric_by_year', metric, year, iso3)
+
+    async def calculate_growth_rate(self, country_name: str, start_year: int, end_year: int) -> float:
+        """见DataAnalyzer.calculate_growth_rate"""
+        return await self._call('calculate_growth_rate', country_name, start_year, end_year)
+
+    async def compare_countries(self, countries: List[str], years: List[int]) -> pd.DataFrame:
+        """见DataAnalyzer.compare_countries"""
+        return await self._call('compare_countries', list(countries), list(years))
+
+    async def calculate_regional_total(self, continent: str, year: int) -> float:
+        """见DataAnalyzer.calculate_regional_total"""
+        return await self._call('calculate_regional_total', continent, year)
+
+    async def calculate_regional_trend(self, start_year: int, end_year: int) -> pd.DataFrame:
+        """见DataAnalyzer.calculate_regional_trend"""
+        return await self._call('calculate_regional_trend', start_year, end_year)
+
+    async def calculate_global_total(self, year: int) -> float:
+        """见DataAnalyzer.calculate_global_total"""
+        return await self._call('calculate_global_total', year)
+
+    async def calculate_global_trend(self, start_year: int, end_year: int) -> pd.DataFrame:
+        """见DataAnalyzer.calculate_global_trend"""
+        return await self._call('calculate_global_trend', start_year, end_year)
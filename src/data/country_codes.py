@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+国家名称索引模块
+将国家名称的各种写法归一化为同一个键，并提供国家名称到ISO 3166-1 alpha-3代码的映射；
+映射表在导入时按归一化键建成哈希表，查询时不需要模糊匹配
+"""
+
+import re
+import unicodedata
+import numpy as np
+from typing import List, Optional
+
+# 同一国家的不同写法，左侧为别名，右侧为统一名称（两侧都按归一化后的写法比较）
+COUNTRY_ALIASES = {
+    'United States of America': 'United States',
+    'USA': 'United States',
+    'US': 'United States',
+    'UK': 'United Kingdom',
+    'Great Britain': 'United Kingdom',
+    'Russian Federation': 'Russia',
+    'Cabo Verde': 'Cape Verde',
+    'Congo (Kinshasa)': 'Congo, DR',
+    'Democratic Republic of the Congo': 'Congo, DR',
+    'DR Congo': 'Congo, DR',
+    'Congo (Brazzaville)': 'Congo, Republic',
+    'Republic of the Congo': 'Congo, Republic',
+    'Congo': 'Congo, Republic',
+    'Gambia': 'Gambia, The',
+    'Burma': 'Myanmar',
+    'Vietnam': 'Viet Nam',
+    'Kyrgyzstan': 'Kyrgyz Republic',
+    'Turkey': 'Türkiye',
+    'Czech Republic': 'Czechia',
+    'South Korea': 'Korea, South',
+    'Republic of Korea': 'Korea, South',
+    'North Korea': 'Korea, North',
+    "Democratic People's Republic of Korea": 'Korea, North',
+    'Ivory Coast': "Cote d'Ivoire",
+    'Swaziland': 'Eswatini',
+    'Macedonia': 'North Macedonia',
+    'Syrian Arab Republic': 'Syria',
+    'Iran, Islamic Republic of': 'Iran',
+    'Lao PDR': 'Laos',
+    "Lao People's Democratic Republic": 'Laos',
+    'Brunei Darussalam': 'Brunei',
+    'East Timor': 'Timor Leste',
+    'Moldova, Republic of': 'Moldova',
+    'Tanzania, United Republic of': 'Tanzania',
+    'Bolivia (Plurinational State of)': 'Bolivia',
+    'Venezuela (Bolivarian Republic of)': 'Venezuela',
+    'Micronesia, Federated States of': 'Micronesia',
+    'Holy See': 'Vatican City',
+    'Bahamas, The': 'Bahamas',
+    'Sao Tome & Principe': 'Sao Tome and Principe',
+    'Saint Kitts and Nevis': 'St Kitts and Nevis',
+    'Saint Lucia': 'St Lucia',
+    'Saint Vincent and the Grenadines': 'St Vincent and the Grenadines',
+    'UAE': 'United Arab Emirates',
+    'Bosnia-Herzegovina': 'Bosnia and Herzegovina'
+}
+
+# 国家名称到ISO 3166-1 alpha-3代码的映射（名称可以是任意已知写法）；
+# 已不存在的国家（如USSR、Yugoslavia）和地区汇总行没有代码
+ISO3_CODES = {
+    'Afghanistan': 'AFG', 'Albania': 'ALB', 'Algeria': 'DZA', 'American Samoa': 'ASM',
+    'Andorra': 'AND', 'Angola': 'AGO', 'Anguilla': 'AIA', 'Antigua and Barbuda': 'ATG',
+    'Argentina': 'ARG', 'Armenia': 'ARM', 'Aruba': 'ABW', 'Australia': 'AUS',
+    'Austria': 'AUT', 'Azerbaijan': 'AZE', 'Bahamas': 'BHS', 'Bahrain': 'BHR',
+    'Bangladesh': 'BGD', 'Barbados': 'BRB', 'Belarus': 'BLR', 'Belgium': 'BEL',
+    'Belize': 'BLZ', 'Benin': 'BEN', 'Bermuda': 'BMU', 'Bhutan': 'BTN',
+    'Bolivia': 'BOL', 'Bosnia and Herzegovina': 'BIH', 'Botswana': 'BWA', 'Brazil': 'BRA',
+    'British Indian Ocean Territories': 'IOT', 'British Virgin Islands': 'VGB', 'Brunei': 'BRN',
+    'Bulgaria': 'BGR', 'Burkina Faso': 'BFA', 'Burundi': 'BDI', 'Cambodia': 'KHM',
+    'Cameroon': 'CMR', 'Canada': 'CAN', 'Cape Verde': 'CPV', 'Cayman Islands': 'CYM',
+    'Central African Republic': 'CAF', 'Chad': 'TCD', 'Chile': 'CHL', 'China': 'CHN',
+    'Christmas Island': 'CXR', 'Cocos (Keeling) Islands': 'CCK', 'Colombia': 'COL',
+    'Comoros': 'COM', 'Congo, DR': 'COD', 'Congo, Republic': 'COG', 'Cook Islands': 'COK',
+    'Costa Rica': 'CRI', "Cote d'Ivoire": 'CIV', 'Croatia': 'HRV', 'Cuba': 'CUB',
+    'Curacao': 'CUW', 'Cyprus': 'CYP', 'Czechia': 'CZE', 'Denmark': 'DNK',
+    'Djibouti': 'DJI', 'Dominica': 'DMA', 'Dominican Republic': 'DOM', 'Ecuador': 'ECU',
+    'Egypt': 'EGY', 'El Salvador': 'SLV', 'Equatorial Guinea': 'GNQ', 'Eritrea': 'ERI',
+    'Estonia': 'EST', 'Eswatini': 'SWZ', 'Ethiopia': 'ETH',
+    'Falkland Islands (Islas Malvinas)': 'FLK', 'Faroe Islands': 'FRO', 'Fiji': 'FJI',
+    'Finland': 'FIN', 'France': 'FRA', 'French Guiana': 'GUF', 'French Polynesia': 'PYF',
+    'Gabon': 'GAB', 'Gambia, The': 'GMB', 'Georgia': 'GEO', 'Germany': 'DEU',
+    'Ghana': 'GHA', 'Gibraltar': 'GIB', 'Greece': 'GRC', 'Greenland': 'GRL',
+    'Grenada': 'GRD', 'Guadeloupe': 'GLP', 'Guam': 'GUM', 'Guatemala': 'GTM',
+    'Guinea': 'GIN', 'Guinea-Bissau': 'GNB', 'Guyana': 'GUY', 'Haiti': 'HTI',
+    'Honduras': 'HND', 'Hong Kong': 'HKG', 'Hungary': 'HUN', 'Iceland': 'ISL',
+    'India': 'IND', 'Indonesia': 'IDN', 'Iran': 'IRN', 'Iraq': 'IRQ',
+    'Ireland': 'IRL', 'Israel': 'ISR', 'Italy': 'ITA', 'Jamaica': 'JAM',
+    'Japan': 'JPN', 'Jordan': 'JOR', 'Kazakhstan': 'KAZ', 'Kenya': 'KEN',
+    'Kiribati': 'KIR', 'Korea, North': 'PRK', 'Korea, South': 'KOR', 'Kosovo': 'XKX',
+    'Kuwait': 'KWT', 'Kyrgyz Republic': 'KGZ', 'Laos': 'LAO', 'Latvia': 'LVA',
+    'Lebanon': 'LBN', 'Lesotho': 'LSO', 'Liberia': 'LBR', 'Libya': 'LBY',
+    'Liechtenstein': 'LIE', 'Lithuania': 'LTU', 'Luxembourg': 'LUX', 'Macau': 'MAC',
+    'Madagascar': 'MDG', 'Malawi': 'MWI', 'Malaysia': 'MYS', 'Maldives': 'MDV',
+    'Mali': 'MLI', 'Malta': 'MLT', 'Marshall Islands': 'MHL', 'Martinique': 'MTQ',
+    'Mauritania': 'MRT', 'Mauritius': 'MUS', 'Mayotte': 'MYT', 'Mexico': 'MEX',
+    'Micronesia': 'FSM', 'Moldova': 'MDA', 'Monaco': 'MCO', 'Mongolia': 'MNG',
+    'Montenegro': 'MNE', 'Montserrat': 'MSR', 'Morocco': 'MAR', 'Mozambique': 'MOZ',
+    'Myanmar': 'MMR', 'Namibia': 'NAM', 'Nauru': 'NRU', 'Nepal': 'NPL',
+    'Netherlands': 'NLD', 'New Caledonia': 'NCL', 'New Zealand': 'NZL', 'Nicaragua': 'NIC',
+    'Niger': 'NER', 'Nigeria': 'NGA', 'Niue': 'NIU', 'Norfolk Island': 'NFK',
+    'North Macedonia': 'MKD', 'Northern Mariana Islands': 'MNP', 'Norway': 'NOR', 'Oman': 'OMN',
+    'Pakistan': 'PAK', 'Palau': 'PLW', 'Palestine': 'PSE', 'Panama': 'PAN',
+    'Papua New Guinea': 'PNG', 'Paraguay': 'PRY', 'Peru': 'PER', 'Philippines': 'PHL',
+    'Pitcairn Islands': 'PCN', 'Poland': 'POL', 'Portugal': 'PRT', 'Puerto Rico': 'PRI',
+    'Qatar': 'QAT', 'Reunion': 'REU', 'Romania': 'ROU', 'Russia': 'RUS',
+    'Rwanda': 'RWA', 'Samoa': 'WSM', 'San Marino': 'SMR', 'Sao Tome and Principe': 'STP',
+    'Saudi Arabia': 'SAU', 'Senegal': 'SEN', 'Serbia': 'SRB', 'Seychelles': 'SYC',
+    'Sierra Leone': 'SLE', 'Singapore': 'SGP', 'Sint Maarten': 'SXM', 'Slovakia': 'SVK',
+    'Slovenia': 'SVN', 'Solomon Islands': 'SLB', 'Somalia': 'SOM', 'South Africa': 'ZAF',
+    'South Sudan': 'SSD', 'Spain': 'ESP', 'Sri Lanka': 'LKA', 'St Helena': 'SHN',
+    'St Kitts and Nevis': 'KNA', 'St Lucia': 'LCA', 'St Pierre and Miquelon': 'SPM',
+    'St Vincent and the Grenadines': 'VCT', 'Sudan': 'SDN', 'Suriname': 'SUR',
+    'Svalbard, Jan Mayen Island': 'SJM', 'Sweden': 'SWE', 'Switzerland': 'CHE', 'Syria': 'SYR',
+    'Taiwan': 'TWN', 'Tajikistan': 'TJK', 'Tanzania': 'TZA', 'Thailand': 'THA',
+    'Timor Leste': 'TLS', 'Togo': 'TGO', 'Tokelau': 'TKL', 'Tonga': 'TON',
+    'Trinidad and Tobago': 'TTO', 'Tunisia': 'TUN', 'Türkiye': 'TUR', 'Turkmenistan': 'TKM',
+    'Turks and Caicos Islands': 'TCA', 'Tuvalu': 'TUV', 'Uganda': 'UGA', 'Ukraine': 'UKR',
+    'United Arab Emirates': 'ARE', 'United Kingdom': 'GBR', 'United States': 'USA',
+    'Uruguay': 'URY', 'Uzbekistan': 'UZB', 'Vanuatu': 'VUT', 'Vatican City': 'VAT',
+    'Venezuela': 'VEN', 'Viet Nam': 'VNM', 'Western Sahara': 'ESH', 'Yemen': 'YEM',
+    'Zambia': 'ZMB', 'Zimbabwe': 'ZWE'
+}
+
+
+def _plain_key(name: str) -> str:
+    """
+    计算不经过别名映射的归一化键
+
+    Args:
+        name: 国家名称
+
+    Returns:
+        归一化键
+    """
+    key = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    key = re.sub(r'\(-\)|\*+', ' ', key).casefold().replace('&', ' and ')
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', key).split())
+
+
+_ALIAS_KEYS = {_plain_key(alias): _plain_key(name) for alias, name in COUNTRY_ALIASES.items()}
+
+
+def normalize_country_name(name: str) -> str:
+    """
+    计算国家名称的归一化键
+
+    去掉脚注标记（如"*"、"(-)"）和重音符号，统一大小写、"&"和标点，
+    再按别名表映射到统一写法
+
+    Args:
+        name: 国家名称
+
+    Returns:
+        归一化键，如"Korea, South*"、"South Korea"都得到"korea south"
+    """
+    key = _plain_key(name)
+    return _ALIAS_KEYS.get(key, key)
+
+
+# 归一化键到ISO-3代码的哈希索引，导入时构建一次
+_ISO3_INDEX = {normalize_country_name(name): code for name, code in ISO3_CODES.items()}
+
+
+def country_iso3(name: str) -> Optional[str]:
+    """
+    获取国家名称对应的ISO-3代码
+
+    Args:
+        name: 国家名称（任意已知写法）
+
+    Returns:
+        ISO-3代码，未知名称（如地区汇总行、已不存在的国家）返回None
+    """
+    return _ISO3_INDEX.get(normalize_country_name(name))
+
+
+def iso3_codes(countries: List[str]) -> np.ndarray:
+    """
+    批量获取国家名称对应的ISO-3代码
+
+    Args:
+        countries: 国家名称列表
+
+    Returns:
+        与countries一一对应的对象数组，未知名称为None
+    """
+    return np.array([country_iso3(name) for name in countries], dtype=object)
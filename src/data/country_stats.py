@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+国家人口与贸易数据模块
+读取rbdata中以分号分隔的关税计算CSV文件（人口和对美贸易数据），
+通过国家名称别名索引一次性对齐到军费矩阵的行，并派生人均军费、军费/贸易额等指标
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+from data.milex_matrix import MilexMatrix
+from data.country_codes import normalize_country_name
+
+# 关税计算文件名，排在前面的文件优先（含人口数据）
+COUNTRY_STATS_FILES = ['Tariff Calculations plus Population.csv', 'Tariff Calculations.csv']
+
+# CSV列名到数据列名的映射；贸易额单位为百万美元，关税为比例（49%记为0.49）
+COUNTRY_STATS_COLUMNS = {
+    'US 2024 Deficit': 'us_trade_balance',
+    'US 2024 Exports': 'us_exports',
+    'US 2024 Imports (Customs Basis)': 'us_imports',
+    'Trump Tariffs Alleged': 'tariff_alleged',
+    'Trump Response': 'tariff_response',
+    'Population': 'population'
+}
+
+# 由军费数据和国家数据派生的指标名称
+COUNTRY_METRICS = ['milex_per_capita', 'milex_to_us_exports', 'milex_to_us_imports', 'milex_to_us_trade']
+
+
+def read_country_stats(file_paths: List[str]) -> pd.DataFrame:
+    """
+    读取并合并关税计算CSV文件
+
+    数值中的千位分隔符和百分号在读取后整列向量化去除；
+    同一国家出现在多个文件中时取排在前面的文件
+
+    Args:
+        file_paths: CSV文件路径列表，不存在的文件会被跳过
+
+    Returns:
+        包含Country列、key列（归一化键）和COUNTRY_STATS_COLUMNS中各数值列的DataFrame，
+        文件中缺少的列为NaN
+    """
+    frames = []
+    for file_path in file_paths:
+        try:
+            raw = pd.read_csv(file_path, sep=';', dtype=str, encoding='utf-8-sig')
+        except FileNotFoundError:
+            continue
+
+        df = pd.DataFrame({'Country': raw['Country'].str.strip()})
+        for source, column in COUNTRY_STATS_COLUMNS.items():
+            if source not in raw.columns:
+                df[column] = np.nan
+                continue
+            text = raw[source].str.strip()
+            percent = text.str.endswith('%', na=False)
+            numbers = pd.to_numeric(text.str.replace(r'[,%\s]', '', regex=True), errors='coerce')
+            df[column] = np.where(percent, numbers / 100, numbers)
+        frames.append(df)
+
+    if not frames:
+        raise FileNotFoundError(f"未找到国家人口与贸易数据文件: {', '.join(file_paths)}")
+
+    stats = pd.concat(frames, ignore_index=True)
+    stats = stats[stats['Country'].notna() & (stats['Country'] != '')]
+    stats.insert(1, 'key', [normalize_country_name(name) for name in stats['Country']])
+    return stats.drop_duplicates('key', keep='first').reset_index(drop=True)
+
+
+def align_country_stats(countries: List[str], stats: pd.DataFrame) -> pd.DataFrame:
+    """
+    将国家数据对齐到给定的国家轴
+
+    通过归一化键的哈希索引一次完成连接，每个国家只查找一次
+
+    Args:
+        countries: 国家名称列表（如军费矩阵的行）
+        stats: read_country_stats返回的DataFrame
+
+    Returns:
+        与countries一一对应的DataFrame（索引为行位置），未匹配的国家各列为NaN
+    """
+    index = {key: i for i, key in enumerate(stats['key'])}
+    positions = np.array([index.get(normalize_country_name(name), -1) for name in countries], dtype=np.int64)
+    matched = positions >= 0
+
+    aligned = pd.DataFrame({'Country': list(countries)})
+    for column in COUNTRY_STATS_COLUMNS.values():
+        values = np.full(len(countries), np.nan)
+        values[matched] = stats[column].to_numpy(dtype=np.float64)[positions[matched]]
+        aligned[column] = values
+    return aligned
+
+
+def derive_country_metrics(matrix: MilexMatrix, aligned: pd.DataFrame) -> Dict[str, MilexMatrix]:
+    """
+    由军费矩阵和对齐后的国家数据计算派生指标
+
+    人口和贸易额只有一个年份的数据，按同一数值用于所有年份；
+    分母缺失或为0的单元格为NaN
+
+    Args:
+        matrix: 军费矩阵（单位百万美元）
+        aligned: 与矩阵行一一对应的国家数据
+
+    Returns:
+        指标名称到军费矩阵的映射：
+        milex_per_capita为人均军费（美元），其余为军费与对美出口、进口、进出口总额之比
+    """
+    values = np.asarray(matrix.values, dtype=np.float64)
+    exports = aligned['us_exports'].to_numpy(dtype=np.float64)
+    imports = aligned['us_imports'].to_numpy(dtype=np.float64)
+    denominators = {
+        'milex_per_capita': aligned['population'].to_numpy(dtype=np.float64) / 1e6,
+        'milex_to_us_exports': exports,
+        'milex_to_us_imports': imports,
+        'milex_to_us_trade': exports + imports
+    }
+
+    metrics = {}
+    for metric in COUNTRY_METRICS:
+        denominator = denominators[metric]
+        valid = np.isfinite(denominator) & (denominator != 0)
+        # 每行一个分母，广播到该行所有年份
+        scale = np.where(valid, 1.0 / np.where(valid, denominator, 1.0), np.nan)
+        metrics[metric] = MilexMatrix(matrix.countries, matrix.years, values * scale[:, None])
+    return metrics
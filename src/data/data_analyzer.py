@@ -6,56 +6,197 @@
 负责分析军事数据，计算统计指标和趋势
 """
 
+import weakref
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Union, Tuple
+from typing import Any, Callable, Dict, Hashable, List, Optional, Union, Tuple
 from data.data_loader import DataLoader
+from data.milex_matrix import MilexMatrix
+from data.country_stats import COUNTRY_METRICS
+from data.aggregates import AGGREGATE_METRICS
+from data.memory_cache import MemoryCache, DEFAULT_RESULT_CACHE_BUDGET, estimate_nbytes
 
 class DataAnalyzer:
     """数据分析器类，负责分析军事数据"""
     
-    def __init__(self, data_loader: DataLoader = None):
+    def __init__(self, data_loader: DataLoader = None,
+                 cache_budget: Optional[int] = DEFAULT_RESULT_CACHE_BUDGET, cache_policy: str = 'lru'):
         """
         初始化数据分析器
         
         Args:
             data_loader: 数据加载器实例，如果为None则创建新实例
+            cache_budget: 查询结果缓存的内存预算（字节），为None时不限制
+            cache_policy: 结果缓存的淘汰策略，可选值为'lru'、'lfu'（见data.memory_cache）
         """
         self.data_loader = data_loader if data_loader else DataLoader()
+        
+        # 查询结果缓存 {查询参数: (数据对象的弱引用, 结果DataFrame)}
+        self._results = MemoryCache(cache_budget, cache_policy)
+    
+    def _cached_result(self, key: Hashable, source: Any, compute: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """
+        按查询参数缓存DataFrame结果
+        
+        结果与计算它所用的数据对象（军费矩阵、汇总结果或SQLite数据文件）绑定：
+        数据版本变化后这些对象被重建，缓存的结果随之失效；只保存数据对象的弱引用，
+        不会延长旧版本数据的生命周期
+        
+        Args:
+            key: 查询参数
+            source: 计算结果所用的数据对象
+            compute: 计算结果的函数（抛出的异常不缓存）
+            
+        Returns:
+            结果的副本，调用方修改它不影响缓存
+        """
+        cached = self._results.get(key)
+        if cached is not None and cached[0]() is source:
+            return cached[1].copy()
+        
+        result = compute()
+        self._results.put(key, (weakref.ref(source), result), size=estimate_nbytes(result))
+        return result.copy()
     
-    def get_top_countries(self, year: int, top_n: int = 10) -> pd.DataFrame:
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        获取查询结果缓存的统计
+        
+        Returns:
+            统计字典，见MemoryCache.stats
+        """
+        return self._results.stats()
+    
+    def _metric_matrix(self, metric: str = None) -> MilexMatrix:
+        """
+        获取指标对应的军费矩阵
+        
+        Args:
+            metric: 指标名称（见SIPRI_METRICS、COUNTRY_METRICS和AGGREGATE_METRICS），
+                默认为当前加载的军费支出数据
+            
+        Returns:
+            军费矩阵
+        """
+        if metric is None:
+            return self.data_loader.get_matrix()
+        if metric == 'share_of_world':
+            return self.data_loader.get_aggregates().shares
+        if metric in COUNTRY_METRICS:
+            return self.data_loader.get_country_metric_store().matrix(metric)
+        return self.data_loader.get_metric_store().matrix(metric)
+    
+    def get_top_countries(self, year: int, top_n: int = 10, metric: str = None) -> pd.DataFrame:
         """
         获取指定年份军费支出最高的国家
         
         Args:
             year: 年份
             top_n: 返回的国家数量
+            metric: 指标名称（见SIPRI_METRICS、COUNTRY_METRICS和AGGREGATE_METRICS），
+                默认为当前加载的军费支出数据
             
         Returns:
             包含前N个军费支出最高国家的DataFrame
         """
-        all_data = self.data_loader.get_all_data()
+        self.data_loader.ensure_years(year)
+        matrix = self._metric_matrix(metric)
         
         # 确保年份列存在
-        if str(year) not in all_data.columns:
+        if not matrix.has_year(year):
             raise ValueError(f"数据中不存在年份: {year}")
         
-        # 选择国家列和指定年份列
-        country_col = all_data.columns[0]
-        year_data = all_data[[country_col, str(year)]].copy()
+        if metric is None:
+            # SQLite后端沿(metric, year, value)索引倒序取前N行，不在内存中构建预先汇总
+            store = self.data_loader.get_sqlite_store()
+            if store is not None:
+                return self._cached_result(('top_countries', year, top_n, None), store,
+                                           lambda: store.top_countries(year, top_n))
+            
+            # 其它后端：军费支出的排名已按年份预先排好，直接取前N行
+            aggregates = self.data_loader.get_aggregates()
+            return self._cached_result(('top_countries', year, top_n, None), aggregates,
+                                       lambda: aggregates.top_countries(year, top_n))
+        
+        return self._cached_result(('top_countries', year, top_n, metric), matrix,
+                                   lambda: self._rank_column(matrix, year, top_n))
+    
+    @staticmethod
+    def _rank_column(matrix: MilexMatrix, year: int, top_n: int) -> pd.DataFrame:
+        """
+        按指定年份的值降序排列，取前N个国家
+        
+        Args:
+            matrix: 指标矩阵
+            year: 年份
+            top_n: 国家数量
+            
+        Returns:
+            包含Country列和年份列的DataFrame，索引为矩阵行号
+        """
+        # 取出该年份的列视图并删除缺失值
+        values = matrix.column(year)
+        rows = np.flatnonzero(~np.isnan(values))
+        
+        # 按军费支出降序排序，取前N个国家
+        rows = rows[np.argsort(-values[rows], kind='stable')][:top_n]
         
-        # 删除缺失值
-        year_data = year_data.dropna()
+        return pd.DataFrame(
+            {'Country': [matrix.countries[i] for i in rows], str(year): values[rows]},
+            index=rows
+        )
+    
+    def get_metric_by_year(self, metric: str, year: int, iso3: bool = False) -> pd.DataFrame:
+        """
+        获取所有国家某指标在指定年份的值
+        
+        Args:
+            metric: 指标名称（见SIPRI_METRICS、COUNTRY_METRICS和AGGREGATE_METRICS），
+                为None时使用当前加载的军费支出数据
+            year: 年份
+            iso3: 是否附加ISO3列（ISO-3代码，取自矩阵预先计算的代码列），
+                为True时只保留有代码的国家
+            
+        Returns:
+            包含国家列和年份列（以及ISO3列）的DataFrame，不含缺失值
+        """
+        self.data_loader.ensure_years(year)
+        matrix = self._metric_matrix(metric)
+        
+        # 确保年份列存在
+        if not matrix.has_year(year):
+            raise ValueError(f"数据中不存在年份: {year}")
         
-        # 确保数据类型为数值型
-        year_data[str(year)] = pd.to_numeric(year_data[str(year)], errors='coerce')
-        year_data = year_data.dropna()
+        return self._cached_result(('metric_by_year', metric, year, iso3), matrix,
+                                   lambda: self._metric_column(matrix, year, iso3))
+    
+    @staticmethod
+    def _metric_column(matrix: MilexMatrix, year: int, iso3: bool) -> pd.DataFrame:
+        """
+        取出指定年份有值的国家
         
-        # 按军费支出降序排序
-        year_data = year_data.sort_values(by=str(year), ascending=False)
+        Args:
+            matrix: 指标矩阵
+            year: 年份
+            iso3: 是否附加ISO3列（只保留有代码的国家）
+            
+        Returns:
+            包含国家列和年份列（以及ISO3列）的DataFrame，索引为矩阵行号
+        """
+        values = matrix.column(year)
+        keep = ~np.isnan(values)
+        if iso3:
+            codes = matrix.iso3
+            keep &= np.not_equal(codes, None)
+        rows = np.flatnonzero(keep)
         
-        # 返回前N个国家
-        return year_data.head(top_n)
+        result = pd.DataFrame(
+            {'Country': [matrix.countries[i] for i in rows], str(year): values[rows]},
+            index=rows
+        )
+        if iso3:
+            result['ISO3'] = codes[rows].astype(str)
+        return result
     
     def calculate_growth_rate(self, country_name: str, start_year: int, end_year: int) -> float:
         """
@@ -69,15 +210,17 @@ class DataAnalyzer:
         Returns:
             年均增长率（百分比）
         """
-        country_data = self.data_loader.get_country_data(country_name)
+        self.data_loader.ensure_years(min(start_year, end_year), max(start_year, end_year))
+        matrix = self.data_loader.get_matrix()
         
         # 确保年份列存在
-        if str(start_year) not in country_data.columns or str(end_year) not in country_data.columns:
+        if not matrix.has_year(start_year) or not matrix.has_year(end_year):
             raise ValueError(f"数据中不存在指定的年份范围: {start_year}-{end_year}")
         
         # 获取起始和结束年份的军费支出
-        start_value = country_data[str(start_year)].values[0]
-        end_value = country_data[str(end_year)].values[0]
+        row = matrix.row(country_name)
+        start_value = row[matrix.col_of(start_year)]
+        end_value = row[matrix.col_of(end_year)]
         
         # 检查数据是否为缺失值
         if pd.isna(start_value) or pd.isna(end_value):
@@ -103,11 +246,34 @@ class DataAnalyzer:
         Returns:
             包含多个国家在多个年份军费支出的DataFrame
         """
-        all_data = self.data_loader.get_all_data()
-        country_col = all_data.columns[0]
+        if years:
+            self.data_loader.ensure_years(min(years), max(years))
+        
+        # SQLite后端沿(metric, country, year)索引取数
+        store = self.data_loader.get_sqlite_store()
+        key = ('compare_countries', tuple(countries), tuple(years))
+        if store is not None:
+            if not any(store.has_year(year) for year in years):
+                raise ValueError("指定的年份在数据中不存在")
+            return self._cached_result(key, store, lambda: store.country_years(countries, years))
         
-        # 过滤出指定的国家
-        filtered_data = all_data[all_data[country_col].isin(countries)].copy()
+        return self._cached_result(key, self.data_loader.get_matrix(),
+                                   lambda: self._country_years(countries, years))
+    
+    def _country_years(self, countries: List[str], years: List[int]) -> pd.DataFrame:
+        """
+        从合并数据中取出多个国家在多个年份的军费支出
+        
+        Args:
+            countries: 国家名称列表
+            years: 年份列表
+            
+        Returns:
+            包含国家列和年份列的DataFrame
+        """
+        # 通过国家索引批量取出指定国家的行
+        filtered_data = self.data_loader.get_countries_data(countries)
+        country_col = filtered_data.columns[0]
         
         # 选择国家列和指定年份列
         year_cols = [str(year) for year in years if str(year) in filtered_data.columns]
@@ -127,20 +293,64 @@ class DataAnalyzer:
         Returns:
             军费支出总和
         """
-        # 获取大洲数据
-        continent_data = self.data_loader.get_continent_data(continent)
+        self.data_loader.ensure_years(year)
+        
+        # 大洲总额在加载时已按年份预先汇总，这里只需查表
+        totals = self.data_loader.get_aggregates().continent_totals
+        
+        if not totals.has_country(continent):
+            raise ValueError(f"不支持的大洲: {continent}，可选值为: {', '.join(totals.countries)}")
         
         # 确保年份列存在
-        if str(year) not in continent_data.columns:
+        if not totals.has_year(year):
             raise ValueError(f"数据中不存在年份: {year}")
         
-        # 确保数据类型为数值型
-        continent_data[str(year)] = pd.to_numeric(continent_data[str(year)], errors='coerce')
+        return totals.values[totals.row_of(continent), totals.col_of(year)]
+    
+    def calculate_regional_trend(self, start_year: int, end_year: int) -> pd.DataFrame:
+        """
+        计算各大洲军费支出趋势
         
-        # 计算总和
-        total = continent_data[str(year)].sum(skipna=True)
+        Args:
+            start_year: 起始年份
+            end_year: 结束年份
+            
+        Returns:
+            包含Year列和每个大洲一列的DataFrame
+        """
+        self.data_loader.ensure_years(start_year, end_year)
+        aggregates = self.data_loader.get_aggregates()
+        totals = aggregates.continent_totals
+        
+        years = totals.years_in_range(start_year, end_year)
+        if not years:
+            raise ValueError("指定的年份范围在数据中不存在")
+        
+        def compute() -> pd.DataFrame:
+            trend_df = pd.DataFrame(totals.block(start_year, end_year).T, columns=totals.countries)
+            trend_df.insert(0, 'Year', years)
+            return trend_df
+        
+        return self._cached_result(('regional_trend', start_year, end_year), aggregates, compute)
+    
+    def calculate_global_total(self, year: int) -> float:
+        """
+        计算指定年份的全球军费支出总额
+        
+        Args:
+            year: 年份
+            
+        Returns:
+            全球军费支出总额
+        """
+        self.data_loader.ensure_years(year)
+        aggregates = self.data_loader.get_aggregates()
         
-        return total
+        # 确保年份列存在
+        if not aggregates.has_year(year):
+            raise ValueError(f"数据中不存在年份: {year}")
+        
+        return aggregates.global_total(year)
     
     def calculate_global_trend(self, start_year: int, end_year: int) -> pd.DataFrame:
         """
@@ -153,20 +363,12 @@ class DataAnalyzer:
         Returns:
             包含全球军费支出趋势的DataFrame
         """
-        all_data = self.data_loader.get_all_data()
+        self.data_loader.ensure_years(start_year, end_year)
         
-        # 获取年份列
-        year_cols = [str(year) for year in range(start_year, end_year + 1) if str(year) in all_data.columns]
-        if not year_cols:
+        # 全球年度总额已预先汇总，取出年份范围对应的一段
+        aggregates = self.data_loader.get_aggregates()
+        if not aggregates.matrix.years_in_range(start_year, end_year):
             raise ValueError("指定的年份范围在数据中不存在")
         
-        # 计算每年的全球总和
-        global_trend = {}
-        for year in year_cols:
-            global_trend[year] = all_data[year].sum(skipna=True)
-        
-        # 转换为DataFrame
-        trend_df = pd.DataFrame(list(global_trend.items()), columns=['Year', 'Total Military Expenditure'])
-        trend_df['Year'] = trend_df['Year'].astype(int)
-        
-        return trend_df.sort_values(by='Year') 
\ No newline at end of file
+        return self._cached_result(('global_trend', start_year, end_year), aggregates,
+                                   lambda: aggregates.global_trend(start_year, end_year)) 
\ No newline at end of file
@@ -3,130 +3,1686 @@
 
 """
 数据加载模块
-负责从Excel文件中读取军事数据
+负责从Excel文件（或导出的JSON文件）中读取军事数据
 """
 
 import os
+import re
+import hashlib
+import importlib.util
+import threading
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Union, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List, Optional, Union, Tuple
+from data.snapshot import snapshot_path, save_snapshot, load_snapshot, read_snapshot_digest
+from data.milex_matrix import MilexMatrix, OBSERVED, MISSING_OTHER, MISSING_PLACEHOLDERS
+from data.imputation import Imputer
+from data.mmap_store import write_mmap_store, read_mmap_header, open_mmap_store
+from data.sqlite_store import SqliteStore, write_sqlite_store, read_sqlite_meta
+from data.sipri_importer import SIPRI_WORKBOOK, DEFAULT_SIPRI_SHEET, import_sipri_sheet
+from data.metric_store import MetricStore, SIPRI_METRICS
+from data.country_stats import COUNTRY_STATS_FILES, read_country_stats, align_country_stats, derive_country_metrics
+from data.json_source import JSON_ALL_FILE, read_json_dataset, json_source_path
+from data.ingest import INGEST_VERSION, header_years, ingest_frame
+from data.aggregates import PrecomputedAggregates
+from data.memory_cache import MemoryCache, CacheNamespace, DEFAULT_CACHE_BUDGET, estimate_nbytes
 
 class DataLoader:
-    """数据加载器类，负责读取和处理军事数据"""
+    """数据加载器类，负责读取和处理军事数据（可在多个线程中共享同一实例）"""
     
-    def __init__(self, data_dir: str = None):
+    def __init__(self, data_dir: str = None, snapshot_dir: str = None, use_snapshots: bool = True,
+                 backend: str = 'pandas', source: str = 'rbdata', sipri_path: str = None,
+                 compact: bool = False, json_dir: str = None, year_window: Tuple[int, int] = None,
+                 cache_budget: Optional[int] = DEFAULT_CACHE_BUDGET, cache_policy: str = 'lru'):
         """
         初始化数据加载器
         
         Args:
             data_dir: 数据目录路径，默认为项目根目录下的rbdata
+            snapshot_dir: 二进制快照目录，默认为数据目录下的.snapshots
+            use_snapshots: 是否读写二进制快照
+            backend: 合并数据的存储后端，可选值为'pandas'（进程内DataFrame）、
+                'mmap'（多进程共享的内存映射文件）、'sqlite'（带覆盖索引的只读SQLite长表文件，
+                排名、国家比较和年份范围查询直接走索引）
+            source: 合并数据的来源，可选值为'rbdata'（手工拆分的current_data.xlsx）、
+                'sipri'（直接流式解析SIPRI原始数据文件，年份为1948-2023）、
+                'json'（流式解析data_converter.py导出的JSON文件，不需要Excel文件和openpyxl）；
+                为'rbdata'但Excel文件或openpyxl不可用时自动改用'json'
+            sipri_path: SIPRI原始数据文件路径，默认为数据目录上一级的SIPRI-Milex-data-1948-2023.xlsx
+            compact: 是否使用紧凑存储：国家列为分类类型，军费数值为float32，
+                缺失值另以位图记录（见MilexMatrix.missing_mask）
+            json_dir: JSON数据目录，默认为项目根目录下的web/public/data
+            year_window: 只加载的年份范围(起始年份, 结束年份)：按列名（年份）选取列，
+                Excel文件解析后只保留这些列，快照只读取这些列所在的字节区间；访问范围外的年份时（见ensure_years）
+                自动扩大范围并重新加载（数据经过append_year/patch_cells修改后不再扩大），
+                默认加载所有年份
+            cache_budget: 数据缓存、矩阵缓存和cache_namespace取得的命名空间（如图表缓存）共用的内存预算（字节），超出时按cache_policy
+                淘汰缓存项，被淘汰的数据下次访问时从快照或源文件重新加载；为None时不限制
+            cache_policy: 缓存淘汰策略，可选值为'lru'、'lfu'（见data.memory_cache）
         """
+        self._backends = ['pandas', 'mmap', 'sqlite']
+        if backend not in self._backends:
+            raise ValueError(f"不支持的后端: {backend}，可选值为: {', '.join(self._backends)}")
+        self.backend = backend
+        
+        self._sources = ['rbdata', 'sipri', 'json']
+        if source not in self._sources:
+            raise ValueError(f"不支持的数据来源: {source}，可选值为: {', '.join(self._sources)}")
+        self.source = source
+        
+        # 获取项目根目录
+        root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         if data_dir is None:
-            # 获取项目根目录
-            root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
             self.data_dir = os.path.join(root_dir, 'rbdata')
         else:
             self.data_dir = data_dir
+        
+        self.json_dir = json_dir if json_dir else os.path.join(root_dir, 'web', 'public', 'data')
+        self._continents = ['african', 'american', 'aisan', 'europen', 'easternasian']
+        
+        # 没有Excel文件或openpyxl的部署改用导出的JSON文件
+        if self.source == 'rbdata' and not self._excel_available() and self._json_available():
+            print(f"Excel数据文件或openpyxl不可用，改用JSON数据: {self.json_dir}")
+            self.source = 'json'
+        
+        self.sipri_path = sipri_path if sipri_path else os.path.join(os.path.dirname(self.data_dir), SIPRI_WORKBOOK)
+        
+        # 二进制快照设置
+        self.snapshot_dir = snapshot_dir if snapshot_dir else os.path.join(self.data_dir, '.snapshots')
+        self.use_snapshots = use_snapshots
+        
+        # 紧凑存储设置（快照始终以float64保存，仅内存中的数据为紧凑格式）
+        self.compact = compact
+        self._value_dtype = np.float32 if compact else np.float64
+            
+        # 数据缓存和矩阵缓存共用一个按字节预算淘汰的缓存
+        self._cache = MemoryCache(cache_budget, cache_policy)
+        # 数据缓存 {缓存键: DataFrame或MilexMatrix}
+        self._data_cache = self._cache.namespace('data')
+        # 缓存对应的源文件签名 {缓存键: {文件路径: (mtime, size, sha1)}}
+        self._source_stamps = {}
+        # 缓存对应的数据版本标识 {缓存键: 版本字符串}
+        self._data_versions = {}
+        # 军费矩阵缓存 {缓存键: (数据版本, MilexMatrix)}
+        self._matrix_cache = self._cache.namespace('matrix')
+        # 单元格来源标记缓存 {缓存键: 与DataFrame数值列逐列对应的uint8矩阵}
+        self._provenance_cache = {}
+        # 已打开的SQLite数据文件 (数据版本, SqliteStore)
+        self._sqlite_store = None
+        # 每个缓存键一把加载锁：同一键只由一个线程加载，其余线程等待其结果；
+        # 已加载且仍有效的数据不加锁直接读取
+        self._load_locks = {}
+        self._load_locks_guard = threading.Lock()
+        
+        # 设置默认年份范围（1948-2023，见rbdata/README.md）：没有表头行的数据文件按此命名年份列，
+        # 读取到带年份表头行的数据文件后以表头中的年份为准
+        self._default_years = list(range(1948, 2024))
+        
+        if year_window is not None and year_window[0] > year_window[1]:
+            raise ValueError(f"年份范围无效: {year_window[0]}-{year_window[1]}")
+        self.year_window = tuple(year_window) if year_window is not None else None
+        
+    def get_continent_data(self, continent: str) -> pd.DataFrame:
+        """
+        获取特定大洲的数据
+        
+        Args:
+            continent: 大洲名称，可选值为'african', 'american', 'aisan', 'europen', 'easternasian'
+            
+        Returns:
+            包含该大洲所有国家军事数据的DataFrame
+        """
+        if continent not in self._continents:
+            raise ValueError(f"不支持的大洲: {continent}，可选值为: {', '.join(self._continents)}")
+            
+        # 检查缓存（源文件未变化时直接返回）
+        cached = self._cached(continent)
+        if cached is not None:
+            return cached
+        
+        with self._load_lock(continent):
+            # 等待加载锁期间其它线程可能已完成加载
+            cached = self._cached(continent, record=False)
+            if cached is not None:
+                return cached
+            
+            # 读取数据（先记录签名，读取期间文件被修改时下次访问会重新加载）
+            file_path = self._source_path(continent)
+            stamps = self._capture_stamps([file_path])
+            df, provenance = self._load_workbook(file_path, stamps[file_path], continent)
+            df, matrix = self._compact_frame(df, provenance)
+            
+            # 缓存数据
+            self._store_cache(continent, df, stamps, provenance, matrix=matrix)
+            
+            return df
+    
+    def get_all_data(self) -> pd.DataFrame:
+        """
+        获取所有大洲的数据并合并
+        
+        Returns:
+            包含所有国家军事数据的DataFrame
+        """
+        # 检查缓存（源文件未变化时直接返回）
+        cached = self._cached('all')
+        if cached is not None:
+            return cached
+        
+        with self._load_lock('all'):
+            # 等待加载锁期间其它线程可能已完成加载
+            cached = self._cached('all', record=False)
+            if cached is not None:
+                return cached
+            
+            if self.backend == 'mmap':
+                return self._load_mmap_data()
+            if self.backend == 'sqlite':
+                return self._load_sqlite_data()
+            
+            df, stamps, provenance = self._read_all_data()
+            df, matrix = self._compact_frame(df, provenance)
+            self._store_cache('all', df, stamps, provenance, matrix=matrix)
+            
+            return df
+    
+    def _read_all_data(self) -> Tuple[pd.DataFrame, Dict[str, Optional[Tuple[int, int, str]]], Optional[np.ndarray]]:
+        """
+        从Excel文件（或其快照）读取合并数据
+        
+        Returns:
+            (合并后的DataFrame, 源文件签名, 单元格来源标记)
+        """
+        if self.source == 'sipri':
+            matrix = self.get_sipri_matrix()
+            stamps = dict(self._source_stamps[f"sipri:{DEFAULT_SIPRI_SHEET}"])
+            if self.year_window is None:
+                return matrix.to_frame(), stamps, matrix.provenance
+            # SIPRI工作表整体缓存，年份范围只决定合并数据取出的列
+            cols = matrix.year_slice(*self.year_window)
+            return matrix.to_frame(*self.year_window), stamps, matrix.provenance[:, cols]
+        
+        # 尝试直接读取合并后的数据文件
+        file_path = self._source_path('current_data')
+        try:
+            stamps = self._capture_stamps([file_path])
+            df, provenance = self._load_workbook(file_path, stamps[file_path], 'current_data')
+            return df, stamps, provenance
+        except Exception as e:
+            print(f"读取合并数据文件失败: {e}，尝试合并各大洲数据...")
+        
+        # 合并各大洲数据
+        # 合并文件的签名也一并记录，文件恢复或修改后会重新尝试读取
+        continent_paths = [self._source_path(continent) for continent in self._continents]
+        stamps = self._capture_stamps([file_path] + continent_paths)
+        
+        # 各大洲文件相互独立，在线程池中并发加载后一次性合并；
+        # 结果同时写入各大洲的缓存，之后按大洲查询（如计算地区总额）时不再重复解析
+        with ThreadPoolExecutor(max_workers=len(self._continents)) as executor:
+            dfs = list(executor.map(self.get_continent_data, self._continents))
+        
+        # 各大洲文件列一致时来源标记可直接按行拼接，否则由合并后的缺失值推断
+        provenances = [self._provenance_cache.get(continent) for continent in self._continents]
+        provenance = None
+        if all(p is not None for p in provenances) and all(df.columns.equals(dfs[0].columns) for df in dfs):
+            provenance = np.vstack(provenances)
+        
+        # 同一国家出现在多个大洲文件中时只保留排在前面的大洲
+        df, provenance, _ = ingest_frame(pd.concat(dfs, ignore_index=True), provenance)
+        return df, stamps, provenance
+    
+    def _load_mmap_data(self) -> pd.DataFrame:
+        """
+        通过内存映射文件加载合并数据
+        
+        映射文件记录了生成它的源数据版本，源文件变化或映射文件不存在时
+        先按常规方式读取并重建映射文件；没有任何源文件时直接使用已有的映射文件
+        
+        Returns:
+            年份列直接指向映射内存的DataFrame
+        """
+        store_path, stamps = self._merged_store_path('.milex')
+        has_sources = any(stamp is not None for stamp in stamps.values())
+        
+        header = read_mmap_header(store_path)
+        stale = header is None or (has_sources and header['source'] != self._version_of(stamps))
+        if stale or header['dtype'] != np.dtype(self._value_dtype).str:
+            df, stamps, provenance = self._read_all_data()
+            try:
+                matrix = MilexMatrix.from_frame(df, dtype=self._value_dtype, provenance=provenance)
+                write_mmap_store(store_path, matrix, self._version_of(stamps))
+            except Exception as e:
+                # 无法写入映射文件时退回进程内数据
+                print(f"写入内存映射文件失败: {e}")
+                df, matrix = self._compact_frame(df, provenance)
+                self._store_cache('all', df, stamps, provenance, matrix=matrix)
+                return df
+        
+        matrix, header = open_mmap_store(store_path)
+        
+        # DataFrame的年份列与矩阵共享映射内存，不产生额外副本
+        df = pd.DataFrame(matrix.values, columns=[str(year) for year in matrix.years], copy=False)
+        df.insert(0, 'Country', pd.Categorical(matrix.countries) if self.compact else matrix.countries)
+        
+        # 仅有映射文件的部署沿用文件头记录的版本
+        version = self._version_of(stamps) if has_sources else header['source']
+        self._store_cache('all', df, stamps, matrix.provenance, version=version, matrix=matrix)
+        
+        return df
+    
+    def _merged_store_path(self, extension: str) -> Tuple[str, Dict[str, Optional[Tuple[int, int, str]]]]:
+        """
+        获取合并数据的外部存储文件路径及对应的源文件签名
+        
+        与常规加载使用相同的源文件集合，保证各后端的数据版本一致
+        
+        Args:
+            extension: 存储文件扩展名
+            
+        Returns:
+            (存储文件路径, 源文件签名)
+        """
+        file_path = self.sipri_path if self.source == 'sipri' else self._source_path('current_data')
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        # 只加载部分年份时使用单独的存储文件，不覆盖完整数据的存储文件
+        if self.year_window is not None:
+            name = f"{name}_{self.year_window[0]}_{self.year_window[1]}"
+        store_path = os.path.join(self.snapshot_dir, f"{name}{extension}")
+        
+        stamps = self._capture_stamps([file_path])
+        if stamps[file_path] is None and self.source != 'sipri':
+            continent_paths = [self._source_path(continent) for continent in self._continents]
+            stamps = self._capture_stamps([file_path] + continent_paths)
+        
+        return store_path, stamps
+    
+    def _load_sqlite_data(self) -> pd.DataFrame:
+        """
+        通过SQLite数据文件加载合并数据
+        
+        数据文件记录了生成它的源数据版本，源文件变化或数据文件不存在时
+        先按常规方式读取并重建数据文件；没有任何源文件时直接使用已有的数据文件
+        
+        Returns:
+            由SQLite数据文件还原的DataFrame
+        """
+        store_path, stamps = self._merged_store_path('.sqlite')
+        has_sources = any(stamp is not None for stamp in stamps.values())
+        
+        meta = read_sqlite_meta(store_path)
+        if meta is None or (has_sources and meta['source'] != self._version_of(stamps)):
+            df, stamps, provenance = self._read_all_data()
+            try:
+                matrix = MilexMatrix.from_frame(df, provenance=provenance)
+                membership = self._continent_membership()
+                continents = [self._continents[membership[country]] if country in membership else None
+                              for country in matrix.countries]
+                write_sqlite_store(store_path, matrix, continents, self._version_of(stamps))
+            except Exception as e:
+                # 无法写入数据文件时退回进程内数据
+                print(f"写入SQLite数据文件失败: {e}")
+                df, matrix = self._compact_frame(df, provenance)
+                self._store_cache('all', df, stamps, provenance, matrix=matrix)
+                return df
+        
+        store = SqliteStore(store_path)
+        matrix = store.to_matrix(dtype=self._value_dtype)
+        
+        df = pd.DataFrame(matrix.values, columns=[str(year) for year in matrix.years], copy=False)
+        df.insert(0, 'Country', pd.Categorical(matrix.countries) if self.compact else matrix.countries)
+        
+        # 仅有数据文件的部署沿用其中记录的版本
+        version = self._version_of(stamps) if has_sources else store.meta['source']
+        self._store_cache('all', df, stamps, matrix.provenance, version=version, matrix=matrix)
+        
+        # 旧的数据存储不在这里关闭：其它线程可能仍在通过get_sqlite_store返回的引用查询，
+        # 最后一个引用释放后其连接随对象一起关闭
+        self._sqlite_store = (self._data_versions['all'], store)
+        
+        return df
+    
+    def get_sqlite_store(self) -> Optional[SqliteStore]:
+        """
+        获取与当前合并数据一致的SQLite数据文件
+        
+        Returns:
+            SQLite后端且内存中的数据未经append_year/patch_cells修改时返回数据存储，否则返回None
+        """
+        if self.backend != 'sqlite':
+            return None
+        
+        self.get_all_data()
+        if self._sqlite_store is None or self._sqlite_store[0] != self._data_versions['all']:
+            return None
+        return self._sqlite_store[1]
+    
+    def get_matrix(self, continent: str = None) -> MilexMatrix:
+        """
+        获取国家×年份军费矩阵
+        
+        矩阵的行与get_all_data（或get_continent_data）返回的DataFrame行一一对应，
+        随数据版本变化自动重建
+        
+        Args:
+            continent: 大洲名称，默认为合并后的所有数据
+            
+        Returns:
+            军费矩阵
+        """
+        key = 'all' if continent is None else continent
+        load = self.get_all_data if continent is None else lambda: self.get_continent_data(continent)
+        
+        load()
+        cached = self._matrix_cache.get(key)
+        if cached is not None and cached[0] == self._data_versions[key]:
+            return cached[1]
+        
+        # 持有数据的加载锁构建矩阵，保证DataFrame、来源标记和版本来自同一次加载
+        with self._load_lock(key):
+            df = load()
+            version = self._data_versions[key]
+            cached = self._matrix_cache.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            
+            if self.compact and self.backend != 'mmap':
+                # 矩阵已被淘汰：重新生成矩阵和与之共享内存的DataFrame，替换缓存中的DataFrame，
+                # 仍只保存一份数值（已返回的DataFrame不受影响；内存映射后端保留映射的数据）
+                df, matrix = self._compact_frame(df, self._provenance_cache.get(key))
+                if matrix is not None:
+                    self._data_cache.put(key, df, pinned=self._data_cache.is_pinned(key))
+                    self._cache_matrix(key, version, matrix, df)
+                    return matrix
+            
+            matrix = MilexMatrix.from_frame(df, dtype=self._value_dtype, provenance=self._provenance_cache.get(key))
+            if self.compact:
+                # 紧凑模式下预先生成缺失值位图
+                matrix.missing_mask
+            self._cache_matrix(key, version, matrix)
+            
+            return matrix
+    
+    def get_imputed_matrix(self, continent: str = None, imputer: Imputer = None) -> MilexMatrix:
+        """
+        获取插补缺失值后的军费矩阵
+        
+        插补结果按数据版本和插补配置缓存；矩阵的provenance标记了每个单元格
+        是有记录、哪种缺失还是插补得到（见data.milex_matrix中的来源标记）
+        
+        Args:
+            continent: 大洲名称，默认为合并后的所有数据
+            imputer: 插补器，默认按rbdata说明："..."取此前5年均值，"xx"沿用前一年的值
+            
+        Returns:
+            军费矩阵
+        """
+        imputer = imputer if imputer is not None else Imputer()
+        self.get_matrix(continent)
+        
+        key = 'all' if continent is None else continent
+        cache_key = f"imputed:{key}:{imputer.key}"
+        cached = self._matrix_cache.get(cache_key)
+        if cached is not None and cached[0] == self._data_versions[key]:
+            return cached[1]
+        
+        with self._load_lock(key):
+            matrix = self.get_matrix(continent)
+            version = self._data_versions[key]
+            cached = self._matrix_cache.get(cache_key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            
+            imputed = imputer.apply(matrix)
+            self._matrix_cache[cache_key] = (version, imputed)
+            
+            return imputed
+    
+    def get_continent_labels(self) -> np.ndarray:
+        """
+        获取合并数据中每一行所属的大洲编号
+        
+        大洲成员关系取自各大洲数据文件，编号为大洲在_continents中的下标，
+        不属于任何大洲的行（如地区汇总行）为-1
+        
+        Returns:
+            与get_all_data返回的DataFrame行一一对应的整数数组
+        """
+        return self._continent_aggregates()[0]
+    
+    def get_continent_totals(self) -> MilexMatrix:
+        """
+        获取大洲×年份军费总额矩阵
+        
+        矩阵的行为大洲名称（顺序与_continents一致），由合并数据按大洲编号
+        一次分组求和得到，缺失值按0计；随数据版本变化自动重建
+        
+        Returns:
+            军费矩阵
+        """
+        return self._continent_aggregates()[1]
+    
+    def get_aggregates(self) -> PrecomputedAggregates:
+        """
+        获取预先汇总结果（全球年度总额、大洲×年份总额、每年的降序排名和占全球比例）
+        
+        每个数据版本只计算一次，随数据版本变化自动重建
+        
+        Returns:
+            预先汇总结果
+        """
+        self.get_continent_totals()
+        cached = self._matrix_cache.get('aggregates')
+        if cached is not None and cached[0] == self._continent_version():
+            return cached[1]
+        
+        with self._load_lock('all'):
+            # 先取版本再取数据，与大洲汇总相同；大洲总额沿用get_continent_totals的结果
+            # （append_year/patch_cells只增量更新受影响的年份列），不重新分组求和
+            version = self._continent_version()
+            totals = self.get_continent_totals()
+            matrix = self.get_matrix()
+            cached = self._matrix_cache.get('aggregates')
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            
+            aggregates = PrecomputedAggregates(matrix, totals)
+            self._matrix_cache['aggregates'] = (version, aggregates)
+            
+            return aggregates
+    
+    def _continent_membership(self) -> Dict[str, int]:
+        """
+        根据各大洲数据文件获取国家所属的大洲编号
+        
+        Returns:
+            国家名称到大洲编号（在_continents中的下标）的映射
+        """
+        membership = {}
+        for code, continent in enumerate(self._continents):
+            for country in self.get_matrix(continent).countries:
+                membership.setdefault(country, code)
+        return membership
+    
+    def _continent_aggregates(self) -> Tuple[np.ndarray, MilexMatrix]:
+        """
+        构建（或从缓存获取）每行的大洲编号和大洲×年份总额矩阵
+        
+        Returns:
+            (大洲编号数组, 大洲总额矩阵)
+        """
+        self.get_matrix()
+        self._continent_membership()
+        
+        # 合并数据与各大洲文件任一变化都需要重建
+        cached = self._matrix_cache.get('continents')
+        if cached is not None and cached[0] == self._continent_version():
+            return cached[1]
+        
+        # 与append_year/patch_cells相同，先取合并数据的锁再取各大洲的锁
+        with self._load_lock('all'):
+            # 先取版本再取数据：构建期间大洲文件被重新加载时，结果只会比版本新，下次访问即重建
+            version = self._continent_version()
+            matrix = self.get_matrix()
+            membership = self._continent_membership()
+            cached = self._matrix_cache.get('continents')
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            
+            labels = np.array([membership.get(country, -1) for country in matrix.countries], dtype=np.int64)
+            
+            # 一次分组归约：按大洲编号把各行累加到对应的总额行
+            totals = np.zeros((len(self._continents), len(matrix.years)))
+            known = labels >= 0
+            np.add.at(totals, labels[known], np.nan_to_num(matrix.values[known]))
+            
+            aggregates = (labels, MilexMatrix(self._continents, matrix.years, totals))
+            self._matrix_cache['continents'] = (version, aggregates)
+            
+            return aggregates
+    
+    def _continent_version(self) -> str:
+        """
+        大洲汇总对应的数据版本（合并数据与各大洲数据版本的组合）
+        
+        Returns:
+            版本字符串
+        """
+        return '|'.join(self._data_versions[key] for key in ['all'] + self._continents)
+    
+    def append_year(self, year: int, values: Dict[str, float]) -> str:
+        """
+        在合并数据末尾追加一个年份列，增量更新内存中的数据而不重新解析源文件
+        
+        合并数据、各大洲数据及其军费矩阵和大洲汇总同步更新，数据版本随之改变；
+        追加的数据只保存在内存中，源文件内容变化后重新加载时会被丢弃
+        
+        Args:
+            year: 新增年份，必须紧接在当前最后一个年份之后
+            values: 国家名称到军费支出的映射，未提供的国家记为缺失
+            
+        Returns:
+            新的数据版本标识
+        """
+        # 只加载部分年份时先加载到源数据的最后一个年份：修改之后不再扩大年份范围
+        # （新增年份已在源数据中时也一并加载，随后按年份不连续拒绝追加）
+        self.ensure_years(int(year) - 1, int(year))
+        
+        # 持有合并数据和各大洲数据的加载锁，修改期间其它线程不会读到一半更新的数据
+        with self._write_locks():
+            labels, totals = self._continent_aggregates()
+            matrix = self.get_matrix()
+            
+            if not matrix.years or int(year) != matrix.end_year + 1:
+                raise ValueError(f"新增年份必须紧接在最后一个年份 {matrix.end_year} 之后: {year}")
+            year = int(year)
+            
+            unknown = [country for country in values if not matrix.has_country(country)]
+            if unknown:
+                raise ValueError(f"未找到国家: {', '.join(unknown)}")
+            
+            for key in ['all'] + self._continents:
+                key_matrix = self.get_matrix(None if key == 'all' else key)
+                column = np.array([values.get(country, np.nan) for country in key_matrix.countries], dtype=np.float64)
+                
+                codes = np.where(np.isnan(column), MISSING_OTHER, OBSERVED).astype(np.uint8)
+                new_matrix = MilexMatrix(key_matrix.countries, key_matrix.years + [year],
+                                         np.hstack([key_matrix.values, column[:, None]]),
+                                         dtype=key_matrix.values.dtype,
+                                         provenance=np.hstack([key_matrix.provenance, codes[:, None]]))
+                
+                # 新列放在最后一个年份列之后（rbdata数据中其后还有未命名的多余列）
+                df = self._dataset(key).copy(deep=False)
+                df.insert(df.columns.get_loc(str(key_matrix.end_year)) + 1, str(year),
+                          new_matrix.values[:, -1])
+                
+                self._replace_dataset(key, df, new_matrix, f"append:{year}".encode('ascii') + column.tobytes())
+            
+            # 大洲汇总只需计算新增的一列
+            new_matrix = self.get_matrix()
+            totals = MilexMatrix(totals.countries, new_matrix.years,
+                                 np.hstack([totals.values, self._continent_column(labels, new_matrix.values[:, -1])[:, None]]))
+            self._replace_continent_aggregates(labels, totals)
+            
+            return self._data_versions['all']
+    
+    def patch_cells(self, changes: Dict[Tuple[str, int], float]) -> str:
+        """
+        修改合并数据中的若干单元格，增量更新内存中的数据而不重新解析源文件
+        
+        合并数据、各大洲数据及其军费矩阵同步更新，大洲汇总只重新计算受影响的年份；
+        已返回的数据视图保持修改前的内容。修改只保存在内存中，
+        源文件内容变化后重新加载时会被丢弃
+        
+        Args:
+            changes: (国家名称, 年份)到新值的映射，值为None或NaN表示缺失
+            
+        Returns:
+            新的数据版本标识
+        """
+        # 只加载部分年份时先扩大到包含要修改的年份：修改之后不再扩大年份范围
+        if changes:
+            years = [int(year) for _, year in changes]
+            self.ensure_years(min(years), max(years))
+        
+        # 持有合并数据和各大洲数据的加载锁，修改期间其它线程不会读到一半更新的数据
+        with self._write_locks():
+            labels, totals = self._continent_aggregates()
+            matrix = self.get_matrix()
+            
+            cells = []
+            for (country, year), value in changes.items():
+                if not matrix.has_country(country):
+                    raise ValueError(f"未找到国家: {country}")
+                if not matrix.has_year(year):
+                    raise ValueError(f"数据中不存在年份: {year}")
+                cells.append((country, int(year), np.nan if pd.isna(value) else float(value)))
+            if not cells:
+                return self._data_versions['all']
+            
+            for key in ['all'] + self._continents:
+                key_matrix = self.get_matrix(None if key == 'all' else key)
+                hits = [(key_matrix.row_of(country), key_matrix.col_of(year), value)
+                        for country, year, value in cells if key_matrix.has_country(country)]
+                if not hits:
+                    continue
+                rows, cols, new_values = (np.array(items) for items in zip(*hits))
+                rows, cols = rows.astype(np.int64), cols.astype(np.int64)
+                
+                # 写时复制：已返回的视图和DataFrame不受影响
+                values = key_matrix.values.copy()
+                values[rows, cols] = new_values
+                provenance = key_matrix.provenance.copy()
+                provenance[rows, cols] = np.where(np.isnan(new_values), MISSING_OTHER, OBSERVED)
+                new_matrix = MilexMatrix(key_matrix.countries, key_matrix.years, values, dtype=values.dtype,
+                                         provenance=provenance)
+                
+                df = self._dataset(key).copy(deep=False)
+                for col in np.unique(cols):
+                    df[str(key_matrix.years[col])] = new_matrix.values[:, col]
+                
+                payload = rows.tobytes() + cols.tobytes() + new_values.astype(np.float64).tobytes()
+                self._replace_dataset(key, df, new_matrix, b'patch:' + payload)
+            
+            # 大洲汇总只重新计算受影响的年份列
+            new_matrix = self.get_matrix()
+            totals_values = totals.values.copy()
+            for year in {year for _, year, _ in cells}:
+                col = new_matrix.col_of(year)
+                totals_values[:, totals.col_of(year)] = self._continent_column(labels, new_matrix.values[:, col])
+            self._replace_continent_aggregates(labels, MilexMatrix(totals.countries, totals.years, totals_values))
+            
+            return self._data_versions['all']
+    
+    def _load_lock(self, key: str) -> threading.RLock:
+        """
+        获取缓存键对应的加载锁
+        
+        锁可重入：持有锁的线程在加载过程中可以再次访问同一缓存键
+        
+        Args:
+            key: 缓存键
+            
+        Returns:
+            该缓存键的锁
+        """
+        lock = self._load_locks.get(key)
+        if lock is None:
+            with self._load_locks_guard:
+                lock = self._load_locks.setdefault(key, threading.RLock())
+        return lock
+    
+    def _write_locks(self) -> ExitStack:
+        """
+        依次获取合并数据和各大洲数据的加载锁
+        
+        所有同时持有多把锁的代码都按'all'在前、各大洲在后的顺序获取，避免死锁
+        
+        Returns:
+            退出时释放所有锁的上下文
+        """
+        stack = ExitStack()
+        for key in ['all'] + self._continents:
+            stack.enter_context(self._load_lock(key))
+        return stack
+    
+    def _replace_dataset(self, key: str, df: pd.DataFrame, matrix: MilexMatrix, change: bytes):
+        """
+        用增量更新后的数据替换缓存项，并由旧版本和变更内容派生新的数据版本
+        
+        源文件签名保持不变，源文件未变化时缓存继续有效
+        
+        Args:
+            key: 缓存键
+            df: 更新后的DataFrame
+            matrix: 更新后的军费矩阵
+            change: 变更内容的字节表示
+        """
+        version = hashlib.sha1(self._data_versions[key].encode('ascii') + change).hexdigest()[:16]
+        if self.compact:
+            matrix.missing_mask
+            # 年份列改为直接指向更新后的矩阵，DataFrame和矩阵仍只保存一份数值
+            frame = self._frame_over(matrix, df)
+            df = frame if frame is not None else df
+        
+        # 来源标记与DataFrame的数值列逐列对应：年份列取自更新后的矩阵，其余列沿用原有标记
+        old_df = self._dataset(key)
+        old_provenance = self._provenance_cache.get(key)
+        old_positions = {col: i for i, col in enumerate(old_df.columns[1:])}
+        provenance = np.empty((len(df), len(df.columns) - 1), dtype=np.uint8)
+        for i, col in enumerate(df.columns[1:]):
+            if str(col).isdigit() and matrix.has_year(int(col)):
+                provenance[:, i] = matrix.provenance[:, matrix.col_of(int(col))]
+            elif old_provenance is not None and col in old_positions:
+                provenance[:, i] = old_provenance[:, old_positions[col]]
+            else:
+                provenance[:, i] = np.where(df[col].isna(), MISSING_OTHER, OBSERVED)
+        
+        # 不加锁的读取方按版本匹配矩阵缓存：先写入新版本的矩阵，最后才更新版本
+        # 修改后的数据无法从源文件重建，固定在缓存中不被淘汰
+        self._cache_matrix(key, version, matrix, df)
+        self._provenance_cache[key] = provenance
+        self._data_cache.put(key, df, pinned=True)
+        self._data_versions[key] = version
+    
+    def _replace_continent_aggregates(self, labels: np.ndarray, totals: MilexMatrix):
+        """
+        写入增量更新后的大洲汇总
+        
+        Args:
+            labels: 大洲编号数组
+            totals: 大洲总额矩阵
+        """
+        self._matrix_cache['continents'] = (self._continent_version(), (labels, totals))
+    
+    def _continent_column(self, labels: np.ndarray, column: np.ndarray) -> np.ndarray:
+        """
+        按大洲编号汇总一个年份列
+        
+        Args:
+            labels: 大洲编号数组
+            column: 一维数值数组，与labels一一对应
+            
+        Returns:
+            各大洲总额，缺失值按0计
+        """
+        known = labels >= 0
+        return np.bincount(labels[known], weights=np.nan_to_num(column[known].astype(np.float64)),
+                           minlength=len(self._continents))
+    
+    def get_sipri_matrix(self, sheet_name: str = DEFAULT_SIPRI_SHEET) -> MilexMatrix:
+        """
+        从SIPRI原始数据文件中导入一个工作表
+        
+        使用流式XML解析，年份轴为工作表表头中的实际年份（1948-2023）；
+        结果按源文件签名缓存，并写入二进制快照
+        
+        Args:
+            sheet_name: 工作表名称，默认为'Constant (2022) US$'
+            
+        Returns:
+            军费矩阵
+        """
+        key = f"sipri:{sheet_name}"
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        
+        with self._load_lock(key):
+            # 等待加载锁期间其它线程可能已完成加载
+            cached = self._cached(key, record=False)
+            if cached is not None:
+                return cached
+            
+            stamps = self._capture_stamps([self.sipri_path])
+            stamp = stamps[self.sipri_path]
+            if stamp is None:
+                raise FileNotFoundError(f"未找到SIPRI原始数据文件: {self.sipri_path}")
+            
+            cache_file = os.path.join(self.snapshot_dir, f"sipri_{re.sub(r'[^0-9A-Za-z]+', '_', sheet_name).strip('_')}.npz")
+            snapshot = load_snapshot(cache_file, stamp[2]) if self.use_snapshots else None
+            if snapshot is not None:
+                df, provenance = snapshot
+                matrix = MilexMatrix.from_frame(df, provenance=provenance)
+            else:
+                matrix = import_sipri_sheet(self.sipri_path, sheet_name)
+                if self.use_snapshots:
+                    try:
+                        save_snapshot(cache_file, matrix.to_frame(), stamp[2], matrix.provenance)
+                    except Exception as e:
+                        print(f"写入数据快照失败: {e}")
+            
+            self._store_cache(key, matrix, stamps)
+            
+            return matrix
+    
+    def get_metric_store(self) -> MetricStore:
+        """
+        获取包含所有SIPRI指标的多指标数据存储
+        
+        指标包括不变价美元、现价美元、占GDP比例、人均军费和占政府支出比例，
+        源文件变化时自动重建
+        
+        Returns:
+            多指标数据存储
+        """
+        # 所有指标来自同一个源文件，任取一个工作表的版本即可
+        version_key = f"sipri:{SIPRI_METRICS['constant_usd']}"
+        self.get_sipri_matrix(SIPRI_METRICS['constant_usd'])
+        cached = self._matrix_cache.get('metrics')
+        if cached is not None and cached[0] == self._data_versions[version_key]:
+            return cached[1]
+        
+        with self._load_lock('metrics'):
+            # 先取版本再取数据，构建期间源文件变化时结果只会比版本新
+            version = self._data_versions[version_key]
+            cached = self._matrix_cache.get('metrics')
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            
+            matrices = {metric: self.get_sipri_matrix(sheet) for metric, sheet in SIPRI_METRICS.items()}
+            store = MetricStore(matrices)
+            self._matrix_cache['metrics'] = (version, store)
+            
+            return store
+    
+    def get_country_stats(self) -> pd.DataFrame:
+        """
+        获取与合并数据行对齐的国家人口与对美贸易数据
+        
+        CSV文件按源文件签名缓存，与合并数据的连接通过国家名称别名索引
+        在数据版本变化时才重新计算一次
+        
+        Returns:
+            与get_all_data返回的DataFrame行一一对应的DataFrame，
+            包含Country列和人口、贸易额、关税等数值列，未匹配的国家为NaN
+        """
+        return self._country_aggregates()[0]
+    
+    def get_country_metric_store(self) -> MetricStore:
+        """
+        获取由军费数据和国家人口与贸易数据派生的多指标数据存储
+        
+        指标见COUNTRY_METRICS：人均军费（美元）以及军费与对美出口、进口、
+        进出口总额之比；人口和贸易额为单一年份的数据，用于所有年份
+        
+        Returns:
+            多指标数据存储
+        """
+        return self._country_aggregates()[1]
+    
+    def _country_aggregates(self) -> Tuple[pd.DataFrame, MetricStore]:
+        """
+        构建（或从缓存获取）对齐后的国家数据和派生指标
+        
+        Returns:
+            (对齐后的国家数据, 派生指标数据存储)
+        """
+        key = 'country_stats'
+        self._load_country_stats()
+        self.get_matrix()
+        
+        # 合并数据与CSV文件任一变化都需要重新连接
+        cached = self._matrix_cache.get('country_metrics')
+        if cached is not None and cached[0] == f"{self._data_versions['all']}|{self._data_versions[key]}":
+            return cached[1]
+        
+        with self._load_lock('all'):
+            # 先取版本再取数据，构建期间CSV文件被重新加载时结果只会比版本新
+            version = f"{self._data_versions['all']}|{self._data_versions[key]}"
+            stats = self._load_country_stats()
+            matrix = self.get_matrix()
+            cached = self._matrix_cache.get('country_metrics')
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            
+            aligned = align_country_stats(matrix.countries, stats)
+            aggregates = (aligned, MetricStore(derive_country_metrics(matrix, aligned)))
+            self._matrix_cache['country_metrics'] = (version, aggregates)
+            
+            return aggregates
+    
+    def _load_country_stats(self) -> pd.DataFrame:
+        """
+        获取（必要时重新读取）国家人口与对美贸易CSV数据
+        
+        Returns:
+            CSV文件中的国家数据
+        """
+        key = 'country_stats'
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        
+        with self._load_lock(key):
+            cached = self._cached(key, record=False)
+            if cached is not None:
+                return cached
+            
+            file_paths = [os.path.join(self.data_dir, name) for name in COUNTRY_STATS_FILES]
+            stamps = self._capture_stamps(file_paths)
+            stats = read_country_stats(file_paths)
+            self._store_cache(key, stats, stamps)
+            
+            return stats
+    
+    @property
+    def data_version(self) -> str:
+        """
+        当前合并数据的版本标识
+        
+        由源文件内容哈希计算得到，源文件内容变化时随之改变，
+        可作为下游缓存的键
+        
+        Returns:
+            版本标识字符串
+        """
+        self.get_all_data()
+        return self._data_versions['all']
+    
+    def _read_workbook(self, file_path: str) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        读取并清洗单个Excel数据文件
+        
+        Args:
+            file_path: Excel文件路径
+            
+        Returns:
+            (处理后的DataFrame, 与df.columns[1:]逐列对应的单元格来源标记)
+        """
+        # 指定没有表头
+        df = pd.read_excel(file_path, header=None)
+        
+        # 手动设置列名
+        # 第一列是国家名称，后面的列是费用数据
+        # 有年份表头行（如current_data.xlsx的第一行）时以表头为准，否则按默认年份范围依次命名
+        years = header_years(df)
+        self._adopt_header_years(years)
+        column_names = ['Country']
+        for position, i in enumerate(df.columns[1:]):
+            # 确保年份索引不超出范围
+            year_idx = i - 1
+            if years is not None and years[position] is not None:
+                column_names.append(str(years[position]))
+            elif years is None and year_idx < len(self._default_years):
+                column_names.append(str(self._default_years[year_idx]))
+            else:
+                # 如果列数超过预设年份数，使用索引作为列名
+                column_names.append(f"Column_{i}")
+        
+        df.columns = column_names
+        
+        # 替换前记录每个单元格的来源："..."、"xx"等占位符按类型标记，其余缺失为无法识别
+        provenance = np.full((len(df), len(df.columns) - 1), MISSING_OTHER, dtype=np.uint8)
+        for placeholder, code in MISSING_PLACEHOLDERS.items():
+            provenance[(df.iloc[:, 1:] == placeholder).to_numpy()] = code
+        
+        # 处理缺失值
+        df.replace("...", np.nan, inplace=True)
+        df.replace("xx", np.nan, inplace=True)
+        
+        # 将费用数据列转换为数值类型（超出年份范围的列中还有"xxx"等占位符）
+        for col in df.columns[1:]:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        
+        provenance[df.iloc[:, 1:].notna().to_numpy()] = OBSERVED
+        
+        return df, provenance
+    
+    def _adopt_header_years(self, years: Optional[List[Optional[int]]]):
+        """
+        以完整读取的数据文件表头中的年份作为默认年份范围
+        
+        没有表头行的数据文件按默认年份范围命名年份列，ensure_years也以此判断源数据中有哪些年份
+        
+        Args:
+            years: header_years的结果，没有年份表头行时为None（保持原有范围）
+        """
+        if years is None:
+            return
+        years = [year for year in years if year is not None]
+        if years and years != self._default_years:
+            self._default_years = years
+    
+    def _load_workbook(self, file_path: str, stamp: Optional[Tuple[int, int, str]],
+                       dataset: str = None) -> Tuple[pd.DataFrame, Optional[np.ndarray]]:
+        """
+        加载并清洗单个数据文件（删除表头行和重复的国家，见data.ingest）
+        
+        Args:
+            file_path: Excel或JSON文件路径
+            stamp: 源文件签名(mtime, size, sha1)
+            dataset: 数据文件名（不含扩展名），从合并JSON文件中取出对应的记录
             
-        # 数据缓存
-        self._data_cache = {}
-        self._continents = ['african', 'american', 'aisan', 'europen', 'easternasian']
+        Returns:
+            (处理后的DataFrame, 单元格来源标记)
+        """
+        df, provenance = self._read_source(file_path, stamp, dataset)
         
-        # 设置默认年份范围（1960-2022）
-        self._default_years = list(range(1960, 2023))
+        # 快照保存的是清洗前的解析结果，清洗规则变化时无需重建快照
+        df, provenance, _ = ingest_frame(df, provenance)
+        return df, provenance
+    
+    def _read_source(self, file_path: str, stamp: Optional[Tuple[int, int, str]],
+                     dataset: str = None) -> Tuple[pd.DataFrame, Optional[np.ndarray]]:
+        """
+        读取单个数据文件，优先使用与源文件哈希一致的二进制快照
         
-    def get_continent_data(self, continent: str) -> pd.DataFrame:
+        Args:
+            file_path: Excel或JSON文件路径
+            stamp: 源文件签名(mtime, size, sha1)
+            dataset: 数据文件名（不含扩展名），从合并JSON文件中取出对应的记录
+            
+        Returns:
+            (未清洗的DataFrame, 单元格来源标记)
         """
-        获取特定大洲的数据
+        window = self.year_window
+        
+        # JSON文件流式解析本身足够快，不使用快照（快照按文件名命名，会与同名Excel文件的快照冲突）
+        if file_path.endswith('.json'):
+            # 合并JSON文件本身即为合并数据（清洗时去除重复的国家），大洲数据按Continent字段取出
+            if os.path.basename(file_path) != JSON_ALL_FILE or dataset == 'current_data':
+                dataset = None
+            years = None if window is None else list(range(window[0], window[1] + 1))
+            return read_json_dataset(file_path, dataset, years)
+        
+        if not self.use_snapshots or stamp is None:
+            return self._window_frame(*self._read_workbook(file_path))
+        
+        # 快照中数值按列连续存放，只加载部分年份时按列名（年份）直接读取对应的字节区间
+        cache_file = snapshot_path(self.snapshot_dir, file_path)
+        snapshot = load_snapshot(cache_file, stamp[2], year_range=window)
+        if snapshot is not None:
+            if window is None:
+                self._adopt_header_years(header_years(snapshot[0]))
+            return snapshot
+        
+        # 快照始终保存所有列：没有快照时完整解析一次，之后任意年份范围都只读取快照
+        df, provenance = self._read_workbook(file_path)
+        
+        # 快照写入失败（如目录只读）不影响数据加载
+        try:
+            save_snapshot(cache_file, df, stamp[2], provenance)
+        except Exception as e:
+            print(f"写入数据快照失败: {e}")
+        
+        return self._window_frame(df, provenance)
+    
+    def _window_frame(self, df: pd.DataFrame, provenance: np.ndarray) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        只保留年份范围内的年份列（按列名中的年份选取，与数据文件的年份轴一致）
         
         Args:
-            continent: 大洲名称，可选值为'african', 'american', 'aisan', 'europen', 'easternasian'
+            df: 完整解析的DataFrame
+            provenance: 与df.columns[1:]逐列对应的单元格来源标记
             
         Returns:
-            包含该大洲所有国家军事数据的DataFrame
+            (筛选后的DataFrame, 筛选后的来源标记)，加载所有年份时原样返回
         """
-        if continent not in self._continents:
-            raise ValueError(f"不支持的大洲: {continent}，可选值为: {', '.join(self._continents)}")
+        if self.year_window is None:
+            return df, provenance
+        keep = [i for i, col in enumerate(df.columns[1:])
+                if str(col).isdigit() and self.year_window[0] <= int(col) <= self.year_window[1]]
+        return df.iloc[:, [0] + [i + 1 for i in keep]], provenance[:, keep]
+    
+    def ensure_years(self, start_year: int, end_year: int = None) -> bool:
+        """
+        确保年份范围已加载：只加载部分年份时，把加载范围扩大到包含指定的年份
+        
+        扩大范围后合并数据和各大洲数据在下次访问时按新范围重新加载
+        （已有快照时只读取新增的列所在的字节区间），派生数据随数据版本重建。
+        内存中的数据经过append_year/patch_cells修改时不扩大范围（重新加载会丢弃这些修改），
+        范围外的年份仍视为不存在；源文件变化后重新加载时修改被丢弃，之后可以正常扩大
+        
+        Args:
+            start_year: 起始年份
+            end_year: 结束年份，默认与起始年份相同
+            
+        Returns:
+            范围是否已包含指定的年份（源数据中没有的年份不计）
+        """
+        window = self.year_window
+        if window is None:
+            return True
+        
+        # 源数据中没有的年份不必加载，例如查询第一年的上一年时不扩大范围
+        if self.source == 'sipri':
+            years = self.get_sipri_matrix().years
+        else:
+            years = self._default_years
+        end_year = start_year if end_year is None else end_year
+        start_year, end_year = max(start_year, years[0]), min(end_year, years[-1])
+        if start_year > end_year or (window[0] <= start_year and end_year <= window[1]):
+            return True
+        
+        with self._write_locks():
+            edited = [key for key in ['all'] + self._continents if self._data_cache.is_pinned(key)]
+            if edited:
+                print(f"数据已在内存中修改，不扩大年份范围（重新加载会丢弃修改）: {start_year}-{end_year}")
+                return False
             
-        # 检查缓存
-        if continent in self._data_cache:
-            return self._data_cache[continent]
+            window = self.year_window
+            self.year_window = (min(window[0], start_year), max(window[1], end_year))
+            for key in ['all'] + self._continents:
+                self._source_stamps.pop(key, None)
+        
+        return True
+    
+    def _compact_frame(self, df: pd.DataFrame,
+                       provenance: Optional[np.ndarray] = None) -> Tuple[pd.DataFrame, Optional[MilexMatrix]]:
+        """
+        紧凑模式下转换数据类型：国家列转为分类类型，军费数值列转为float32
+        
+        年份列直接使用float32军费矩阵的内存（见_frame_over），DataFrame和矩阵只保存一份数值
+        
+        Args:
+            df: 处理后的DataFrame
+            provenance: 与df.columns[1:]逐列对应的单元格来源标记
             
-        # 读取数据
-        file_path = os.path.join(self.data_dir, f"{continent}.xlsx")
-        df = pd.read_excel(file_path, header=None)  # 指定没有表头
+        Returns:
+            (紧凑模式下为转换后的DataFrame，否则原样返回；
+            与其年份列共享内存的军费矩阵，非紧凑模式或无法共享内存时为None)
+        """
+        if not self.compact:
+            return df, None
         
-        # 手动设置列名
-        # 第一列是国家名称，后面的列是费用数据
-        # 由于没有年份标签，我们使用默认年份范围作为列名
-        column_names = ['Country']
-        for i in range(1, len(df.columns)):
-            # 确保年份索引不超出范围
-            year_idx = i - 1
-            if year_idx < len(self._default_years):
-                column_names.append(str(self._default_years[year_idx]))
+        matrix = MilexMatrix.from_frame(df, dtype=np.float32, provenance=provenance)
+        frame = self._frame_over(matrix, df)
+        if frame is not None:
+            # 紧凑模式下预先生成缺失值位图
+            matrix.missing_mask
+            return frame, matrix
+        
+        # 年份列不连续或有其它数值列时无法共享内存，逐列转换
+        df = df.astype({col: np.float32 for col in df.columns[1:]})
+        df[df.columns[0]] = df[df.columns[0]].astype('category')
+        return df, None
+    
+    @staticmethod
+    def _frame_over(matrix: MilexMatrix, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        构建年份列直接指向军费矩阵内存的DataFrame（国家列为分类类型）
+        
+        Args:
+            matrix: 军费矩阵
+            df: 与矩阵行一一对应的DataFrame，提供国家列
+            
+        Returns:
+            与df列名相同的DataFrame；df除国家列外不是恰好按顺序排列的矩阵年份列时返回None
+        """
+        year_cols = [str(year) for year in matrix.years]
+        if [str(col) for col in df.columns[1:]] != year_cols:
+            return None
+        
+        frame = pd.DataFrame(matrix.values, columns=year_cols, copy=False)
+        frame.insert(0, df.columns[0], pd.Categorical(df.iloc[:, 0]))
+        return frame
+    
+    @staticmethod
+    def _shares_values(frame: Any, matrix: MilexMatrix) -> bool:
+        """
+        检查DataFrame的年份列是否直接指向军费矩阵的内存
+        
+        Args:
+            frame: 缓存的数据
+            matrix: 军费矩阵
+            
+        Returns:
+            是否共享内存
+        """
+        if not isinstance(frame, pd.DataFrame) or not matrix.years or str(matrix.years[0]) not in frame.columns:
+            return False
+        return np.shares_memory(frame[str(matrix.years[0])].to_numpy(), matrix.values)
+    
+    def _cache_matrix(self, key: str, version: str, matrix: MilexMatrix, frame: pd.DataFrame = None):
+        """
+        写入军费矩阵缓存
+        
+        矩阵数值与frame的年份列共享内存时，数值已随DataFrame计入内存预算，
+        矩阵缓存项只计缺失值位图和来源标记
+        
+        Args:
+            key: 缓存键
+            version: 数据版本标识
+            matrix: 军费矩阵
+            frame: 与矩阵对应的DataFrame
+        """
+        size = estimate_nbytes((version, matrix))
+        if frame is not None and self._shares_values(frame, matrix):
+            size -= matrix.values.nbytes
+        self._matrix_cache.put(key, (version, matrix), size=size)
+    
+    def memory_report(self) -> Dict[str, int]:
+        """
+        统计当前已缓存数据占用的内存
+        
+        DataFrame按memory_usage(deep=True)统计（包含字符串对象），
+        矩阵按数值数组和缺失值位图统计；与DataFrame共享内存的矩阵数值
+        （紧凑模式和内存映射后端）只计入DataFrame。内存映射后端的矩阵数据位于
+        操作系统页缓存中，同样计入
+        
+        Returns:
+            缓存项名称到字节数的映射，如'data:all'、'matrix:all'
+        """
+        report = {}
+        frames = {}
+        for key, data in self._data_cache.items():
+            if isinstance(data, MilexMatrix):
+                report[f"matrix:{key}"] = data.nbytes
             else:
-                # 如果列数超过预设年份数，使用索引作为列名
-                column_names.append(f"Column_{i}")
+                frames[key] = data
+                report[f"data:{key}"] = int(data.memory_usage(deep=True).sum())
         
-        df.columns = column_names
+        for key, (_, cached) in self._matrix_cache.items():
+            if isinstance(cached, MilexMatrix):
+                shared = self._shares_values(frames.get(key), cached)
+                report[f"matrix:{key}"] = cached.nbytes - (cached.values.nbytes if shared else 0)
+            elif isinstance(cached, MetricStore):
+                report[f"matrix:{key}"] = cached.values.nbytes
+            elif isinstance(cached, PrecomputedAggregates):
+                report[f"matrix:{key}"] = cached.nbytes
+            elif key == 'country_metrics':
+                aligned, store = cached
+                report[f"matrix:{key}"] = int(aligned.memory_usage(deep=True).sum()) + store.values.nbytes
+            else:
+                # 大洲编号和大洲总额矩阵
+                labels, totals = cached
+                report[f"matrix:{key}"] = labels.nbytes + totals.nbytes
         
-        # 处理缺失值
-        df.replace("...", np.nan, inplace=True)
-        df.replace("xx", np.nan, inplace=True)
+        return report
+    
+    def export_state(self) -> Optional[Dict[str, Any]]:
+        """
+        导出已加载的合并数据、各大洲数据和大洲汇总，供应用下次启动时直接恢复
         
-        # 将年份列的数据转换为数值类型
-        for col in df.columns[1:]:
-            if str(col).isdigit():
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+        只有进程内（pandas）后端且数据未经append_year/patch_cells修改时才导出，
+        内存中的修改不会因此被持久化
         
-        # 缓存数据
-        self._data_cache[continent] = df
+        Returns:
+            数据状态字典（见data.app_state），不可导出时返回None
+        """
+        if self.backend != 'pandas':
+            return None
         
-        return df
+        with self._write_locks():
+            labels, totals = self._continent_aggregates()
+            
+            datasets = {}
+            for key in ['all'] + self._continents:
+                stamps = self._source_stamps[key]
+                if self._data_versions[key] != self._version_of(stamps):
+                    return None
+                datasets[key] = {
+                    'frame': self._dataset(key),
+                    'provenance': self._provenance_cache.get(key),
+                    'stamps': dict(stamps),
+                    'version': self._data_versions[key]
+                }
+            
+            return {
+                'data_version': self._data_versions['all'],
+                'config': self._state_config(),
+                'datasets': datasets,
+                'labels': labels,
+                'totals': totals.values,
+                'years': totals.years
+            }
     
-    def get_all_data(self) -> pd.DataFrame:
+    def restore_state(self, state: Dict[str, Any]) -> bool:
         """
-        获取所有大洲的数据并合并
+        从export_state导出的数据状态恢复缓存，不解析任何源文件
         
+        恢复的缓存项保留原有的源文件签名，之后的访问照常校验：
+        源文件在此期间被修改时会自动重新加载
+        
+        Args:
+            state: 数据状态字典
+            
         Returns:
-            包含所有国家军事数据的DataFrame
+            是否已恢复（加载器配置不一致时不恢复）
         """
-        # 尝试直接读取合并后的数据文件
-        try:
-            file_path = os.path.join(self.data_dir, "current_data.xlsx")
-            df = pd.read_excel(file_path, header=None)  # 指定没有表头
+        if self.backend != 'pandas' or state.get('config') != self._state_config():
+            return False
+        
+        with self._write_locks():
+            for key in ['all'] + self._continents:
+                dataset = state['datasets'][key]
+                df, matrix = self._compact_frame(dataset['frame'], dataset['provenance'])
+                self._store_cache(key, df, dataset['stamps'], dataset['provenance'],
+                                  version=dataset['version'], matrix=matrix)
+            
+            totals = MilexMatrix(self._continents, state['years'], state['totals'])
+            self._matrix_cache['continents'] = (self._continent_version(), (np.asarray(state['labels']), totals))
+        
+        return True
+    
+    def _state_config(self) -> Dict[str, Any]:
+        """
+        导出数据状态时记录的加载器配置，恢复时必须一致
+        
+        Returns:
+            配置字典
+        """
+        return {
+            'data_dir': os.path.abspath(self.data_dir),
+            'source': self.source,
+            'sipri_path': os.path.abspath(self.sipri_path) if self.source == 'sipri' else None,
+            'json_dir': os.path.abspath(self.json_dir) if self.source == 'json' else None,
+            'compact': self.compact,
+            'ingest': INGEST_VERSION,
+            'year_window': list(self.year_window) if self.year_window is not None else None
+        }
+    
+    def get_watched_files(self) -> List[str]:
+        """
+        获取已加载的数据所依赖的源文件，供文件监视器使用
+        
+        Returns:
+            所有缓存项记录的源文件路径（包括加载时不存在的文件，创建后同样需要重新加载）
+        """
+        return sorted({file_path for stamps in list(self._source_stamps.values()) for file_path in stamps})
+    
+    def reload_files(self, file_paths: List[str]) -> List[str]:
+        """
+        重新加载依赖指定源文件的缓存项，并预先重建已使用过的派生数据
+        
+        供文件监视器在后台线程中调用：只重新解析变化的文件；新数据在加载锁内
+        完整构建后才写入缓存，其它线程读到的始终是完整的旧版本或新版本
+        
+        Args:
+            file_paths: 发生变化的源文件路径
+            
+        Returns:
+            数据发生变化的缓存键列表（如'all'、大洲名称），内容未变的文件不会触发重新解析
+        """
+        changed = {os.path.abspath(file_path) for file_path in file_paths}
+        keys = [key for key, stamps in list(self._source_stamps.items())
+                if any(os.path.abspath(file_path) in changed for file_path in stamps)]
+        if not keys:
+            return []
+        
+        before = dict(self._data_versions)
+        
+        for key in keys:
+            if key == 'all':
+                self.get_matrix()
+            elif key in self._continents:
+                self.get_matrix(key)
+            elif key.startswith('sipri:'):
+                self.get_sipri_matrix(key[len('sipri:'):])
+            elif key == 'country_stats':
+                self.get_country_stats()
+        
+        reloaded = [key for key in keys if self._data_versions.get(key) != before.get(key)]
+        if not reloaded:
+            return []
+        
+        # 已使用过的派生数据随之重建，视图刷新时无需再计算
+        if 'continents' in self._matrix_cache:
+            self.get_continent_totals()
+        if 'aggregates' in self._matrix_cache:
+            self.get_aggregates()
+        if 'metrics' in self._matrix_cache:
+            self.get_metric_store()
+        if 'country_metrics' in self._matrix_cache:
+            self.get_country_metric_store()
+        
+        return reloaded
+    
+    def get_source_files(self) -> List[str]:
+        """
+        获取所有源数据文件路径
+        
+        Returns:
+            合并数据文件和各大洲数据文件的路径列表（JSON来源时多个数据可能来自同一个文件）
+        """
+        names = ['current_data'] + self._continents
+        return list(dict.fromkeys(self._source_path(name) for name in names))
+    
+    def _source_path(self, name: str) -> str:
+        """
+        获取数据文件的路径
+        
+        Args:
+            name: 数据文件名（不含扩展名），如'current_data'或大洲名称
             
-            # 手动设置列名
-            column_names = ['Country']
-            for i in range(1, len(df.columns)):
-                year_idx = i - 1
-                if year_idx < len(self._default_years):
-                    column_names.append(str(self._default_years[year_idx]))
-                else:
-                    column_names.append(f"Column_{i}")
+        Returns:
+            JSON来源时为JSON文件路径（见json_source_path），否则为数据目录下的Excel文件路径
+        """
+        if self.source == 'json':
+            return json_source_path(self.json_dir, name)
+        return os.path.join(self.data_dir, f"{name}.xlsx")
+    
+    def _excel_available(self) -> bool:
+        """
+        检查能否读取Excel数据文件
+        
+        Returns:
+            openpyxl已安装且数据目录中至少有一个数据文件时返回True
+        """
+        if importlib.util.find_spec('openpyxl') is None:
+            return False
+        return any(os.path.exists(file_path) for file_path in self.get_source_files())
+    
+    def _json_available(self) -> bool:
+        """
+        检查JSON数据目录中是否有可用的数据文件
+        
+        Returns:
+            是否存在合并JSON文件或current_data.json
+        """
+        return any(os.path.exists(os.path.join(self.json_dir, name)) for name in [JSON_ALL_FILE, 'current_data.json'])
+    
+    def rebuild_snapshots(self) -> List[str]:
+        """
+        重新解析所有源数据文件并重建二进制快照
+        
+        Returns:
+            已写入的快照文件路径列表
+        """
+        written = []
+        for file_path in self.get_source_files():
+            # JSON文件不使用快照
+            if not os.path.exists(file_path) or file_path.endswith('.json'):
+                continue
+            digest = self._file_digest(file_path)
+            cache_file = snapshot_path(self.snapshot_dir, file_path)
+            df, provenance = self._read_workbook(file_path)
+            save_snapshot(cache_file, df, digest, provenance)
+            written.append(cache_file)
+        return written
+    
+    def verify_snapshots(self) -> Dict[str, str]:
+        """
+        校验二进制快照是否与源数据文件一致
+        
+        Returns:
+            源文件名到校验状态的映射，状态为'ok'、'missing'、'stale'或'mismatch'
+        """
+        results = {}
+        for file_path in self.get_source_files():
+            if not os.path.exists(file_path) or file_path.endswith('.json'):
+                continue
+            name = os.path.basename(file_path)
+            cache_file = snapshot_path(self.snapshot_dir, file_path)
+            digest = self._file_digest(file_path)
             
-            df.columns = column_names
+            snapshot_digest = read_snapshot_digest(cache_file)
+            if snapshot_digest is None:
+                results[name] = 'missing'
+            elif snapshot_digest != digest:
+                results[name] = 'stale'
+            else:
+                # 哈希一致时再与重新解析的结果逐值比较
+                snapshot_df, snapshot_provenance = load_snapshot(cache_file, digest)
+                parsed_df, parsed_provenance = self._read_workbook(file_path)
+                same = (
+                    snapshot_provenance is not None and
+                    np.array_equal(snapshot_provenance, parsed_provenance) and
+                    snapshot_df.columns.tolist() == parsed_df.columns.tolist() and
+                    snapshot_df.iloc[:, 0].astype(str).tolist() == parsed_df.iloc[:, 0].astype(str).tolist() and
+                    np.array_equal(
+                        snapshot_df.iloc[:, 1:].to_numpy(dtype=np.float64),
+                        parsed_df.iloc[:, 1:].to_numpy(dtype=np.float64),
+                        equal_nan=True
+                    )
+                )
+                results[name] = 'ok' if same else 'mismatch'
+        return results
+    
+    @staticmethod
+    def _file_digest(file_path: str) -> str:
+        """
+        计算文件内容的SHA1哈希
+        
+        Args:
+            file_path: 文件路径
             
-            # 处理缺失值
-            df.replace("...", np.nan, inplace=True)
-            df.replace("xx", np.nan, inplace=True)
+        Returns:
+            十六进制哈希字符串
+        """
+        digest = hashlib.sha1()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _capture_stamps(self, file_paths: List[str]) -> Dict[str, Optional[Tuple[int, int, str]]]:
+        """
+        记录一组源文件的签名
+        
+        Args:
+            file_paths: 文件路径列表
             
-            # 将年份列的数据转换为数值类型
-            for col in df.columns[1:]:
-                if str(col).isdigit():
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
+        Returns:
+            文件路径到(mtime, size, sha1)的映射，文件不存在时为None
+        """
+        stamps = {}
+        for file_path in file_paths:
+            try:
+                stat = os.stat(file_path)
+                stamps[file_path] = (stat.st_mtime_ns, stat.st_size, self._file_digest(file_path))
+            except OSError:
+                stamps[file_path] = None
+        return stamps
+    
+    def _is_cache_fresh(self, key: str) -> bool:
+        """
+        检查缓存项是否仍与其源文件一致
+        
+        先比较mtime和size，不一致时再比较内容哈希，
+        仅被touch而内容未变的文件不会触发重新加载
+        
+        Args:
+            key: 缓存键
             
-            return df
-        except Exception as e:
-            print(f"读取合并数据文件失败: {e}，尝试合并各大洲数据...")
+        Returns:
+            缓存是否可用
+        """
+        if key not in self._data_cache or key not in self._source_stamps:
+            return False
         
-        # 合并各大洲数据
-        dfs = []
-        for continent in self._continents:
-            dfs.append(self.get_continent_data(continent))
+        stamps = self._source_stamps[key]
+        for file_path, stamp in stamps.items():
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                if stamp is None:
+                    continue
+                return False
+            if stamp is None:
+                return False
+            if (stat.st_mtime_ns, stat.st_size) == stamp[:2]:
+                continue
+            if stat.st_size != stamp[1]:
+                return False
+            try:
+                digest = self._file_digest(file_path)
+            except OSError:
+                return False
+            if digest != stamp[2]:
+                return False
+            # 内容未变化，更新mtime避免下次重复计算哈希
+            stamps[file_path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return True
+    
+    def _cached(self, key: str, record: bool = True) -> Optional[Union[pd.DataFrame, MilexMatrix]]:
+        """
+        获取仍与源文件一致的缓存项
+        
+        缓存项可能随时被淘汰，因此取出后再校验，不先检查后取值
+        
+        Args:
+            key: 缓存键
+            record: 是否计入缓存命中统计（等待加载锁后的再次检查不计入）
+            
+        Returns:
+            缓存的数据，不存在、已被淘汰或源文件已变化时返回None
+        """
+        data = self._data_cache.get(key) if record else self._data_cache.peek(key)
+        if data is None or not self._is_cache_fresh(key):
+            return None
+        return data
+    
+    def _dataset(self, key: str) -> pd.DataFrame:
+        """
+        获取合并数据或大洲数据（已被淘汰时重新加载）
+        
+        Args:
+            key: 'all'或大洲名称
+            
+        Returns:
+            数据DataFrame
+        """
+        return self.get_all_data() if key == 'all' else self.get_continent_data(key)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        获取数据缓存的统计（缓存项数、字节数、预算、命中、未命中和淘汰次数）
+        
+        Returns:
+            统计字典，见MemoryCache.stats
+        """
+        return self._cache.stats()
+    
+    def cache_namespace(self, name: str, sizeof: Callable[[Any], int] = None,
+                        on_remove: Callable[[Any], None] = None) -> CacheNamespace:
+        """
+        获取与数据缓存共用预算的缓存命名空间（如各视图的图表缓存）
+        
+        Args:
+            name: 命名空间名称，不能是加载器自身使用的'data'和'matrix'
+            sizeof: 计算缓存项字节数的函数，见MemoryCache.namespace
+            on_remove: 缓存项被淘汰或替换时调用的函数，见MemoryCache.namespace
+        
+        Returns:
+            命名空间视图
+        """
+        if name in ('data', 'matrix'):
+            raise ValueError(f"缓存命名空间 {name} 由数据加载器使用")
+        return self._cache.namespace(name, sizeof=sizeof, on_remove=on_remove)
+    
+    def _store_cache(self, key: str, df: Union[pd.DataFrame, MilexMatrix],
+                     stamps: Dict[str, Optional[Tuple[int, int, str]]],
+                     provenance: Optional[np.ndarray] = None, version: str = None,
+                     matrix: MilexMatrix = None):
+        """
+        写入缓存并计算数据版本标识
+        
+        源文件签名最后写入：不加锁的读取方只有在签名有效时才使用缓存，
+        因此不会读到数据与版本不一致的中间状态
+        
+        Args:
+            key: 缓存键
+            df: 要缓存的数据（DataFrame或军费矩阵）
+            stamps: 源文件签名
+            provenance: 与DataFrame数值列逐列对应的单元格来源标记，未知时为None
+            version: 数据版本标识，默认由源文件签名计算
+            matrix: 与DataFrame对应的军费矩阵，提供时一并写入矩阵缓存
+        """
+        version = version if version is not None else self._version_of(stamps)
+        if matrix is not None:
+            # 不加锁的读取方按版本匹配矩阵缓存：先写入矩阵，之后才更新版本
+            self._cache_matrix(key, version, matrix, df)
+        self._data_cache[key] = df
+        self._provenance_cache[key] = provenance
+        self._data_versions[key] = version
+        self._source_stamps[key] = stamps
+    
+    def _version_of(self, stamps: Dict[str, Optional[Tuple[int, int, str]]]) -> str:
+        """
+        根据源文件签名和加载的年份范围计算数据版本标识
+        
+        Args:
+            stamps: 源文件签名
+            
+        Returns:
+            16位十六进制版本字符串
+        """
+        version = hashlib.sha1()
+        # 清洗规则变化时数据版本随之改变，按旧规则生成的外部存储会被重建
+        version.update(f"ingest:{INGEST_VERSION}".encode('ascii'))
+        # 加载的年份范围不同时数据不同，扩大范围后派生数据随之重建
+        if self.year_window is not None:
+            version.update(f"window:{self.year_window[0]}-{self.year_window[1]}".encode('ascii'))
+        for file_path in sorted(stamps):
+            stamp = stamps[file_path]
+            version.update(os.path.basename(file_path).encode('utf-8'))
+            version.update((stamp[2] if stamp else '-').encode('ascii'))
+        return version.hexdigest()[:16]
+    
+    def get_country_index(self) -> Dict[str, int]:
+        """
+        获取国家名称到数据行位置的索引
+        
+        索引随数据版本一同重建，位置与get_all_data返回的DataFrame行位置一致，
+        重名时指向第一次出现的行
         
-        return pd.concat(dfs, ignore_index=True)
+        Returns:
+            国家名称到行位置的字典
+        """
+        return self.get_matrix().row_index
     
     def get_country_data(self, country_name: str) -> pd.DataFrame:
         """
@@ -139,12 +1695,29 @@ class DataLoader:
             包含该国家军事数据的DataFrame行
         """
         all_data = self.get_all_data()
-        country_data = all_data[all_data.iloc[:, 0] == country_name]
+        row = self.get_country_index().get(country_name)
         
-        if country_data.empty:
+        if row is None:
             raise ValueError(f"未找到国家: {country_name}")
             
-        return country_data
+        return all_data.iloc[[row]]
+    
+    def get_countries_data(self, countries: List[str]) -> pd.DataFrame:
+        """
+        批量获取多个国家的数据
+        
+        Args:
+            countries: 国家名称列表，不存在的国家会被跳过
+            
+        Returns:
+            包含这些国家军事数据的DataFrame（索引为数据中的行位置），
+            行按数据中的位置排列而不按countries的顺序，与按名称筛选原数据的结果一致；
+            需要按输入顺序排列时使用get_block
+        """
+        all_data = self.get_all_data()
+        rows = sorted(set(self.get_matrix().rows_of(countries)))
+        
+        return all_data.iloc[rows]
     
     def get_countries_list(self) -> List[str]:
         """
@@ -161,20 +1734,17 @@ class DataLoader:
         获取所有年份的列表
         
         Returns:
-            所有年份的列表
+            所有年份的列表（只加载部分年份时为已加载的年份）
         """
-        all_data = self.get_all_data()
-        # 返回除第一列外的所有列名（应该是年份）
-        years = []
-        for col in all_data.columns[1:]:
-            if str(col).isdigit():
-                years.append(int(col))
-        return years
+        return list(self.get_matrix().years)
     
     def get_data_by_year_range(self, start_year: int, end_year: int) -> pd.DataFrame:
         """
         获取特定年份范围的数据
         
+        年份轴连续有序，年份范围直接对应矩阵的列切片，
+        返回的年份列是缓存矩阵的只读视图，不复制数据
+        
         Args:
             start_year: 起始年份
             end_year: 结束年份
@@ -182,14 +1752,49 @@ class DataLoader:
         Returns:
             包含指定年份范围数据的DataFrame
         """
-        all_data = self.get_all_data()
-        
-        # 获取年份列
-        year_cols = [col for col in all_data.columns if str(col).isdigit() and int(col) >= start_year and int(col) <= end_year]
+        self.ensure_years(start_year, end_year)
+        matrix = self.get_matrix()
         
         # 如果没有找到年份列，返回空DataFrame
-        if not year_cols:
+        if not matrix.years_in_range(start_year, end_year):
             return pd.DataFrame()
+        
+        # SQLite后端通过(metric, year)索引做范围查询
+        store = self.get_sqlite_store()
+        if store is not None:
+            return store.year_range(start_year, end_year)
             
         # 返回国家列和年份列
-        return all_data.loc[:, [all_data.columns[0]] + year_cols] 
\ No newline at end of file
+        return matrix.to_frame(start_year, end_year, copy=False)
+    
+    def get_block(self, countries: List[str], start_year: int, end_year: int) -> pd.DataFrame:
+        """
+        批量获取多个国家在年份范围内的数据
+        
+        Args:
+            countries: 国家名称列表，不存在的国家会被跳过
+            start_year: 起始年份
+            end_year: 结束年份
+            
+        Returns:
+            包含Year列和每个国家一列的DataFrame，国家列按countries的顺序排列（重复的名称只保留一列），
+            年份为start_year到end_year的每一年，数据中不存在的年份为NaN
+        """
+        self.ensure_years(start_year, end_year)
+        matrix = self.get_matrix()
+        
+        cols = matrix.year_slice(start_year, end_year)
+        if cols.start == cols.stop:
+            raise ValueError("指定的年份在数据中不存在")
+        
+        found = [country for country in dict.fromkeys(countries) if matrix.has_country(country)]
+        years = list(range(start_year, end_year + 1))
+        
+        # 一次取出所有国家的年份切片，转置为年份×国家后放入完整年份范围的对应位置
+        block = np.full((len(years), len(found)), np.nan)
+        offset = matrix.start_year + cols.start - start_year
+        block[offset:offset + cols.stop - cols.start] = matrix.values[matrix.rows_of(found), cols].T
+        
+        df = pd.DataFrame(block, columns=found, copy=False)
+        df.insert(0, 'Year', years)
+        return df
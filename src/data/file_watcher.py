@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+源文件监视模块
+在后台线程中监视数据源文件，文件被修改、替换或删除时回调通知；
+Linux上通过ctypes调用inotify，其它平台或inotify不可用时定期轮询文件状态
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# inotify事件掩码（见inotify(7)）
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+# 监视目录时关注的事件：写入完成、修改时间变化（与轮询一致，touch也视为变化）、
+# 原子替换（写临时文件后重命名）、创建和删除
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+# struct inotify_event的固定部分：wd, mask, cookie, len
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _load_inotify() -> Optional[ctypes.CDLL]:
+    """
+    加载提供inotify接口的C库
+
+    Returns:
+        C库句柄，当前平台不支持inotify时返回None
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher:
+    """源文件监视器类，在后台线程中检测文件变化并批量回调"""
+
+    def __init__(self, get_paths: Callable[[], List[str]], on_change: Callable[[List[str]], None],
+                 interval: float = 1.0, debounce: float = 0.5, use_inotify: bool = True):
+        """
+        初始化源文件监视器
+
+        Args:
+            get_paths: 返回要监视的文件路径列表的函数，每次检查时重新调用，
+                因此之后才加载的数据文件也会被监视（文件可以暂不存在）
+            on_change: 文件变化时在监视线程中调用的函数，参数为变化的文件路径列表
+            interval: 轮询间隔（秒），inotify模式下为刷新监视目录的间隔
+            debounce: 最后一次变化后等待的时间（秒），保存文件时的多次写入合并为一次回调
+            use_inotify: 是否优先使用inotify，为False时总是轮询
+        """
+        self.get_paths = get_paths
+        self.on_change = on_change
+        self.interval = interval
+        self.debounce = debounce
+
+        self._libc = _load_inotify() if use_inotify else None
+        self._fd = -1
+        # inotify监视描述符到目录的映射
+        self._watches: Dict[int, str] = {}
+        # 轮询模式下各文件上次的状态 {文件路径: (mtime, size)或None}
+        self._stats: Dict[str, Optional[Tuple[int, int]]] = {}
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def mode(self) -> str:
+        """当前的监视方式，'inotify'或'polling'"""
+        return 'inotify' if self._fd >= 0 else 'polling'
+
+    def start(self):
+        """启动监视线程（重复调用无效）"""
+        if self._thread is not None:
+            return
+
+        if self._libc is not None:
+            self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if self._fd < 0:
+                print(f"inotify初始化失败: {os.strerror(ctypes.get_errno())}，改为轮询文件状态")
+
+        # 在返回前建立监视，启动之后的变化都不会遗漏
+        if self._fd >= 0:
+            self._update_watches(self._watched_paths())
+        self._stats = {path: self._stat(path) for path in self._watched_paths()}
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='FileWatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止监视线程并释放inotify描述符"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+            self._watches = {}
+
+    def _watched_paths(self) -> Set[str]:
+        """
+        获取当前要监视的文件路径
+
+        Returns:
+            绝对路径集合
+        """
+        return {os.path.abspath(path) for path in self.get_paths()}
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int]]:
+        """
+        获取文件状态
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            (mtime, size)，文件不存在时返回None
+        """
+        try:
+            stat = os.stat(path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _run(self):
+        """监视线程主循环：收集变化，在debounce时间内没有新变化后回调一次"""
+        pending: Set[str] = set()
+        last_change = 0.0
+
+        while not self._stop_event.is_set():
+            paths = self._watched_paths()
+            if self._fd >= 0:
+                self._update_watches(paths)
+                # 有待回调的变化时缩短等待时间，以便及时回调
+                changed = self._read_events(paths, self.debounce if pending else self.interval)
+            else:
+                self._stop_event.wait(min(self.interval, self.debounce) if pending else self.interval)
+                changed = self._poll(paths)
+
+            now = time.monotonic()
+            if changed:
+                pending |= changed
+                last_change = now
+            elif pending and now - last_change >= self.debounce:
+                try:
+                    self.on_change(sorted(pending))
+                except Exception as e:
+                    print(f"处理源文件变化时发生错误: {e}")
+                pending = set()
+
+    def _poll(self, paths: Set[str]) -> Set[str]:
+        """
+        轮询文件状态
+
+        Args:
+            paths: 要监视的文件路径
+
+        Returns:
+            状态发生变化的文件路径
+        """
+        changed = set()
+        for path in paths:
+            stat = self._stat(path)
+            # 新加入监视的文件以当前状态为基准
+            if path in self._stats and self._stats[path] != stat:
+                changed.add(path)
+            self._stats[path] = stat
+        return changed
+
+    def _update_watches(self, paths: Set[str]):
+        """
+        确保每个被监视文件所在的目录都已加入inotify
+
+        监视目录而不是文件本身：编辑器保存时常先写临时文件再重命名替换，
+        原文件的监视会随之失效
+
+        Args:
+            paths: 要监视的文件路径
+        """
+        watched = set(self._watches.values())
+        for directory in {os.path.dirname(path) for path in paths} - watched:
+            if not os.path.isdir(directory):
+                continue
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                print(f"无法监视目录 {directory}: {os.strerror(ctypes.get_errno())}")
+                continue
+            self._watches[wd] = directory
+
+    def _read_events(self, paths: Set[str], timeout: float) -> Set[str]:
+        """
+        等待并读取inotify事件
+
+        Args:
+            paths: 要监视的文件路径，其它文件的事件被忽略
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            发生变化的被监视文件路径
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except OSError as e:
+            if e.errno in (errno.EAGAIN, errno.EINTR):
+                return set()
+            raise
+
+        changed = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buffer):
+            wd, mask, _, name_length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            name = buffer[offset:offset + name_length].rstrip(b'\0')
+            offset += name_length
+
+            if mask & IN_Q_OVERFLOW:
+                # 事件队列溢出，无法确定哪些文件变化，全部视为已变化
+                return set(paths)
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if path in paths:
+                changed.add(path)
+
+        return changed
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+缺失值插补模块
+按单元格来源标记选择插补策略，所有策略都在整个国家×年份矩阵上向量化计算，
+插补后的单元格在来源标记中加上IMPUTED，图表可据此区分显示
+"""
+
+import itertools
+
+import numpy as np
+from typing import Callable, Dict, Optional
+
+from data.milex_matrix import MilexMatrix, MISSING_ELLIPSIS, MISSING_XX, MISSING_OTHER, IMPUTED
+
+# 缺失类型名称到来源标记的映射
+MISSING_KINDS = {'...': MISSING_ELLIPSIS, 'xx': MISSING_XX, 'other': MISSING_OTHER}
+
+
+def _previous_observed(values: np.ndarray) -> np.ndarray:
+    """
+    计算每个单元格之前（含自身）最近一个有值单元格的列号
+
+    Args:
+        values: 二维数值矩阵
+
+    Returns:
+        列号矩阵，之前没有任何有值单元格时为-1
+    """
+    cols = np.arange(values.shape[1])
+    index = np.where(np.isnan(values), -1, cols)
+    return np.maximum.accumulate(index, axis=1)
+
+
+def _next_observed(values: np.ndarray) -> np.ndarray:
+    """
+    计算每个单元格之后（含自身）最近一个有值单元格的列号
+
+    Args:
+        values: 二维数值矩阵
+
+    Returns:
+        列号矩阵，之后没有任何有值单元格时为列数
+    """
+    n = values.shape[1]
+    cols = np.arange(n)
+    index = np.where(np.isnan(values), n, cols)
+    return np.minimum.accumulate(index[:, ::-1], axis=1)[:, ::-1]
+
+
+def forward_fill(values: np.ndarray, window: int = 5) -> np.ndarray:
+    """
+    前向填充：沿用此前最近一个有记录的值
+
+    Args:
+        values: 二维数值矩阵（国家×年份）
+        window: 未使用，保持各策略签名一致
+
+    Returns:
+        填充后的矩阵，此前没有任何记录的单元格仍为NaN
+    """
+    previous = _previous_observed(values)
+    rows = np.arange(values.shape[0])[:, None]
+    filled = values[rows, np.maximum(previous, 0)]
+    return np.where(previous >= 0, filled, np.nan)
+
+
+def window_mean(values: np.ndarray, window: int = 5) -> np.ndarray:
+    """
+    滑动窗口均值：取此前window年中有记录的值的平均
+
+    Args:
+        values: 二维数值矩阵（国家×年份）
+        window: 窗口年数
+
+    Returns:
+        每个单元格对应的窗口均值（不含自身），窗口内没有记录时为NaN
+    """
+    observed = ~np.isnan(values)
+
+    # 前缀和：第j列为前j列之和，窗口[j-window, j)之和为两个前缀和之差
+    sums = np.zeros((values.shape[0], values.shape[1] + 1))
+    counts = np.zeros((values.shape[0], values.shape[1] + 1))
+    np.cumsum(np.where(observed, values, 0.0), axis=1, out=sums[:, 1:])
+    np.cumsum(observed, axis=1, out=counts[:, 1:])
+
+    end = np.arange(values.shape[1])
+    start = np.maximum(end - window, 0)
+    window_sums = sums[:, end] - sums[:, start]
+    window_counts = counts[:, end] - counts[:, start]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(window_counts > 0, window_sums / window_counts, np.nan)
+
+
+def linear(values: np.ndarray, window: int = 5) -> np.ndarray:
+    """
+    线性插值：在前后两个最近的有记录值之间按年份线性插值
+
+    Args:
+        values: 二维数值矩阵（国家×年份）
+        window: 未使用，保持各策略签名一致
+
+    Returns:
+        插值后的矩阵，首尾两端（只有一侧有记录）的单元格仍为NaN
+    """
+    n = values.shape[1]
+    previous = _previous_observed(values)
+    following = _next_observed(values)
+    rows = np.arange(values.shape[0])[:, None]
+
+    inside = (previous >= 0) & (following < n)
+    left = values[rows, np.clip(previous, 0, n - 1)]
+    right = values[rows, np.clip(following, 0, n - 1)]
+    # 有记录的单元格前后最近的记录都是自身，跨度为0，权重取0
+    span = following - previous
+    weight = np.where(inside & (span > 0), np.arange(n) - previous, 0) / np.where(span > 0, span, 1)
+
+    return np.where(inside, left + (right - left) * weight, np.nan)
+
+
+# 插补策略注册表：策略名称到函数(values, window) -> 矩阵的映射
+IMPUTATION_STRATEGIES: Dict[str, Callable[[np.ndarray, int], np.ndarray]] = {
+    'ffill': forward_fill,
+    'window_mean': window_mean,
+    'linear': linear
+}
+
+# 通过register_strategy注册的策略的注册序号，注册同名策略时序号改变，
+# 使以Imputer.key为缓存键的旧插补结果不再命中
+_STRATEGY_SERIALS: Dict[str, int] = {}
+_registrations = itertools.count(1)
+
+
+def register_strategy(name: str, func: Callable[[np.ndarray, int], np.ndarray]):
+    """
+    注册自定义插补策略
+
+    Args:
+        name: 策略名称
+        func: 接受(国家×年份矩阵, 窗口年数)并返回同形状矩阵的函数，无法插补的单元格为NaN
+    """
+    IMPUTATION_STRATEGIES[name] = func
+    _STRATEGY_SERIALS[name] = next(_registrations)
+
+
+def _strategy_key(name: str) -> str:
+    """策略在缓存键中的标识：注册过的策略附带注册序号"""
+    serial = _STRATEGY_SERIALS.get(name)
+    return name if serial is None else f"{name}#{serial}"
+
+
+class Imputer:
+    """缺失值插补器类，按缺失类型选择插补策略"""
+
+    # 默认策略与rbdata说明一致："..."用此前若干年的均值近似，"xx"沿用前一年的值
+    DEFAULT_STRATEGIES = {'...': 'window_mean', 'xx': 'ffill'}
+
+    def __init__(self, strategies: Optional[Dict[str, str]] = None, window: int = 5):
+        """
+        初始化插补器
+
+        Args:
+            strategies: 缺失类型('...'、'xx'、'other')到策略名称的映射，
+                未列出的缺失类型保持为NaN，默认为DEFAULT_STRATEGIES
+            window: 滑动窗口均值使用的年数
+        """
+        strategies = dict(self.DEFAULT_STRATEGIES if strategies is None else strategies)
+        for kind, strategy in strategies.items():
+            if kind not in MISSING_KINDS:
+                raise ValueError(f"不支持的缺失类型: {kind}，可选值为: {', '.join(MISSING_KINDS)}")
+            if strategy not in IMPUTATION_STRATEGIES:
+                raise ValueError(f"不支持的插补策略: {strategy}，可选值为: {', '.join(IMPUTATION_STRATEGIES)}")
+        if window < 1:
+            raise ValueError(f"窗口年数必须为正整数: {window}")
+
+        self.strategies = strategies
+        self.window = window
+
+    @property
+    def key(self) -> str:
+        """插补配置的标识，可作为缓存键的一部分（重新注册同名策略后标识随之改变）"""
+        parts = [f"{kind}={_strategy_key(self.strategies[kind])}" for kind in sorted(self.strategies)]
+        return f"{','.join(parts)};window={self.window}"
+
+    def apply(self, matrix: MilexMatrix) -> MilexMatrix:
+        """
+        对矩阵进行插补
+
+        每种策略只在原始记录上计算一次，插补值之间不相互传递
+
+        Args:
+            matrix: 军费矩阵
+
+        Returns:
+            新的军费矩阵，插补的单元格在来源标记中加上IMPUTED，原矩阵不变
+        """
+        source = np.asarray(matrix.values, dtype=np.float64)
+        provenance = matrix.provenance
+        values = source.copy()
+        new_provenance = provenance.copy()
+
+        computed = {}
+        for kind, strategy in self.strategies.items():
+            target = provenance == MISSING_KINDS[kind]
+            if not target.any():
+                continue
+            if strategy not in computed:
+                computed[strategy] = IMPUTATION_STRATEGIES[strategy](source, self.window)
+            filled = target & ~np.isnan(computed[strategy])
+            values[filled] = computed[strategy][filled]
+            new_provenance[filled] |= IMPUTED
+
+        return MilexMatrix(matrix.countries, matrix.years, values, dtype=matrix.values.dtype,
+                           provenance=new_provenance)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+数据清洗模块
+DataLoader和script/data_converter.py共用的清洗步骤：在汇总或导出之前
+删除被当作数据读入的表头行、国家名称为空的行和重复的国家
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+# 清洗规则版本，规则变化时递增（参与数据版本计算，使旧的外部存储和应用状态失效）
+INGEST_VERSION = 2
+
+# 表头行第一列的文字（比较时忽略大小写和首尾空白）
+HEADER_LABELS = {'country', 'countries', 'country name', '国家'}
+
+# 表头行中年份的取值范围
+HEADER_YEAR_RANGE = (1800, 2100)
+
+
+def header_rows(df: pd.DataFrame) -> np.ndarray:
+    """
+    识别被当作数据读入的表头行
+
+    第一列为表头文字，或数值列是连续递增的年份（如1948, 1949, ...）的行视为表头行
+
+    Args:
+        df: 第一列为国家名称、其余列为数值的DataFrame
+
+    Returns:
+        与df行一一对应的布尔数组
+    """
+    names = df.iloc[:, 0].astype(str).str.strip().str.lower()
+    is_header = np.array(names.isin(HEADER_LABELS), dtype=bool)
+
+    values = df.iloc[:, 1:].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    for i, row in enumerate(values):
+        if is_header[i]:
+            continue
+        row = row[~np.isnan(row)]
+        is_header[i] = (
+            len(row) >= 3 and
+            np.all(row == np.round(row)) and
+            HEADER_YEAR_RANGE[0] <= row[0] and row[-1] <= HEADER_YEAR_RANGE[1] and
+            np.all(np.diff(row) == 1)
+        )
+
+    return is_header
+
+
+def header_years(df: pd.DataFrame) -> Optional[List[Optional[int]]]:
+    """
+    从第一个表头行中读取各数值列的年份
+
+    Args:
+        df: 第一列为国家名称、其余列为数值的DataFrame
+
+    Returns:
+        与df.columns[1:]逐列对应的年份（该列表头不是年份时为None），
+        没有年份表头行时返回None
+    """
+    rows = np.flatnonzero(header_rows(df))
+    for i in rows:
+        row = pd.to_numeric(df.iloc[i, 1:], errors='coerce').to_numpy(dtype=np.float64)
+        known = ~np.isnan(row)
+        if known.any() and np.all(row[known] == np.round(row[known])):
+            return [int(value) if not np.isnan(value) else None for value in row]
+    return None
+
+
+def ingest_frame(df: pd.DataFrame,
+                 provenance: Optional[np.ndarray] = None) -> Tuple[pd.DataFrame, Optional[np.ndarray], Dict[str, int]]:
+    """
+    清洗数据：删除表头行、国家名称为空的行和重复的国家
+
+    同一国家出现多次时保留第一次出现的行，因此合并多个数据来源时
+    应按优先级顺序拼接，排在前面的来源即为该国家的权威来源
+
+    Args:
+        df: 第一列为国家名称的DataFrame
+        provenance: 与df数值列逐列对应的单元格来源标记，随行一起筛选
+
+    Returns:
+        (清洗后的DataFrame（索引重新编号）, 筛选后的来源标记, 各类被删除的行数
+        {'header': 表头行, 'blank': 名称为空, 'duplicate': 重复国家})
+    """
+    names = df.iloc[:, 0]
+    header = header_rows(df)
+    blank = (names.isna() | (names.astype(str).str.strip() == '')).to_numpy() & ~header
+    duplicate = names.astype(str).str.strip().duplicated(keep='first').to_numpy() & ~header & ~blank
+
+    dropped = {'header': int(header.sum()), 'blank': int(blank.sum()), 'duplicate': int(duplicate.sum())}
+    keep = ~(header | blank | duplicate)
+    if keep.all():
+        return df, provenance, dropped
+
+    df = df[keep].reset_index(drop=True)
+    if provenance is not None:
+        provenance = provenance[keep]
+
+    return df, provenance, dropped
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+JSON数据源模块
+读取script/data_converter.py导出到web/public/data的JSON文件（记录数组格式），
+无需Excel文件和openpyxl即可加载军事数据
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from data.milex_matrix import OBSERVED, MISSING_OTHER
+
+# 合并JSON文件，每个国家一条记录，Continent字段为该国家所在的大洲数据文件名
+# （不属于任何大洲的行为current_data）
+JSON_ALL_FILE = 'all_military_data.json'
+
+# 流式解析时每次读取的字符数
+JSON_CHUNK_SIZE = 1 << 16
+
+
+def iter_json_records(file_path: str, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    流式解析JSON记录数组，逐条返回记录
+
+    文件按块读取，每条记录解析完成后即丢弃其文本，内存占用与文件大小无关
+
+    Args:
+        file_path: JSON文件路径，内容为对象数组
+        chunk_size: 每次读取的字符数
+
+    Returns:
+        记录字典的迭代器
+    """
+    decoder = json.JSONDecoder()
+    with open(file_path, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size).lstrip()
+        if not buffer.startswith('['):
+            raise ValueError(f"JSON数据文件不是记录数组: {file_path}")
+        pos = 1
+        eof = False
+
+        while True:
+            # 跳过记录之间的空白和逗号
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+
+            if pos < len(buffer):
+                if buffer[pos] == ']':
+                    return
+                try:
+                    record, pos = decoder.raw_decode(buffer, pos)
+                    yield record
+                    continue
+                except json.JSONDecodeError as e:
+                    # 记录不完整，读取下一块后重试
+                    if eof:
+                        raise ValueError(f"JSON数据文件格式错误: {file_path}: {e}") from e
+
+            if eof:
+                raise ValueError(f"JSON数据文件不完整: {file_path}")
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+
+def read_json_dataset(file_path: str, dataset: Optional[str] = None,
+                      years: Optional[List[int]] = None) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    读取JSON数据文件，直接构建与Excel数据相同结构的DataFrame
+
+    Args:
+        file_path: JSON文件路径
+        dataset: 只保留Continent字段等于该值的记录（用于从合并JSON文件中取出单个大洲的数据），
+            默认保留所有记录
+        years: 只读取这些年份的列，默认读取所有年份
+
+    Returns:
+        (包含Country列和年份列的DataFrame, 与年份列逐列对应的单元格来源标记)；
+        JSON中缺失值的占位符类型已丢失，缺失单元格统一标记为MISSING_OTHER
+    """
+    countries = []
+    rows = []
+    columns: Optional[List[str]] = None
+    wanted = None if years is None else set(years)
+
+    for record in iter_json_records(file_path):
+        if dataset is not None and record.get('Continent') != dataset:
+            continue
+        if columns is None:
+            columns = [key for key in record if key.isdigit() and (wanted is None or int(key) in wanted)]
+        countries.append(record.get('Country'))
+        rows.append([record.get(column) for column in columns])
+
+    # null解析为None，转换为float64数组时成为NaN
+    columns = columns if columns is not None else []
+    values = np.array(rows, dtype=np.float64).reshape(len(rows), len(columns))
+
+    df = pd.DataFrame(values, columns=columns, copy=False)
+    df.insert(0, 'Country', pd.Series(countries, dtype=object))
+
+    provenance = np.where(np.isnan(values), MISSING_OTHER, OBSERVED).astype(np.uint8)
+
+    return df, provenance
+
+
+def json_source_path(json_dir: str, name: str) -> str:
+    """
+    获取数据文件对应的JSON文件路径
+
+    Args:
+        json_dir: JSON数据目录
+        name: 数据文件名（不含扩展名），如'current_data'或大洲名称
+
+    Returns:
+        单独的JSON文件存在时返回其路径，否则在合并JSON文件存在时返回合并文件路径，
+        都不存在时返回单独的JSON文件路径
+    """
+    file_path = os.path.join(json_dir, f"{name}.json")
+    all_path = os.path.join(json_dir, JSON_ALL_FILE)
+    if not os.path.exists(file_path) and os.path.exists(all_path):
+        return all_path
+    return file_path
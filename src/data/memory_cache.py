@@ -0,0 +1,438 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+内存缓存模块
+按字节数计量的有界缓存：所有缓存项的总字节数超出预算时按LRU（最久未使用）或
+LFU（最少使用）淘汰，并统计命中、未命中和淘汰次数；
+DataLoader的数据缓存、DataAnalyzer的结果缓存和各视图的图表缓存共用此实现
+"""
+
+import itertools
+import sys
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 可选的淘汰策略
+CACHE_POLICIES = ['lru', 'lfu']
+
+# DataLoader缓存的默认预算（字节）
+DEFAULT_CACHE_BUDGET = 256 << 20
+
+# DataAnalyzer查询结果缓存的默认预算（字节）
+DEFAULT_RESULT_CACHE_BUDGET = 32 << 20
+
+_MISSING = object()
+
+
+def estimate_nbytes(value: Any) -> int:
+    """
+    估算缓存项占用的字节数
+
+    DataFrame按memory_usage(deep=True)统计（包含字符串对象），数组按nbytes统计，
+    带nbytes属性的对象（如MilexMatrix、MetricStore）使用该属性，
+    元组、列表和字典逐项累加
+
+    Args:
+        value: 缓存的值
+
+    Returns:
+        字节数
+    """
+    if value is None:
+        return 0
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(item) for item in value.values())
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, (int, np.integer)):
+        return int(nbytes)
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    """缓存项：值、字节数、固定标记和使用记录"""
+
+    __slots__ = ('value', 'size', 'pinned', 'uses', 'last_use')
+
+    def __init__(self, value: Any, size: int, pinned: bool, uses: int, last_use: int):
+        self.value = value
+        self.size = size
+        self.pinned = pinned
+        self.uses = uses
+        self.last_use = last_use
+
+
+class MemoryCache:
+    """
+    按字节预算淘汰的缓存类（可在多个线程中共享同一实例）
+
+    读取不加锁：命中时只读一次字典，再在缓存项上记下使用次数和使用时刻，
+    并发读取时这些记录以及命中/未命中计数可能略有出入，只影响淘汰顺序的精确程度；
+    写入、删除和淘汰在缓存锁内进行，命名空间的on_remove回调在缓存锁外调用
+    """
+
+    def __init__(self, budget: Optional[int] = DEFAULT_CACHE_BUDGET, policy: str = 'lru',
+                 sizeof: Callable[[Any], int] = None):
+        """
+        初始化缓存
+
+        Args:
+            budget: 所有缓存项的总字节数上限，为None时不限制
+            policy: 淘汰策略，可选值为'lru'（淘汰最久未使用的项）、
+                'lfu'（淘汰命中次数最少的项，次数相同时淘汰最久未使用的）
+            sizeof: 计算缓存项字节数的函数，默认为estimate_nbytes
+        """
+        if policy not in CACHE_POLICIES:
+            raise ValueError(f"不支持的淘汰策略: {policy}，可选值为: {', '.join(CACHE_POLICIES)}")
+        if budget is not None and budget < 0:
+            raise ValueError(f"缓存预算不能为负数: {budget}")
+        self.budget = budget
+        self.policy = policy
+        self.sizeof = sizeof if sizeof else estimate_nbytes
+
+        # 只在缓存锁内增删；读取方不加锁直接查找
+        self._entries: Dict[Hashable, _Entry] = {}
+        # 单调递增的使用时刻，next()在持有GIL时是原子操作，读取方不加锁也能取用
+        self._clock = itertools.count()
+        self._lock = threading.RLock()
+        # 命名空间名称到移出回调的映射，见namespace
+        self._removers: Dict[str, Callable[[Any], None]] = {}
+
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        获取缓存项（不加锁），计入命中或未命中并更新使用记录
+
+        Args:
+            key: 缓存键
+            default: 缓存项不存在时的返回值
+
+        Returns:
+            缓存的值
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        # 缓存项此时可能已被其它线程淘汰，更新的只是已脱离缓存的对象，不影响正确性
+        entry.uses += 1
+        entry.last_use = next(self._clock)
+        return entry.value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """
+        获取缓存项，不计入统计也不更新使用记录
+
+        Args:
+            key: 缓存键
+            default: 缓存项不存在时的返回值
+
+        Returns:
+            缓存的值
+        """
+        entry = self._entries.get(key)
+        return default if entry is None else entry.value
+
+    def put(self, key: Hashable, value: Any, size: int = None, pinned: bool = False):
+        """
+        写入缓存项，总字节数超出预算时淘汰其它缓存项
+
+        刚写入的项不会被立即淘汰：单项超出预算时预算被暂时超出，
+        直到写入其它项时才被淘汰
+
+        Args:
+            key: 缓存键
+            value: 要缓存的值
+            size: 字节数，默认由sizeof计算
+            pinned: 是否固定（固定的项不会被淘汰，再次以pinned=False写入时解除固定）
+        """
+        size = self.sizeof(value) if size is None else int(size)
+
+        removed = []
+        with self._lock:
+            old = self._entries.get(key)
+            uses = 1
+            if old is not None:
+                self.nbytes -= old.size
+                uses += old.uses
+                if old.value is not value:
+                    removed.append((key, old.value))
+
+            # 整体替换缓存项，不加锁的读取方要么读到旧项，要么读到新项
+            self._entries[key] = _Entry(value, size, pinned, uses, next(self._clock))
+            self.nbytes += size
+
+            removed.extend(self._evict(exclude=key))
+
+        self._release(removed)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        删除缓存项（不计入淘汰次数）
+
+        Args:
+            key: 缓存键
+            default: 缓存项不存在时的返回值
+
+        Returns:
+            被删除的值
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self.nbytes -= entry.size
+
+        self._release([(key, entry.value)])
+        return entry.value
+
+    def clear(self):
+        """删除所有缓存项（统计计数保留）"""
+        with self._lock:
+            removed = [(key, entry.value) for key, entry in self._entries.items()]
+            self._entries = {}
+            self.nbytes = 0
+
+        self._release(removed)
+
+    def set_budget(self, budget: Optional[int]):
+        """
+        修改缓存预算，超出新预算的部分立即淘汰
+
+        Args:
+            budget: 新的字节数上限，为None时不限制
+        """
+        if budget is not None and budget < 0:
+            raise ValueError(f"缓存预算不能为负数: {budget}")
+        with self._lock:
+            self.budget = budget
+            removed = self._evict()
+
+        self._release(removed)
+
+    def size_of(self, key: Hashable) -> int:
+        """
+        获取缓存项的字节数
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            字节数，缓存项不存在时为0
+        """
+        entry = self._entries.get(key)
+        return 0 if entry is None else entry.size
+
+    def is_pinned(self, key: Hashable) -> bool:
+        """
+        检查缓存项是否被固定
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            是否被固定，缓存项不存在时为False
+        """
+        entry = self._entries.get(key)
+        return entry is not None and entry.pinned
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计
+
+        Returns:
+            包含entries、nbytes、budget、hits、misses、evictions和hit_rate的字典
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'nbytes': self.nbytes,
+                'budget': self.budget,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def namespace(self, name: str, sizeof: Callable[[Any], int] = None,
+                  on_remove: Callable[[Any], None] = None) -> 'CacheNamespace':
+        """
+        获取共享此缓存（及其预算和统计）的命名空间，键为(name, 键)
+
+        Args:
+            name: 命名空间名称
+            sizeof: 计算该命名空间缓存项字节数的函数，默认为缓存的sizeof
+            on_remove: 该命名空间的缓存项被淘汰、替换、删除或清空时调用的函数，
+                参数为被移出的值，用于释放其持有的资源（如关闭图表）；
+                同一命名空间只保留最后一次设置的回调
+
+        Returns:
+            命名空间视图
+        """
+        if on_remove is not None:
+            with self._lock:
+                self._removers[name] = on_remove
+        return CacheNamespace(self, name, sizeof)
+
+    def keys(self) -> List[Hashable]:
+        """所有缓存键（最久未使用的在前）"""
+        with self._lock:
+            return sorted(self._entries, key=lambda key: self._entries[key].last_use)
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """所有缓存项的快照（最久未使用的在前，不更新使用记录）"""
+        with self._lock:
+            return [(key, self._entries[key].value) for key in self.keys()]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.keys())
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        self.put(key, value)
+
+    def __delitem__(self, key: Hashable):
+        if self.pop(key, _MISSING) is _MISSING:
+            raise KeyError(key)
+
+    def _evict(self, exclude: Hashable = _MISSING) -> List[Tuple[Hashable, Any]]:
+        """
+        淘汰缓存项直到总字节数不超出预算（调用方持有缓存锁）
+
+        Args:
+            exclude: 不淘汰的键（刚写入的项）
+
+        Returns:
+            被淘汰的(键, 值)列表
+        """
+        removed = []
+        if self.budget is None:
+            return removed
+
+        while self.nbytes > self.budget:
+            candidates = [key for key, entry in self._entries.items() if not entry.pinned and key != exclude]
+            if not candidates:
+                break
+            if self.policy == 'lfu':
+                victim = min(candidates, key=lambda key: (self._entries[key].uses, self._entries[key].last_use))
+            else:
+                victim = min(candidates, key=lambda key: self._entries[key].last_use)
+            entry = self._entries.pop(victim)
+            self.nbytes -= entry.size
+            self.evictions += 1
+            removed.append((victim, entry.value))
+
+        return removed
+
+    def _release(self, removed: List[Tuple[Hashable, Any]]):
+        """
+        对移出缓存的项调用所属命名空间的on_remove
+
+        Args:
+            removed: (键, 值)列表
+        """
+        for key, value in removed:
+            on_remove = self._removers.get(key[0]) if isinstance(key, tuple) and key else None
+            if on_remove is None:
+                continue
+            try:
+                on_remove(value)
+            except Exception as e:
+                print(f"释放缓存项 {key} 时发生错误: {e}")
+
+
+class CacheNamespace:
+    """MemoryCache的命名空间视图：键自动加上命名空间前缀，预算和统计与所属缓存共享"""
+
+    def __init__(self, cache: MemoryCache, name: str, sizeof: Callable[[Any], int] = None):
+        """
+        初始化命名空间视图
+
+        Args:
+            cache: 所属缓存
+            name: 命名空间名称
+            sizeof: 计算缓存项字节数的函数，默认为所属缓存的sizeof
+        """
+        self.cache = cache
+        self.name = name
+        self.sizeof = sizeof
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """见MemoryCache.get"""
+        return self.cache.get((self.name, key), default)
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """见MemoryCache.peek"""
+        return self.cache.peek((self.name, key), default)
+
+    def put(self, key: Hashable, value: Any, size: int = None, pinned: bool = False):
+        """见MemoryCache.put"""
+        if size is None and self.sizeof is not None:
+            size = self.sizeof(value)
+        self.cache.put((self.name, key), value, size, pinned)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """见MemoryCache.pop"""
+        return self.cache.pop((self.name, key), default)
+
+    def size_of(self, key: Hashable) -> int:
+        """见MemoryCache.size_of"""
+        return self.cache.size_of((self.name, key))
+
+    def is_pinned(self, key: Hashable) -> bool:
+        """见MemoryCache.is_pinned"""
+        return self.cache.is_pinned((self.name, key))
+
+    def keys(self) -> List[Hashable]:
+        """命名空间内的缓存键（不含前缀）"""
+        return [key[1] for key in self.cache.keys() if key[0] == self.name]
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """命名空间内缓存项的快照（键不含前缀）"""
+        return [(key[1], value) for key, value in self.cache.items() if key[0] == self.name]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return (self.name, key) in self.cache
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.keys())
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self.cache[(self.name, key)]
+
+    def __setitem__(self, key: Hashable, value: Any):
+        self.put(key, value)
+
+    def __delitem__(self, key: Hashable):
+        del self.cache[(self.name, key)]
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+多指标数据存储模块
+将SIPRI原始数据中的各个指标工作表对齐到同一国家轴和年份轴，
+保存为(指标, 国家, 年份)三维数组，任意指标的查询都走同一套向量化接口
+"""
+
+import numpy as np
+from typing import Dict, List, Optional
+
+from data.milex_matrix import MilexMatrix
+
+# 指标名称到SIPRI工作表名称的映射
+SIPRI_METRICS = {
+    'constant_usd': 'Constant (2022) US$',
+    'current_usd': 'Current US$',
+    'share_of_gdp': 'Share of GDP',
+    'per_capita': 'Per capita',
+    'share_of_govt': 'Share of Govt. spending'
+}
+
+
+class MetricStore:
+    """多指标军费数据存储类"""
+
+    def __init__(self, matrices: Dict[str, MilexMatrix]):
+        """
+        初始化多指标数据存储
+
+        各指标的国家取并集（按首次出现顺序），年份取覆盖所有指标的连续区间，
+        某指标缺少的国家或年份填充为NaN
+
+        Args:
+            matrices: 指标名称到军费矩阵的映射
+        """
+        self.metrics = list(matrices)
+        self._metric_index = {metric: i for i, metric in enumerate(self.metrics)}
+
+        countries = []
+        row_index = {}
+        for matrix in matrices.values():
+            for country in matrix.countries:
+                if country not in row_index:
+                    row_index[country] = len(countries)
+                    countries.append(country)
+
+        non_empty = [matrix for matrix in matrices.values() if matrix.years]
+        if non_empty:
+            years = list(range(min(m.start_year for m in non_empty), max(m.end_year for m in non_empty) + 1))
+        else:
+            years = []
+
+        self.countries = countries
+        self.years = years
+        self.start_year = years[0] if years else 0
+        self.values = np.full((len(self.metrics), len(countries), len(years)), np.nan)
+
+        for i, matrix in enumerate(matrices.values()):
+            if not matrix.years:
+                continue
+            rows = [row_index[country] for country in matrix.countries]
+            cols = slice(matrix.start_year - self.start_year, matrix.end_year - self.start_year + 1)
+            self.values[i, rows, cols] = matrix.values
+
+        # 每个指标的二维切片是连续内存，可直接构建共享内存的军费矩阵
+        self._matrices = {
+            metric: MilexMatrix(countries, years, self.values[i])
+            for i, metric in enumerate(self.metrics)
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """所有指标数据占用的字节数（各指标的军费矩阵共享这块内存）"""
+        return self.values.nbytes
+
+    def has_metric(self, metric: str) -> bool:
+        """
+        检查指标是否存在
+
+        Args:
+            metric: 指标名称
+
+        Returns:
+            是否存在
+        """
+        return metric in self._metric_index
+
+    def matrix(self, metric: str) -> MilexMatrix:
+        """
+        获取单个指标的军费矩阵（与存储共享内存）
+
+        Args:
+            metric: 指标名称
+
+        Returns:
+            军费矩阵
+        """
+        if metric not in self._matrices:
+            raise ValueError(f"不支持的指标: {metric}，可选值为: {', '.join(self.metrics)}")
+        return self._matrices[metric]
+
+    def get(self, metric: str, country: str, year: int) -> float:
+        """
+        获取单个值
+
+        Args:
+            metric: 指标名称
+            country: 国家名称
+            year: 年份
+
+        Returns:
+            指标值，缺失时为NaN
+        """
+        matrix = self.matrix(metric)
+        return float(matrix.values[matrix.row_of(country), matrix.col_of(year)])
+
+    def column(self, metric: str, year: int) -> np.ndarray:
+        """
+        获取某指标在某一年份所有国家的值（视图）
+
+        Args:
+            metric: 指标名称
+            year: 年份
+
+        Returns:
+            一维数组，与countries一一对应
+        """
+        return self.matrix(metric).column(year)
@@ -0,0 +1,338 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+军费矩阵模块
+将国家×年份的军费数据保存为连续的数值矩阵，按行、列、块读取时返回视图而不复制数据
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Union, Tuple
+
+from data.country_codes import iso3_codes
+
+# 单元格来源标记（provenance）
+# 低位为缺失类型，插补后在原缺失类型上按位或IMPUTED
+OBSERVED = 0            # 有记录的值
+MISSING_ELLIPSIS = 1    # "..."：未记录，可用此前若干年的均值近似
+MISSING_XX = 2          # "xx"/"xxx"：未记录，可沿用前一年的值
+MISSING_OTHER = 3       # 空白或其它无法识别的单元格
+IMPUTED = 0x80          # 该值由插补得到
+
+# 源数据中的缺失占位符及其对应的来源标记
+MISSING_PLACEHOLDERS = {'...': MISSING_ELLIPSIS, 'xx': MISSING_XX, 'xxx': MISSING_XX}
+
+
+class MilexMatrix:
+    """国家×年份军费矩阵类"""
+
+    def __init__(self, countries: List[str], years: List[int], values: np.ndarray,
+                 dtype: Union[str, np.dtype] = np.float64, provenance: Optional[np.ndarray] = None):
+        """
+        初始化军费矩阵
+
+        Args:
+            countries: 国家名称列表，与矩阵行一一对应
+            years: 年份列表，必须连续递增，与矩阵列一一对应
+            values: 形状为(国家数, 年份数)的数值矩阵
+            dtype: 矩阵数据类型，float64或float32
+            provenance: 与values形状相同的uint8来源标记矩阵，默认按是否为NaN推断
+        """
+        years = [int(year) for year in years]
+        if any(b - a != 1 for a, b in zip(years, years[1:])):
+            raise ValueError("年份轴必须连续递增")
+
+        values = np.ascontiguousarray(values, dtype=dtype)
+        if values.shape != (len(countries), len(years)):
+            raise ValueError(f"矩阵形状 {values.shape} 与国家数 {len(countries)}、年份数 {len(years)} 不一致")
+
+        self.countries = list(countries)
+        self.years = years
+        self.values = values
+
+        # 年份到列号的偏移量：列号 = 年份 - 起始年份
+        self.start_year = years[0] if years else 0
+
+        # 国家名称到行号的索引（重名时取第一次出现的行）
+        self._row_index = {}
+        for i, country in enumerate(self.countries):
+            self._row_index.setdefault(country, i)
+
+        # 缺失值位图和ISO-3代码列，首次使用时计算
+        self._missing_mask = None
+        self._iso3 = None
+
+        if provenance is not None:
+            provenance = np.ascontiguousarray(provenance, dtype=np.uint8)
+            if provenance.shape != values.shape:
+                raise ValueError(f"来源标记形状 {provenance.shape} 与矩阵形状 {values.shape} 不一致")
+        self._provenance = provenance
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dtype: Union[str, np.dtype] = np.float64,
+                   provenance: Optional[np.ndarray] = None) -> 'MilexMatrix':
+        """
+        从DataLoader返回的DataFrame构建矩阵
+
+        第一列为国家名称，列名为数字的列为年份列，其余列忽略。
+        年份轴补齐为连续区间，缺少的年份填充为NaN
+
+        Args:
+            df: 数据
+            dtype: 矩阵数据类型
+            provenance: 与df.columns[1:]逐列对应的来源标记矩阵，默认按是否为NaN推断
+
+        Returns:
+            军费矩阵
+        """
+        countries = df.iloc[:, 0].astype(str).tolist()
+        year_cols = {int(col): i for i, col in enumerate(df.columns[1:]) if str(col).isdigit()}
+        if not year_cols:
+            return cls(countries, [], np.empty((len(countries), 0)), dtype=dtype)
+
+        years = list(range(min(year_cols), max(year_cols) + 1))
+        values = np.full((len(countries), len(years)), np.nan, dtype=dtype)
+        for year, i in year_cols.items():
+            values[:, year - years[0]] = pd.to_numeric(df.iloc[:, i + 1], errors='coerce').to_numpy(dtype=np.float64)
+
+        if provenance is not None:
+            # 补齐的年份没有任何记录
+            aligned = np.full(values.shape, MISSING_OTHER, dtype=np.uint8)
+            for year, i in year_cols.items():
+                aligned[:, year - years[0]] = provenance[:, i]
+            provenance = aligned
+
+        return cls(countries, years, values, dtype=dtype, provenance=provenance)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """矩阵形状(国家数, 年份数)"""
+        return self.values.shape
+
+    @property
+    def end_year(self) -> int:
+        """最后一个年份"""
+        return self.start_year + len(self.years) - 1
+
+    @property
+    def row_index(self) -> Dict[str, int]:
+        """国家名称到行号的索引（只读使用）"""
+        return self._row_index
+
+    @property
+    def missing_mask(self) -> np.ndarray:
+        """
+        缺失值位图（只读使用）
+
+        每行的年份按位打包（np.packbits，每字节8个年份），置位表示该值缺失，
+        占用内存为矩阵的1/64（float64）或1/32（float32）
+        """
+        if self._missing_mask is None:
+            self._missing_mask = np.packbits(np.isnan(self.values), axis=1)
+        return self._missing_mask
+
+    @property
+    def iso3(self) -> np.ndarray:
+        """
+        与行一一对应的ISO-3代码列（只读使用）
+
+        首次使用时按归一化国家名称查表得到，之后随矩阵一起缓存；
+        地区汇总行和已不存在的国家为None
+        """
+        if self._iso3 is None:
+            self._iso3 = iso3_codes(self.countries)
+        return self._iso3
+
+    @property
+    def provenance(self) -> np.ndarray:
+        """
+        来源标记矩阵（只读使用）
+
+        与values形状相同，取值见OBSERVED、MISSING_*和IMPUTED；
+        构建时未提供来源标记的矩阵按是否为NaN推断为OBSERVED或MISSING_OTHER
+        """
+        if self._provenance is None:
+            self._provenance = np.where(np.isnan(self.values), MISSING_OTHER, OBSERVED).astype(np.uint8)
+        return self._provenance
+
+    def is_missing(self, country: str, year: int) -> bool:
+        """
+        检查某个国家某一年份的值是否缺失
+
+        Args:
+            country: 国家名称
+            year: 年份
+
+        Returns:
+            是否缺失
+        """
+        col = self.col_of(year)
+        return bool(self.missing_mask[self.row_of(country), col >> 3] & (0x80 >> (col & 7)))
+
+    @property
+    def nbytes(self) -> int:
+        """矩阵数据及已计算的缺失值位图、来源标记占用的字节数"""
+        mask_bytes = self._missing_mask.nbytes if self._missing_mask is not None else 0
+        provenance_bytes = self._provenance.nbytes if self._provenance is not None else 0
+        return self.values.nbytes + mask_bytes + provenance_bytes
+
+    def has_country(self, country: str) -> bool:
+        """
+        检查国家是否存在
+
+        Args:
+            country: 国家名称
+
+        Returns:
+            是否存在
+        """
+        return country in self._row_index
+
+    def rows_of(self, countries: List[str]) -> List[int]:
+        """
+        批量获取国家对应的行号，不存在的国家会被跳过
+
+        Args:
+            countries: 国家名称列表
+
+        Returns:
+            行号列表，顺序与输入一致
+        """
+        index = self._row_index
+        return [index[country] for country in countries if country in index]
+
+    def has_year(self, year: int) -> bool:
+        """
+        检查年份是否存在
+
+        Args:
+            year: 年份
+
+        Returns:
+            是否存在
+        """
+        return bool(self.years) and self.start_year <= int(year) <= self.end_year
+
+    def row_of(self, country: str) -> int:
+        """
+        获取国家对应的行号
+
+        Args:
+            country: 国家名称
+
+        Returns:
+            行号
+        """
+        try:
+            return self._row_index[country]
+        except KeyError:
+            raise ValueError(f"未找到国家: {country}")
+
+    def col_of(self, year: int) -> int:
+        """
+        获取年份对应的列号
+
+        Args:
+            year: 年份
+
+        Returns:
+            列号
+        """
+        if not self.has_year(year):
+            raise ValueError(f"数据中不存在年份: {year}")
+        return int(year) - self.start_year
+
+    def year_slice(self, start_year: int, end_year: int) -> slice:
+        """
+        将年份范围转换为列切片，超出数据范围的部分会被截断
+
+        Args:
+            start_year: 起始年份
+            end_year: 结束年份（包含）
+
+        Returns:
+            列切片
+        """
+        start = max(int(start_year) - self.start_year, 0)
+        stop = min(int(end_year) - self.start_year + 1, len(self.years))
+        return slice(start, max(start, stop))
+
+    def row(self, country: str) -> np.ndarray:
+        """
+        获取国家所有年份的数据（视图）
+
+        Args:
+            country: 国家名称
+
+        Returns:
+            一维数组
+        """
+        return self.values[self.row_of(country)]
+
+    def column(self, year: int) -> np.ndarray:
+        """
+        获取所有国家在某一年份的数据（视图）
+
+        Args:
+            year: 年份
+
+        Returns:
+            一维数组
+        """
+        return self.values[:, self.col_of(year)]
+
+    def block(self, start_year: int, end_year: int, rows: Optional[slice] = None) -> np.ndarray:
+        """
+        获取年份范围内的数据块（视图）
+
+        Args:
+            start_year: 起始年份
+            end_year: 结束年份（包含）
+            rows: 行切片，默认为所有国家
+
+        Returns:
+            二维数组
+        """
+        rows = rows if rows is not None else slice(None)
+        return self.values[rows, self.year_slice(start_year, end_year)]
+
+    def years_in_range(self, start_year: int, end_year: int) -> List[int]:
+        """
+        获取年份范围内实际存在的年份
+
+        Args:
+            start_year: 起始年份
+            end_year: 结束年份（包含）
+
+        Returns:
+            年份列表
+        """
+        return self.years[self.year_slice(start_year, end_year)]
+
+    def to_frame(self, start_year: Optional[int] = None, end_year: Optional[int] = None,
+                 copy: bool = True) -> pd.DataFrame:
+        """
+        转换为与DataLoader一致的DataFrame（国家列 + 年份列）
+
+        Args:
+            start_year: 起始年份，默认为第一个年份
+            end_year: 结束年份，默认为最后一个年份
+            copy: 是否复制数据；为False时年份列是矩阵的只读视图，不分配新内存
+
+        Returns:
+            DataFrame
+        """
+        start_year = self.start_year if start_year is None else start_year
+        end_year = self.end_year if end_year is None else end_year
+        years = self.years_in_range(start_year, end_year)
+
+        block = self.block(start_year, end_year)
+        if not copy:
+            # 只读视图防止调用方通过DataFrame改写矩阵（及其所在的缓存）
+            block = block.view()
+            block.flags.writeable = False
+
+        df = pd.DataFrame(block, columns=[str(year) for year in years], copy=copy)
+        df.insert(0, 'Country', self.countries)
+        return df
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+内存映射数据文件模块
+将军费矩阵保存为带有小型文件头的二进制文件，多个进程以只读方式映射同一文件，
+共享操作系统页缓存中的同一份数据
+
+文件布局：
+    8字节魔数 | 4字节文件头长度(小端) | JSON文件头 | 填充至64字节对齐 | C顺序矩阵数据 | uint8来源标记
+"""
+
+import os
+import json
+import struct
+import tempfile
+import numpy as np
+from typing import Dict, Any, Optional, Tuple
+
+from data.milex_matrix import MilexMatrix
+
+MMAP_MAGIC = b'MILEXMM1'
+MMAP_FORMAT = 2
+_ALIGNMENT = 64
+
+
+def write_mmap_store(file_path: str, matrix: MilexMatrix, source_version: str):
+    """
+    将军费矩阵写入内存映射文件
+
+    先写入临时文件再原子替换，已映射旧文件的进程不受影响
+
+    Args:
+        file_path: 目标文件路径
+        matrix: 军费矩阵
+        source_version: 源数据版本标识
+    """
+    header = {
+        'format': MMAP_FORMAT,
+        'source': source_version,
+        'countries': matrix.countries,
+        'start_year': matrix.start_year,
+        'shape': list(matrix.shape),
+        'dtype': matrix.values.dtype.str
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    prefix_size = len(MMAP_MAGIC) + 4 + len(header_bytes)
+    padding = (-prefix_size) % _ALIGNMENT
+
+    directory = os.path.dirname(file_path)
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MMAP_MAGIC)
+            f.write(struct.pack('<I', len(header_bytes)))
+            f.write(header_bytes)
+            f.write(b'\0' * padding)
+            f.write(np.ascontiguousarray(matrix.values).tobytes(order='C'))
+            f.write(np.ascontiguousarray(matrix.provenance).tobytes(order='C'))
+        os.replace(tmp_path, file_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_mmap_header(file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    读取内存映射文件的文件头
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        文件头字典（附带数据偏移量'offset'），文件不存在或格式不兼容时返回None
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            if f.read(len(MMAP_MAGIC)) != MMAP_MAGIC:
+                return None
+            (header_size,) = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(header_size).decode('utf-8'))
+    except (OSError, ValueError, struct.error):
+        return None
+
+    if header.get('format') != MMAP_FORMAT:
+        return None
+
+    prefix_size = len(MMAP_MAGIC) + 4 + header_size
+    header['offset'] = prefix_size + (-prefix_size) % _ALIGNMENT
+    return header
+
+
+def open_mmap_store(file_path: str) -> Tuple[MilexMatrix, Dict[str, Any]]:
+    """
+    以只读方式映射数据文件
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        (矩阵数据直接指向映射内存的军费矩阵, 文件头)
+    """
+    header = read_mmap_header(file_path)
+    if header is None:
+        raise ValueError(f"无效的内存映射数据文件: {file_path}")
+
+    rows, cols = header['shape']
+    dtype = np.dtype(header['dtype'])
+    if rows * cols == 0:
+        # 空矩阵无法映射
+        values = np.empty((rows, cols), dtype=dtype)
+        provenance = np.empty((rows, cols), dtype=np.uint8)
+    else:
+        values = np.memmap(file_path, dtype=dtype, mode='r', offset=header['offset'], shape=(rows, cols))
+        provenance = np.memmap(file_path, dtype=np.uint8, mode='r',
+                               offset=header['offset'] + values.nbytes, shape=(rows, cols))
+
+    years = list(range(header['start_year'], header['start_year'] + cols))
+    matrix = MilexMatrix(header['countries'], years, values, dtype=dtype, provenance=provenance)
+
+    return matrix, header
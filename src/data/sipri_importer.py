@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+SIPRI原始数据导入模块
+以流式方式解析SIPRI-Milex-data-1948-2023.xlsx中的工作表XML，
+逐行提取国家数据并直接生成军费矩阵，不为每个工作表构建pandas对象
+"""
+
+import re
+import zipfile
+import posixpath
+import numpy as np
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Tuple, Iterator
+
+from data.milex_matrix import MilexMatrix, OBSERVED, MISSING_OTHER, MISSING_PLACEHOLDERS
+
+# SIPRI原始数据文件名
+SIPRI_WORKBOOK = 'SIPRI-Milex-data-1948-2023.xlsx'
+
+# 默认导入的工作表（以2022年不变价美元计的军费支出）
+DEFAULT_SIPRI_SHEET = 'Constant (2022) US$'
+
+_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+_CELL_REF = re.compile(r'([A-Z]+)')
+
+
+def list_sheets(workbook_path: str) -> Dict[str, str]:
+    """
+    列出工作簿中的所有工作表
+
+    Args:
+        workbook_path: xlsx文件路径
+
+    Returns:
+        工作表名称到压缩包内XML路径的映射（按工作簿中的顺序）
+    """
+    with zipfile.ZipFile(workbook_path) as zf:
+        return _list_sheets(zf)
+
+
+def import_sipri_sheet(workbook_path: str, sheet_name: str = DEFAULT_SIPRI_SHEET,
+                       first_year: int = 1948, last_year: int = 2023) -> MilexMatrix:
+    """
+    流式解析SIPRI工作表并生成军费矩阵
+
+    表头行为第一列是"Country"且包含年份的行；其后第一列为名称、
+    年份列中至少有一个单元格的行视为国家行，地区标题行和空行会被跳过。
+    数值单元格转换为浮点数，"..."、"xxx"等占位符记为NaN，并在来源标记中记录占位符类型
+
+    Args:
+        workbook_path: xlsx文件路径
+        sheet_name: 工作表名称
+        first_year: 导入的起始年份
+        last_year: 导入的结束年份（包含）
+
+    Returns:
+        军费矩阵
+    """
+    with zipfile.ZipFile(workbook_path) as zf:
+        sheets = _list_sheets(zf)
+        if sheet_name not in sheets:
+            raise ValueError(f"工作簿中不存在工作表: {sheet_name}，可选值为: {', '.join(sheets)}")
+
+        shared_strings = _read_shared_strings(zf)
+
+        year_columns = None
+        countries = []
+        rows = []
+        provenance_rows = []
+        with zf.open(sheets[sheet_name]) as f:
+            for cells in _iter_rows(f, shared_strings):
+                if year_columns is None:
+                    year_columns = _match_header(cells, first_year, last_year)
+                    continue
+
+                name = cells.get(0)
+                if not isinstance(name, str) or not name.strip():
+                    continue
+                if not any(col in cells for col in year_columns):
+                    continue
+
+                values = np.full(len(year_columns), np.nan)
+                codes = np.full(len(year_columns), MISSING_OTHER, dtype=np.uint8)
+                for i, col in enumerate(year_columns):
+                    value = cells.get(col)
+                    if isinstance(value, float):
+                        values[i] = value
+                        codes[i] = OBSERVED
+                    elif isinstance(value, str):
+                        codes[i] = MISSING_PLACEHOLDERS.get(value.strip(), MISSING_OTHER)
+                countries.append(name.strip())
+                rows.append(values)
+                provenance_rows.append(codes)
+
+    if year_columns is None:
+        raise ValueError(f"工作表 {sheet_name} 中未找到年份表头")
+
+    years = sorted(year_columns.values())
+    # 表头年份按列顺序排列，按年份重新排列矩阵列
+    order = [list(year_columns.values()).index(year) for year in years]
+    values = np.vstack(rows)[:, order] if rows else np.empty((0, len(years)))
+    provenance = np.vstack(provenance_rows)[:, order] if rows else np.empty((0, len(years)), dtype=np.uint8)
+
+    return MilexMatrix(countries, years, values, provenance=provenance)
+
+
+def _list_sheets(zf: zipfile.ZipFile) -> Dict[str, str]:
+    """
+    从workbook.xml及其关系文件中解析工作表列表
+
+    Args:
+        zf: 打开的xlsx压缩包
+
+    Returns:
+        工作表名称到压缩包内XML路径的映射
+    """
+    rels = {}
+    with zf.open('xl/_rels/workbook.xml.rels') as f:
+        for rel in ET.parse(f).getroot().iter(f'{_PKG_REL_NS}Relationship'):
+            target = rel.get('Target')
+            if target.startswith('/'):
+                target = target.lstrip('/')
+            else:
+                target = posixpath.normpath(posixpath.join('xl', target))
+            rels[rel.get('Id')] = target
+
+    sheets = {}
+    with zf.open('xl/workbook.xml') as f:
+        for sheet in ET.parse(f).getroot().iter(f'{_NS}sheet'):
+            sheets[sheet.get('name')] = rels[sheet.get(f'{_REL_NS}id')]
+    return sheets
+
+
+def _read_shared_strings(zf: zipfile.ZipFile) -> List[str]:
+    """
+    读取共享字符串表
+
+    Args:
+        zf: 打开的xlsx压缩包
+
+    Returns:
+        共享字符串列表
+    """
+    if 'xl/sharedStrings.xml' not in zf.namelist():
+        return []
+
+    strings = []
+    with zf.open('xl/sharedStrings.xml') as f:
+        for _, elem in ET.iterparse(f, events=('end',)):
+            if elem.tag == f'{_NS}si':
+                # 富文本字符串由多个<r><t>片段组成，拼接全部文本
+                strings.append(''.join(t.text or '' for t in elem.iter(f'{_NS}t')))
+                elem.clear()
+    return strings
+
+
+def _iter_rows(f, shared_strings: List[str]) -> Iterator[Dict[int, object]]:
+    """
+    逐行解析工作表XML
+
+    每处理完一行即从树中移除该行，内存占用与工作表行数无关
+
+    Args:
+        f: 工作表XML文件对象
+        shared_strings: 共享字符串列表
+
+    Yields:
+        列号(从0开始)到单元格值的映射，数值为float，文本为str
+    """
+    sheet_data = None
+    for event, elem in ET.iterparse(f, events=('start', 'end')):
+        if event == 'start':
+            if elem.tag == f'{_NS}sheetData':
+                sheet_data = elem
+            continue
+        if elem.tag != f'{_NS}row':
+            continue
+
+        cells = {}
+        for cell in elem.iter(f'{_NS}c'):
+            value = _cell_value(cell, shared_strings)
+            if value is not None:
+                cells[_column_index(cell.get('r'))] = value
+        yield cells
+
+        elem.clear()
+        if sheet_data is not None:
+            sheet_data.remove(elem)
+
+
+def _cell_value(cell: ET.Element, shared_strings: List[str]) -> Optional[object]:
+    """
+    解析单元格的值
+
+    Args:
+        cell: <c>元素
+        shared_strings: 共享字符串列表
+
+    Returns:
+        数值返回float，文本返回str，空单元格返回None
+    """
+    cell_type = cell.get('t', 'n')
+    if cell_type == 'inlineStr':
+        text = ''.join(t.text or '' for t in cell.iter(f'{_NS}t'))
+        return text if text.strip() else None
+
+    v = cell.find(f'{_NS}v')
+    if v is None or v.text is None:
+        return None
+
+    if cell_type == 's':
+        text = shared_strings[int(v.text)]
+        return text if text.strip() else None
+    if cell_type in ('str', 'e'):
+        return v.text
+    if cell_type == 'b':
+        return float(v.text)
+    try:
+        return float(v.text)
+    except ValueError:
+        return v.text
+
+
+def _column_index(ref: str) -> int:
+    """
+    将单元格引用（如"AB12"）转换为从0开始的列号
+
+    Args:
+        ref: 单元格引用
+
+    Returns:
+        列号
+    """
+    letters = _CELL_REF.match(ref).group(1)
+    index = 0
+    for letter in letters:
+        index = index * 26 + (ord(letter) - ord('A') + 1)
+    return index - 1
+
+
+def _match_header(cells: Dict[int, object], first_year: int, last_year: int) -> Optional[Dict[int, int]]:
+    """
+    判断一行是否为年份表头
+
+    Args:
+        cells: 行数据
+        first_year: 起始年份
+        last_year: 结束年份
+
+    Returns:
+        表头行返回列号到年份的映射，否则返回None
+    """
+    first = cells.get(0)
+    if not isinstance(first, str) or first.strip() != 'Country':
+        return None
+
+    year_columns = {}
+    for col, value in cells.items():
+        if isinstance(value, float) and value.is_integer() and first_year <= value <= last_year:
+            year_columns[col] = int(value)
+    return year_columns or None
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+数据快照模块
+将解析后的Excel数据保存为紧凑的列式二进制快照(.npz)，
+源文件内容未变化时直接加载快照，避免重复调用pd.read_excel
+"""
+
+import os
+import struct
+import zipfile
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Tuple
+
+# 快照格式版本，格式变化时递增，旧快照会被自动忽略
+SNAPSHOT_FORMAT = 4
+
+
+def snapshot_path(snapshot_dir: str, source_path: str) -> str:
+    """
+    获取源文件对应的快照文件路径
+
+    Args:
+        snapshot_dir: 快照目录
+        source_path: 源数据文件路径
+
+    Returns:
+        快照文件路径
+    """
+    base_name = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(snapshot_dir, f"{base_name}.npz")
+
+
+def save_snapshot(file_path: str, df: pd.DataFrame, source_digest: str,
+                  provenance: Optional[np.ndarray] = None):
+    """
+    将DataFrame保存为快照
+
+    第一列（国家名称）保存为字符串数组，名称缺失的单元格另以布尔掩码记录，
+    读取时还原为缺失值（不会变成字符串"nan"）；其余列合并为一个float64矩阵按列存储
+
+    Args:
+        file_path: 快照文件路径
+        df: 要保存的数据，第一列为国家名称，其余列为数值
+        source_digest: 源文件内容哈希
+        provenance: 与df.columns[1:]逐列对应的单元格来源标记矩阵
+    """
+    directory = os.path.dirname(file_path)
+    os.makedirs(directory, exist_ok=True)
+
+    names = df.iloc[:, 0]
+    missing = names.isna().to_numpy(dtype=bool)
+    countries = names.where(~missing, '').astype(str).to_numpy(dtype=str)
+    values = np.asfortranarray(df.iloc[:, 1:].to_numpy(dtype=np.float64))
+    extra = {} if provenance is None else {'provenance': np.asfortranarray(provenance, dtype=np.uint8)}
+
+    # 先写入临时文件再替换，避免其他进程读到写了一半的快照
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(
+                f,
+                format=np.array(SNAPSHOT_FORMAT),
+                source=np.array(source_digest),
+                columns=np.array([str(col) for col in df.columns]),
+                countries=countries,
+                countries_missing=missing,
+                values=values,
+                **extra
+            )
+        os.replace(tmp_path, file_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_snapshot_digest(file_path: str) -> Optional[str]:
+    """
+    读取快照记录的源文件哈希
+
+    Args:
+        file_path: 快照文件路径
+
+    Returns:
+        源文件哈希，快照不存在或格式不兼容时返回None
+    """
+    try:
+        with np.load(file_path, allow_pickle=False) as snapshot:
+            if int(snapshot['format']) != SNAPSHOT_FORMAT:
+                return None
+            return str(snapshot['source'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def load_snapshot(file_path: str, source_digest: str,
+                  column_range: Optional[Tuple[int, int]] = None,
+                  year_range: Optional[Tuple[int, int]] = None) -> Optional[Tuple[pd.DataFrame, Optional[np.ndarray]]]:
+    """
+    加载快照
+
+    Args:
+        file_path: 快照文件路径
+        source_digest: 当前源文件内容哈希
+        column_range: 只加载的数值列区间[start, stop)（不含国家列），默认加载所有列；
+            数值按列存储，区间内的列是文件中连续的一段，直接定位读取而不读入其它列
+        year_range: 只加载的年份范围(起始年份, 结束年份)，按快照中保存的列名定位列区间
+            （年份列在文件中是连续的一段），与column_range同时指定时以此为准
+
+    Returns:
+        (快照中的DataFrame, 单元格来源标记矩阵或None)，
+        快照不存在、格式不兼容或与源文件不一致时返回None
+    """
+    try:
+        with np.load(file_path, allow_pickle=False) as snapshot:
+            if int(snapshot['format']) != SNAPSHOT_FORMAT:
+                return None
+            if str(snapshot['source']) != source_digest:
+                return None
+            columns = snapshot['columns'].tolist()
+            if year_range is not None:
+                column_range = _year_columns(columns[1:], year_range)
+            countries = snapshot['countries'].astype(object)
+            countries[snapshot['countries_missing']] = np.nan
+            has_provenance = 'provenance' in snapshot.files
+            if column_range is None:
+                values = snapshot['values']
+                provenance = snapshot['provenance'] if has_provenance else None
+
+        if column_range is not None:
+            start, stop = max(column_range[0], 0), min(column_range[1], len(columns) - 1)
+            stop = max(start, stop)
+            columns = columns[:1] + columns[1 + start:1 + stop]
+            values = _read_column_range(file_path, 'values', start, stop)
+            provenance = _read_column_range(file_path, 'provenance', start, stop) if has_provenance else None
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+    df = pd.DataFrame(values, columns=columns[1:])
+    df.insert(0, columns[0], countries)
+
+    return df, provenance
+
+
+def _year_columns(columns: List[str], year_range: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    根据列名获取年份范围对应的数值列区间
+
+    Args:
+        columns: 数值列的列名
+        year_range: 年份范围(起始年份, 结束年份)
+
+    Returns:
+        数值列区间[start, stop)，范围内没有年份列时为空区间
+    """
+    positions = [i for i, col in enumerate(columns)
+                 if col.isdigit() and year_range[0] <= int(col) <= year_range[1]]
+    if not positions:
+        return 0, 0
+    return positions[0], positions[-1] + 1
+
+
+def _read_column_range(file_path: str, name: str, start: int, stop: int) -> np.ndarray:
+    """
+    从未压缩的.npz文件中读取按列存储的矩阵的连续若干列
+
+    Args:
+        file_path: 快照文件路径
+        name: 数组名称
+        start: 起始列（含）
+        stop: 结束列（不含）
+
+    Returns:
+        形状为(行数, stop - start)的矩阵
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        info = archive.getinfo(f"{name}.npy")
+        with archive.open(info) as member:
+            version = np.lib.format.read_magic(member)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(member)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(member)
+            header_size = member.tell()
+
+    rows = shape[0]
+    if info.compress_type != zipfile.ZIP_STORED or not fortran_order or len(shape) != 2:
+        # 不是未压缩的按列存储矩阵，只能整体读取后切片
+        with np.load(file_path, allow_pickle=False) as snapshot:
+            return np.ascontiguousarray(snapshot[name][:, start:stop])
+
+    with open(file_path, 'rb') as f:
+        # 本地文件头（30字节）之后是文件名和扩展字段，再之后是.npy内容
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        name_length, extra_length = struct.unpack('<HH', local_header[26:30])
+        data_offset = info.header_offset + 30 + name_length + extra_length + header_size
+
+        f.seek(data_offset + start * rows * dtype.itemsize)
+        data = np.fromfile(f, dtype=dtype, count=(stop - start) * rows)
+
+    return data.reshape((rows, stop - start), order='F')
@@ -0,0 +1,342 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+SQLite数据文件模块
+将军费矩阵以长表格式(指标, 国家, 大洲, 年份, 值)保存到本地SQLite文件，
+按年份排名、按国家取数和年份范围查询都通过覆盖索引完成；
+文件以只读方式打开，可被多个进程同时使用
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+from urllib.parse import quote
+from typing import Dict, List, Optional
+
+from data.milex_matrix import MilexMatrix
+
+SQLITE_FORMAT = 1
+
+# 合并军费数据在长表中的指标名称
+MILEX_METRIC = 'milex'
+
+_SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE countries (
+    row INTEGER PRIMARY KEY,
+    country TEXT NOT NULL,
+    continent TEXT
+);
+CREATE TABLE milex (
+    metric TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    country TEXT NOT NULL,
+    continent TEXT,
+    year INTEGER NOT NULL,
+    value REAL,
+    provenance INTEGER NOT NULL
+);
+"""
+
+# 覆盖索引：查询所需的列都在索引中，不需要回表
+_INDEXES = """
+CREATE INDEX idx_milex_year_value ON milex (metric, year, value, row, country);
+CREATE INDEX idx_milex_country_year ON milex (metric, country, year, value, row);
+"""
+
+
+def write_sqlite_store(file_path: str, matrix: MilexMatrix, continents: List[Optional[str]],
+                       source_version: str, metric: str = MILEX_METRIC):
+    """
+    将军费矩阵写入SQLite文件
+
+    先写入临时文件再原子替换，已打开旧文件的进程不受影响
+
+    Args:
+        file_path: 目标文件路径
+        matrix: 军费矩阵
+        continents: 每一行所属的大洲名称，不属于任何大洲时为None
+        source_version: 源数据版本标识
+        metric: 指标名称
+    """
+    directory = os.path.dirname(file_path)
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.executescript(_SCHEMA)
+
+            meta = {
+                'format': str(SQLITE_FORMAT),
+                'source': source_version,
+                'metric': metric,
+                'start_year': str(matrix.start_year),
+                'years': str(len(matrix.years)),
+                'dtype': matrix.values.dtype.str
+            }
+            conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", meta.items())
+            conn.executemany(
+                "INSERT INTO countries (row, country, continent) VALUES (?, ?, ?)",
+                zip(range(len(matrix.countries)), matrix.countries, continents)
+            )
+
+            values = np.asarray(matrix.values, dtype=np.float64)
+            provenance = matrix.provenance
+            conn.executemany(
+                "INSERT INTO milex (metric, row, country, continent, year, value, provenance) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (metric, row, country, continents[row], year,
+                     None if np.isnan(values[row, col]) else float(values[row, col]),
+                     int(provenance[row, col]))
+                    for row, country in enumerate(matrix.countries)
+                    for col, year in enumerate(matrix.years)
+                )
+            )
+
+            # 数据写完后再建索引，比逐行维护索引快
+            conn.executescript(_INDEXES)
+            conn.execute("ANALYZE")
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, file_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_sqlite_meta(file_path: str) -> Optional[Dict[str, str]]:
+    """
+    读取SQLite文件的元数据
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        元数据字典，文件不存在或格式不兼容时返回None
+    """
+    if not os.path.exists(file_path):
+        return None
+    try:
+        conn = _connect_readonly(file_path)
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+
+    if meta.get('format') != str(SQLITE_FORMAT):
+        return None
+    return meta
+
+
+def _connect_readonly(file_path: str) -> sqlite3.Connection:
+    """
+    以只读方式打开SQLite文件
+
+    连接只在打开它的线程中执行查询；关闭SqliteStore时可能在其它线程中关闭，
+    因此不检查调用线程
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        数据库连接
+    """
+    uri = f"file:{quote(os.path.abspath(file_path))}?mode=ro"
+    return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+
+class SqliteStore:
+    """只读SQLite军费数据存储类（每个线程使用自己的数据库连接，可在多个线程中同时查询）"""
+
+    def __init__(self, file_path: str):
+        """
+        打开SQLite数据文件
+
+        Args:
+            file_path: 文件路径
+        """
+        meta = read_sqlite_meta(file_path)
+        if meta is None:
+            raise ValueError(f"无效的SQLite数据文件: {file_path}")
+
+        self.file_path = file_path
+        self.meta = meta
+        self.metric = meta['metric']
+        self.start_year = int(meta['start_year'])
+        self.years = list(range(self.start_year, self.start_year + int(meta['years'])))
+
+        # 同一个sqlite3连接不能被多个线程同时使用，每个线程首次查询时打开自己的只读连接
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """当前线程的数据库连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = _connect_readonly(self.file_path)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """关闭所有线程的数据库连接（调用方需确保没有正在进行的查询）"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+
+    def has_year(self, year: int) -> bool:
+        """
+        检查年份是否存在
+
+        Args:
+            year: 年份
+
+        Returns:
+            是否存在
+        """
+        return bool(self.years) and self.years[0] <= int(year) <= self.years[-1]
+
+    def to_matrix(self, dtype=np.float64) -> MilexMatrix:
+        """
+        读取完整的军费矩阵
+
+        Args:
+            dtype: 矩阵数据类型
+
+        Returns:
+            军费矩阵（含来源标记）
+        """
+        countries = [row[0] for row in self._conn.execute("SELECT country FROM countries ORDER BY row")]
+        values = np.full((len(countries), len(self.years)), np.nan)
+        provenance = np.zeros((len(countries), len(self.years)), dtype=np.uint8)
+
+        cells = self._conn.execute(
+            "SELECT row, year, value, provenance FROM milex WHERE metric = ?", (self.metric,)
+        ).fetchall()
+        if cells:
+            rows, years, cell_values, codes = zip(*cells)
+            rows = np.array(rows, dtype=np.int64)
+            cols = np.array(years, dtype=np.int64) - self.start_year
+            values[rows, cols] = np.array(cell_values, dtype=np.float64)
+            provenance[rows, cols] = np.array(codes, dtype=np.uint8)
+
+        return MilexMatrix(countries, self.years, values, dtype=dtype, provenance=provenance)
+
+    def top_countries(self, year: int, top_n: int) -> pd.DataFrame:
+        """
+        获取指定年份数值最高的国家（沿(metric, year, value)索引倒序扫描）
+
+        Args:
+            year: 年份
+            top_n: 返回的国家数量
+
+        Returns:
+            包含国家列和年份列的DataFrame，索引为数据行位置
+        """
+        cells = self._conn.execute(
+            "SELECT row, country, value FROM milex "
+            "WHERE metric = ? AND year = ? AND value IS NOT NULL "
+            "ORDER BY value DESC, row ASC LIMIT ?",
+            (self.metric, int(year), int(top_n))
+        ).fetchall()
+
+        rows = np.array([cell[0] for cell in cells], dtype=np.int64)
+        return pd.DataFrame(
+            {'Country': [cell[1] for cell in cells], str(year): np.array([cell[2] for cell in cells], dtype=np.float64)},
+            index=rows
+        )
+
+    def country_years(self, countries: List[str], years: List[int]) -> pd.DataFrame:
+        """
+        获取多个国家在多个年份的数值（沿(metric, country, year)索引查找）
+
+        重名国家取第一次出现的行，与DataLoader.get_countries_data一致
+
+        Args:
+            countries: 国家名称列表，不存在的国家会被跳过
+            years: 年份列表，不存在的年份会被跳过
+
+        Returns:
+            包含国家列和年份列的DataFrame，行按数据行位置排序，索引为数据行位置
+        """
+        countries = list(dict.fromkeys(countries))
+        year_list = [int(year) for year in years if self.has_year(year)]
+
+        first_rows = dict(self._conn.execute(
+            f"SELECT country, MIN(row) FROM countries WHERE country IN ({','.join('?' * len(countries))}) "
+            "GROUP BY country",
+            countries
+        ).fetchall()) if countries else {}
+        rows = sorted(first_rows.values())
+        row_pos = {row: i for i, row in enumerate(rows)}
+        names = {row: country for country, row in first_rows.items()}
+
+        unique_years = list(dict.fromkeys(year_list))
+        col_pos = {year: i for i, year in enumerate(unique_years)}
+        values = np.full((len(rows), len(unique_years)), np.nan)
+        if rows and unique_years:
+            cells = self._conn.execute(
+                f"SELECT row, year, value FROM milex WHERE metric = ? "
+                f"AND country IN ({','.join('?' * len(first_rows))}) "
+                f"AND year IN ({','.join('?' * len(unique_years))})",
+                [self.metric] + list(first_rows) + unique_years
+            ).fetchall()
+            for row, year, value in cells:
+                if row in row_pos and value is not None:
+                    values[row_pos[row], col_pos[year]] = value
+
+        df = pd.DataFrame(
+            {str(year): values[:, col_pos[year]] for year in unique_years},
+            index=pd.Index(rows, dtype=np.int64)
+        )
+        df.insert(0, 'Country', [names[row] for row in rows])
+        # 与原有实现一致：年份按传入顺序排列（包括重复的年份）
+        return df[['Country'] + [str(year) for year in year_list]]
+
+    def year_range(self, start_year: int, end_year: int) -> pd.DataFrame:
+        """
+        获取所有国家在年份范围内的数值（沿(metric, year)索引范围扫描）
+
+        Args:
+            start_year: 起始年份
+            end_year: 结束年份（包含）
+
+        Returns:
+            包含国家列和年份列的DataFrame，行顺序与合并数据一致
+        """
+        years = [year for year in self.years if start_year <= year <= end_year]
+        countries = [row[0] for row in self._conn.execute("SELECT country FROM countries ORDER BY row")]
+        values = np.full((len(countries), len(years)), np.nan)
+
+        if years:
+            cells = self._conn.execute(
+                "SELECT row, year, value FROM milex WHERE metric = ? AND year BETWEEN ? AND ?",
+                (self.metric, years[0], years[-1])
+            ).fetchall()
+            if cells:
+                rows, cell_years, cell_values = zip(*cells)
+                cols = np.array(cell_years, dtype=np.int64) - years[0]
+                values[np.array(rows, dtype=np.int64), cols] = np.array(cell_values, dtype=np.float64)
+
+        df = pd.DataFrame(values, columns=[str(year) for year in years])
+        df.insert(0, 'Country', countries)
+        return df
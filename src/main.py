@@ -8,6 +8,7 @@
 
 import sys
 import os
+import argparse
 
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,5 +17,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from ui.app import MilitaryPowerApp
 
 if __name__ == "__main__":
-    app = MilitaryPowerApp()
+    parser = argparse.ArgumentParser(description="世界军事力量可视化")
+    parser.add_argument("--watch", action="store_true",
+                        help="监视数据源文件，文件被修改后在后台重新加载并刷新视图")
+    args = parser.parse_args()
+    
+    app = MilitaryPowerApp(watch_files=args.watch)
     app.run() 
\ No newline at end of file
@@ -18,11 +18,15 @@ from typing import Dict, List, Optional, Union, Tuple, Any, Callable
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import plotly.graph_objects as go
+import queue
 import webbrowser
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # 导入项目模块
 from data.data_loader import DataLoader
 from data.data_analyzer import DataAnalyzer
+from data.app_state import APP_STATE_FILE, save_app_state, load_app_state
+from data.file_watcher import FileWatcher
 from visualization.visualizer import Visualizer, APPLE_COLORS
 from utils.helpers import (
     figure_to_photoimage, save_figure, format_number, 
@@ -40,8 +44,14 @@ from ui.components.about_view import AboutView
 class MilitaryPowerApp:
     """军事力量可视化应用程序主类"""
     
-    def __init__(self):
-        """初始化应用程序"""
+    def __init__(self, watch_files: bool = False):
+        """
+        初始化应用程序
+        
+        Args:
+            watch_files: 是否监视数据源文件，文件被修改后在后台重新加载并刷新视图
+                （监视线程定期检查文件签名，默认关闭，见main.py的--watch参数）
+        """
         # 设置应用程序主题
         ctk.set_appearance_mode("light")  # 苹果风格使用浅色主题
         ctk.set_default_color_theme("blue")  # 使用蓝色主题，接近苹果的蓝色
@@ -60,6 +70,13 @@ class MilitaryPowerApp:
         self.data_analyzer = DataAnalyzer(self.data_loader)
         self.visualizer = Visualizer(theme='apple')
         
+        # 数据更新时未显示、需要在下次切换到时重新计算的视图
+        self.stale_views = set()
+        
+        # 恢复上次退出时保存的数据和各视图最后显示的图像，首屏无需等待解析和绘图
+        self.state_path = os.path.join(self.data_loader.snapshot_dir, APP_STATE_FILE)
+        self.warm_state = self._restore_app_state()
+        
         # 创建UI布局
         self._create_layout()
         
@@ -68,6 +85,40 @@ class MilitaryPowerApp:
         
         # 加载初始数据
         self._load_initial_data()
+        
+        # 首屏来自保存的状态时，在后台校验数据是否仍是最新
+        if self.warm_state:
+            self._refresh_in_background()
+        
+        # 监视数据源文件
+        self.file_watcher = None
+        self.reload_queue = queue.Queue()
+        if watch_files:
+            self._start_file_watcher()
+    
+    def _restore_app_state(self) -> Optional[Dict[str, Any]]:
+        """
+        恢复上次退出时保存的应用状态
+        
+        Returns:
+            应用状态字典（见data.app_state.load_app_state），没有可用的状态时返回None
+        """
+        state = load_app_state(self.state_path)
+        if state is None or not self.data_loader.restore_state(state['data']):
+            return None
+        return state
+    
+    def _warm_view_state(self, view_name: str) -> Optional[Dict[str, Any]]:
+        """
+        获取视图上次退出时保存的状态
+        
+        Args:
+            view_name: 视图名称
+            
+        Returns:
+            视图状态，没有时返回None
+        """
+        return self.warm_state['views'].get(view_name) if self.warm_state else None
     
     def _create_layout(self):
         """创建应用程序布局"""
@@ -102,7 +153,8 @@ class MilitaryPowerApp:
             self.main_content,
             self.data_loader,
             self.data_analyzer,
-            self.visualizer
+            self.visualizer,
+            warm_state=self._warm_view_state('dashboard')
         )
         
         # 世界地图视图
@@ -110,7 +162,8 @@ class MilitaryPowerApp:
             self.main_content,
             self.data_loader,
             self.data_analyzer,
-            self.visualizer
+            self.visualizer,
+            warm_state=self._warm_view_state('map')
         )
         
         # 国家比较视图
@@ -134,8 +187,8 @@ class MilitaryPowerApp:
             self.main_content
         )
         
-        # 默认显示仪表盘视图
-        self._on_view_change('dashboard')
+        # 默认显示仪表盘视图（已显示保存的内容时不重新计算）
+        self._on_view_change('dashboard', refresh=self.warm_state is None)
         
         # 创建底部状态栏
         self._create_status_bar()
@@ -148,7 +201,7 @@ class MilitaryPowerApp:
         # 应用标题
         self.title_label = ctk.CTkLabel(
             self.title_bar, 
-            text="世界军事力量可视化 (1960-2023)",
+            text="世界军事力量可视化 (1948-2023)",
             font=ctk.CTkFont(size=20, weight="bold")
         )
         self.title_label.pack(side=tk.LEFT, padx=10)
@@ -223,12 +276,120 @@ class MilitaryPowerApp:
             messagebox.showerror("数据加载错误", f"加载数据时发生错误: {str(e)}")
             self.status_label.configure(text="数据加载失败")
     
-    def _on_view_change(self, view_name: str):
+    def _refresh_in_background(self):
+        """在后台线程中校验数据，完成后在主线程中刷新视图"""
+        self.status_label.configure(text="正在后台校验数据...")
+        
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(self._refresh_data)
+        executor.shutdown(wait=False)
+        
+        self.root.after(100, self._poll_background_refresh, future)
+    
+    def _refresh_data(self) -> str:
+        """
+        校验数据缓存并预先计算大洲汇总（在后台线程中执行）
+        
+        访问数据时会按源文件签名校验缓存，源文件在上次退出后被修改时重新解析；
+        SIPRI多指标数据只在切换到对应指标时才加载，不在这里解析
+        
+        Returns:
+            当前数据版本
+        """
+        version = self.data_loader.data_version
+        self.data_loader.get_continent_totals()
+        return version
+    
+    def _poll_background_refresh(self, future: Future):
+        """
+        检查后台校验是否完成（Tk组件只能在主线程中更新）
+        
+        Args:
+            future: 后台校验任务
+        """
+        if not future.done():
+            self.root.after(100, self._poll_background_refresh, future)
+            return
+        
+        try:
+            version = future.result()
+        except Exception as e:
+            print(f"后台校验数据时发生错误: {e}")
+            self.status_label.configure(text="数据校验失败")
+            return
+        
+        # 数据在上次退出后发生了变化：重新计算当前视图，其它视图在切换到时更新
+        if version != self.warm_state['data']['data_version']:
+            self._refresh_views()
+        
+        self.status_label.configure(text="就绪")
+    
+    def _start_file_watcher(self):
+        """启动数据源文件监视器，并定期检查后台重新加载的结果"""
+        self.file_watcher = FileWatcher(self.data_loader.get_watched_files, self._on_source_files_changed)
+        self.file_watcher.start()
+        self.root.after(500, self._poll_reloads)
+    
+    def _on_source_files_changed(self, file_paths: List[str]):
+        """
+        数据源文件变化回调（在监视线程中执行）：只重新解析变化的文件，
+        新数据构建完成后才替换缓存，然后通知主线程刷新视图
+        
+        Args:
+            file_paths: 发生变化的文件路径
+        """
+        keys = self.data_loader.reload_files(file_paths)
+        if keys:
+            self.reload_queue.put([os.path.basename(file_path) for file_path in file_paths])
+    
+    def _poll_reloads(self):
+        """检查是否有后台重新加载完成的数据，有则刷新当前视图（Tk组件只能在主线程中更新）"""
+        file_names = []
+        while True:
+            try:
+                file_names.extend(self.reload_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        if file_names:
+            self._refresh_views()
+            self.status_label.configure(text=f"数据已更新: {', '.join(sorted(set(file_names)))}")
+        
+        self.root.after(500, self._poll_reloads)
+    
+    def _refresh_views(self):
+        """数据更新后立即重新计算当前显示的视图，其它视图标记为过期，切换到时再重新计算"""
+        for name, view in self.views.items():
+            if not hasattr(view, 'update'):
+                continue
+            if view.winfo_ismapped():
+                view.update()
+                self.stale_views.discard(name)
+            else:
+                self.stale_views.add(name)
+    
+    def _save_app_state(self):
+        """保存应用状态，供下次启动时直接恢复（失败时不影响退出）"""
+        try:
+            data_state = self.data_loader.export_state()
+            if data_state is None:
+                return
+            
+            views = {
+                name: view.get_warm_state()
+                for name, view in self.views.items() if hasattr(view, 'get_warm_state')
+            }
+            save_app_state(self.state_path, data_state, views)
+        except Exception as e:
+            print(f"保存应用状态失败: {e}")
+    
+    def _on_view_change(self, view_name: str, refresh: bool = True):
         """
         切换视图
         
         Args:
             view_name: 视图名称
+            refresh: 是否重新计算视图内容（视图已过期时总是重新计算）
         """
         # 隐藏所有视图
         for view in self.views.values():
@@ -239,8 +400,9 @@ class MilitaryPowerApp:
             self.views[view_name].pack(fill=tk.BOTH, expand=True)
             
             # 更新视图（如果视图有update方法）
-            if hasattr(self.views[view_name], 'update'):
+            if (refresh or view_name in self.stale_views) and hasattr(self.views[view_name], 'update'):
                 self.views[view_name].update()
+            self.stale_views.discard(view_name)
     
     def _on_export_data(self):
         """导出数据处理函数"""
@@ -416,6 +578,9 @@ class MilitaryPowerApp:
         """窗口关闭事件处理函数"""
         # 询问是否确定退出
         if messagebox.askyesno("退出", "确定要退出应用程序吗？"):
+            if self.file_watcher is not None:
+                self.file_watcher.stop()
+            self._save_app_state()
             self.root.destroy()
     
     def run(self):
@@ -20,7 +20,7 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from data.data_loader import DataLoader
 from data.data_analyzer import DataAnalyzer
 from visualization.visualizer import Visualizer
-from utils.helpers import figure_to_photoimage, save_figure, create_export_filename
+from utils.helpers import figure_to_photoimage, save_figure, create_export_filename, create_chart_cache
 
 class ComparisonView(ctk.CTkFrame):
     """国家比较视图组件类"""
@@ -43,8 +43,8 @@ class ComparisonView(ctk.CTkFrame):
         self.data_analyzer = data_analyzer
         self.visualizer = visualizer
         
-        # 图表缓存
-        self.chart_cache = {}
+        # 图表缓存（与数据共用加载器的缓存预算，替换或淘汰的图表自动关闭）
+        self.chart_cache = create_chart_cache(data_loader)
         
         # 创建视图内容
         self._create_widgets()
@@ -239,23 +239,8 @@ class ComparisonView(ctk.CTkFrame):
                 if widget != self.chart_label:
                     widget.destroy()
             
-            # 获取年份列表
-            years = list(range(start_year, end_year + 1))
-            
-            # 获取比较数据
-            comparison_data = self.data_analyzer.compare_countries(countries, years)
-            
-            # 准备折线图数据
-            line_data = pd.DataFrame()
-            line_data['Year'] = years
-            
-            for country in countries:
-                country_data = comparison_data[comparison_data.iloc[:, 0] == country]
-                if not country_data.empty:
-                    for year in years:
-                        if str(year) in country_data.columns:
-                            value = country_data[str(year)].values[0]
-                            line_data.loc[line_data['Year'] == year, country] = value
+            # 准备折线图数据（一次取出所有国家的年份切片）
+            line_data = self.data_loader.get_block(countries, start_year, end_year)
             
             # 创建折线图
             fig = self.visualizer.create_line_chart(
@@ -274,7 +259,7 @@ class ComparisonView(ctk.CTkFrame):
             chart_frame.draw()
             chart_frame.get_tk_widget().pack(fill=tk.BOTH, expand=True)
             
-            # 缓存图表
+            # 缓存图表（被替换的旧图表由缓存关闭）
             self.chart_cache['line_chart'] = {
                 'figure': fig,
                 'canvas': chart_frame
@@ -300,7 +285,9 @@ class ComparisonView(ctk.CTkFrame):
     
     def _on_save_chart(self):
         """保存图表处理函数"""
-        if 'line_chart' in self.chart_cache and 'figure' in self.chart_cache['line_chart']:
+        # 只取一次：图表可能在保存对话框打开期间被缓存淘汰
+        chart = self.chart_cache.get('line_chart')
+        if chart is not None and 'figure' in chart:
             # 创建文件名
             filename = create_export_filename("countries_comparison", "png")
             
@@ -315,7 +302,7 @@ class ComparisonView(ctk.CTkFrame):
             if file_path:
                 try:
                     # 保存图表
-                    fig = self.chart_cache['line_chart']['figure']
+                    fig = chart['figure']
                     fig.savefig(file_path, dpi=300, bbox_inches='tight')
                     messagebox.showinfo("保存成功", f"图表已成功保存到: {file_path}")
                 except Exception as e:
@@ -15,18 +15,19 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
 import os
+import io
 from PIL import Image, ImageTk
 
 from data.data_loader import DataLoader
 from data.data_analyzer import DataAnalyzer
 from visualization.visualizer import Visualizer, APPLE_COLORS
-from utils.helpers import figure_to_photoimage, format_number
+from utils.helpers import figure_to_photoimage, format_number, create_chart_cache
 
 class Dashboard(ctk.CTkFrame):
     """仪表盘视图组件类"""
     
     def __init__(self, master, data_loader: DataLoader, data_analyzer: DataAnalyzer, 
-                 visualizer: Visualizer, **kwargs):
+                 visualizer: Visualizer, warm_state: Dict[str, Any] = None, **kwargs):
         """
         初始化仪表盘视图
         
@@ -35,6 +36,7 @@ class Dashboard(ctk.CTkFrame):
             data_loader: 数据加载器
             data_analyzer: 数据分析器
             visualizer: 可视化器
+            warm_state: 上次退出时保存的视图状态（见get_warm_state），提供时直接显示而不重新计算
             **kwargs: 其他参数
         """
         super().__init__(master, **kwargs)
@@ -43,14 +45,18 @@ class Dashboard(ctk.CTkFrame):
         self.data_analyzer = data_analyzer
         self.visualizer = visualizer
         
-        # 图表缓存
-        self.chart_cache = {}
+        # 图表缓存（与数据共用加载器的缓存预算，替换或淘汰的图表自动关闭）
+        self.chart_cache = create_chart_cache(data_loader)
+        # 最近一次显示的卡片内容和恢复的图表图像，用于保存应用状态
+        self.render_state = {}
+        self.warm_images = {}
         
         # 创建仪表盘内容
         self._create_widgets()
         
-        # 加载数据
-        self.update()
+        # 加载数据（有保存的状态时先显示保存的内容）
+        if not (warm_state and self.restore_warm_state(warm_state)):
+            self.update()
     
     def _create_widgets(self):
         """创建仪表盘组件"""
@@ -195,25 +201,21 @@ class Dashboard(ctk.CTkFrame):
             year: 年份
         """
         try:
-            # 获取全球军费支出
-            all_data = self.data_loader.get_all_data()
-            global_expenditure = all_data[str(year)].sum(skipna=True)
+            # 获取全球军费支出（全球年度总额已预先汇总）
+            global_expenditure = self.data_analyzer.calculate_global_total(year)
             
-            # 计算同比增长率
-            if str(year-1) in all_data.columns:
-                prev_expenditure = all_data[str(year-1)].sum(skipna=True)
+            # 计算同比增长率（只加载部分年份时，查询上一年会按需扩大加载范围）
+            try:
+                prev_expenditure = self.data_analyzer.calculate_global_total(year - 1)
                 growth_rate = (global_expenditure / prev_expenditure - 1) * 100
                 trend_up = growth_rate > 0
-            else:
+            except ValueError:
                 growth_rate = 0
                 trend_up = True
             
             # 更新卡片
-            self.global_card.update_value(
-                format_number(global_expenditure, 1),
-                f"{growth_rate:.1f}%",
-                trend_up
-            )
+            self.render_state['global'] = [format_number(global_expenditure, 1), f"{growth_rate:.1f}%", bool(trend_up)]
+            self.global_card.update_value(*self.render_state['global'])
         except Exception as e:
             print(f"更新全球军费支出时发生错误: {e}")
     
@@ -238,6 +240,7 @@ class Dashboard(ctk.CTkFrame):
                 })
             
             # 更新卡片
+            self.render_state['top5'] = data
             self.top5_card.update_data(data)
         except Exception as e:
             print(f"更新前五国家时发生错误: {e}")
@@ -263,11 +266,8 @@ class Dashboard(ctk.CTkFrame):
                 trend_up = True
             
             # 更新卡片
-            self.continent_card.update_value(
-                format_number(asia_expenditure, 1),
-                f"{growth_rate:.1f}%",
-                trend_up
-            )
+            self.render_state['continent'] = [format_number(asia_expenditure, 1), f"{growth_rate:.1f}%", bool(trend_up)]
+            self.continent_card.update_value(*self.render_state['continent'])
         except Exception as e:
             print(f"更新大洲分布时发生错误: {e}")
     
@@ -314,7 +314,7 @@ class Dashboard(ctk.CTkFrame):
             chart_frame.draw()
             chart_frame.get_tk_widget().pack(fill=tk.BOTH, expand=True)
             
-            # 缓存图表
+            # 缓存图表（被替换的旧图表由缓存关闭）
             self.chart_cache['bar_chart'] = chart_frame
         except Exception as e:
             print(f"更新柱状图时发生错误: {e}")
@@ -335,14 +335,14 @@ class Dashboard(ctk.CTkFrame):
             continents = ['african', 'american', 'aisan', 'europen', 'easternasian']
             continent_names = ['非洲', '美洲', '亚洲', '欧洲', '东亚']
             
-            # 计算各大洲军费支出
-            expenditures = []
-            for continent in continents:
-                try:
-                    expenditure = self.data_analyzer.calculate_regional_total(continent, year)
-                    expenditures.append(expenditure)
-                except:
-                    expenditures.append(0)
+            # 各大洲军费支出（从预先汇总的大洲×年份矩阵中取一列）
+            totals = self.data_loader.get_continent_totals()
+            if totals.has_year(year):
+                column = totals.column(year)
+                expenditures = [column[totals.row_of(continent)] if totals.has_country(continent) else 0
+                                for continent in continents]
+            else:
+                expenditures = [0] * len(continents)
             
             # 创建数据框
             pie_data = pd.DataFrame({
@@ -363,11 +363,61 @@ class Dashboard(ctk.CTkFrame):
             chart_frame.draw()
             chart_frame.get_tk_widget().pack(fill=tk.BOTH, expand=True)
             
-            # 缓存图表
+            # 缓存图表（被替换的旧图表由缓存关闭）
             self.chart_cache['pie_chart'] = chart_frame
         except Exception as e:
             print(f"更新饼图时发生错误: {e}")
     
+    def get_warm_state(self) -> Dict[str, Any]:
+        """
+        获取当前显示的内容，用于应用退出时保存
+        
+        Returns:
+            包含'meta'（年份和卡片内容）和'images'（图表名称到PNG字节）的字典
+        """
+        images = dict(self.warm_images)
+        # 图表缓存与其它视图共用命名空间，只取本视图的图表（已被淘汰的图表不保存）
+        for name in ('bar_chart', 'pie_chart'):
+            chart_frame = self.chart_cache.peek(name)
+            if chart_frame is None:
+                continue
+            buffer = io.BytesIO()
+            chart_frame.figure.savefig(buffer, format='png', dpi=chart_frame.figure.dpi)
+            images[name] = buffer.getvalue()
+        
+        return {'meta': dict(self.render_state, year=self.year_var.get()), 'images': images}
+    
+    def restore_warm_state(self, state: Dict[str, Any]) -> bool:
+        """
+        显示上次退出时保存的内容，不查询数据也不重新绘制图表
+        
+        Args:
+            state: get_warm_state返回的视图状态
+            
+        Returns:
+            是否已恢复（保存的内容不完整时返回False）
+        """
+        meta = state.get('meta', {})
+        images = state.get('images', {})
+        if not {'year', 'global', 'top5', 'continent'} <= set(meta) or not {'bar_chart', 'pie_chart'} <= set(images):
+            return False
+        
+        self.year_var.set(meta['year'])
+        self.global_card.update_value(*meta['global'])
+        self.top5_card.update_data(meta['top5'])
+        self.continent_card.update_value(*meta['continent'])
+        
+        for name, canvas in [('bar_chart', self.top_chart_canvas), ('pie_chart', self.bottom_chart_canvas)]:
+            photo = ImageTk.PhotoImage(Image.open(io.BytesIO(images[name])))
+            label = tk.Label(canvas, image=photo)
+            # 保留PhotoImage引用，避免被回收
+            label.image = photo
+            label.pack(fill=tk.BOTH, expand=True)
+        
+        self.render_state = {key: meta[key] for key in ['global', 'top5', 'continent']}
+        self.warm_images = dict(images)
+        return True
+    
     def _on_year_change(self, value):
         """
         年份变化回调函数
@@ -25,8 +25,18 @@ from utils.helpers import plotly_to_image, create_export_filename
 class MapView(ctk.CTkFrame):
     """世界地图视图组件类"""
     
+    # 视图类型对应的指标（None表示当前加载的军费支出数据，其余见SIPRI_METRICS、COUNTRY_METRICS和AGGREGATE_METRICS）；
+    # rbdata派生的指标与SIPRI指标都按数据文件表头中的实际年份（1948-2023）取值，同一年份可直接切换
+    VIEW_METRICS = {
+        "军费支出": None,
+        "军费占GDP比例": 'share_of_gdp',
+        "人均军费支出": 'milex_per_capita',
+        "军费/对美贸易额": 'milex_to_us_trade',
+        "占全球军费比例": 'share_of_world'
+    }
+    
     def __init__(self, master, data_loader: DataLoader, data_analyzer: DataAnalyzer, 
-                 visualizer: Visualizer, **kwargs):
+                 visualizer: Visualizer, warm_state: Dict[str, Any] = None, **kwargs):
         """
         初始化世界地图视图
         
@@ -35,6 +45,7 @@ class MapView(ctk.CTkFrame):
             data_loader: 数据加载器
             data_analyzer: 数据分析器
             visualizer: 可视化器
+            warm_state: 上次退出时保存的视图状态（见get_warm_state），提供时直接显示而不重新生成地图
             **kwargs: 其他参数
         """
         super().__init__(master, **kwargs)
@@ -49,6 +60,10 @@ class MapView(ctk.CTkFrame):
         
         # 创建视图内容
         self._create_widgets()
+        
+        # 加载初始地图（有保存的状态时先显示保存的地图）
+        if not (warm_state and self.restore_warm_state(warm_state)):
+            self.update()
     
     def _create_widgets(self):
         """创建视图组件"""
@@ -75,7 +90,7 @@ class MapView(ctk.CTkFrame):
         self.year_var = tk.StringVar(value="2022")
         self.year_menu = ctk.CTkOptionMenu(
             self.control_frame,
-            values=["2022", "2021", "2020", "2019", "2018", "2017", "2016", "2015", "2010", "2005", "2000", "1995", "1990", "1985", "1980", "1975", "1970", "1965", "1960"],
+            values=["2023", "2022", "2021", "2020", "2019", "2018", "2017", "2016", "2015", "2010", "2005", "2000", "1995", "1990", "1985", "1980", "1975", "1970", "1965", "1960"],
             variable=self.year_var,
             command=self._on_year_change,
             width=100
@@ -93,7 +108,7 @@ class MapView(ctk.CTkFrame):
         self.view_type_var = tk.StringVar(value="军费支出")
         self.view_type_menu = ctk.CTkOptionMenu(
             self.control_frame,
-            values=["军费支出", "军费占GDP比例", "人均军费支出"],
+            values=list(self.VIEW_METRICS),
             variable=self.view_type_var,
             command=self._on_view_type_change,
             width=150
@@ -131,9 +146,6 @@ class MapView(ctk.CTkFrame):
             font=ctk.CTkFont(size=12)
         )
         self.info_label.pack(side=tk.LEFT, padx=10, pady=5)
-        
-        # 加载初始地图
-        self.update()
     
     def update(self):
         """更新地图数据"""
@@ -162,38 +174,19 @@ class MapView(ctk.CTkFrame):
         self.update_idletasks()
         
         try:
-            # 获取数据
-            all_data = self.data_loader.get_all_data()
-            
-            # 选择国家列和指定年份列
-            country_col = all_data.columns[0]
-            
-            # 根据视图类型选择数据
-            if view_type == "军费支出":
-                value_col = str(year)
-                title = f"{year}年世界各国军费支出"
-            elif view_type == "军费占GDP比例":
-                # 这里假设我们有GDP数据，实际应用中需要加载真实数据
-                # 这里简化处理，随机生成一些比例数据
-                all_data['GDP_Ratio'] = all_data[str(year)].astype(float) / np.random.uniform(100, 1000, len(all_data))
-                value_col = 'GDP_Ratio'
-                title = f"{year}年世界各国军费占GDP比例"
-            elif view_type == "人均军费支出":
-                # 这里假设我们有人口数据，实际应用中需要加载真实数据
-                # 这里简化处理，随机生成一些人均数据
-                all_data['Per_Capita'] = all_data[str(year)].astype(float) / np.random.uniform(1, 100, len(all_data))
-                value_col = 'Per_Capita'
-                title = f"{year}年世界各国人均军费支出"
+            # 根据视图类型查询对应指标的数据
+            metric = self.VIEW_METRICS[view_type]
+            map_data = self.data_analyzer.get_metric_by_year(metric, year, iso3=True)
+            country_col, value_col, iso_col = map_data.columns
+            title = f"{year}年世界各国{view_type}"
             
-            # 过滤掉缺失值
-            map_data = all_data[[country_col, value_col]].dropna()
-            
-            # 创建地图
+            # 创建地图（按预先计算的ISO-3代码定位国家）
             fig = self.visualizer.create_map_chart(
                 map_data,
                 country_col,
                 value_col,
-                title
+                title,
+                iso_col=iso_col
             )
             
             try:
@@ -230,6 +223,50 @@ class MapView(ctk.CTkFrame):
             self.map_label.configure(text=f"生成地图时发生错误: {str(e)}\n可能是网络连接问题，请检查网络后重试")
             self.info_label.configure(text="地图加载失败。您可以尝试使用其他视图类型，或检查网络连接后重试。")
     
+    def get_warm_state(self) -> Dict[str, Any]:
+        """
+        获取当前显示的内容，用于应用退出时保存
+        
+        Returns:
+            包含'meta'（年份、视图类型和信息栏文本）和'images'（地图PNG字节）的字典
+        """
+        images = {}
+        if self.map_image:
+            buffer = io.BytesIO()
+            self.map_image.save(buffer, format='PNG')
+            images['map'] = buffer.getvalue()
+        
+        meta = {
+            'year': self.year_var.get(),
+            'view_type': self.view_type_var.get(),
+            'info': self.info_label.cget("text")
+        }
+        return {'meta': meta, 'images': images}
+    
+    def restore_warm_state(self, state: Dict[str, Any]) -> bool:
+        """
+        显示上次退出时保存的地图，不查询数据也不重新生成地图
+        
+        Args:
+            state: get_warm_state返回的视图状态
+            
+        Returns:
+            是否已恢复（保存的内容不完整时返回False）
+        """
+        meta = state.get('meta', {})
+        image = state.get('images', {}).get('map')
+        if image is None or meta.get('view_type') not in self.VIEW_METRICS or 'year' not in meta:
+            return False
+        
+        self.year_var.set(meta['year'])
+        self.view_type_var.set(meta['view_type'])
+        
+        self.map_image = Image.open(io.BytesIO(image))
+        self.map_photo = ImageTk.PhotoImage(self.map_image)
+        self.map_label.configure(text="", image=self.map_photo)
+        self.info_label.configure(text=meta.get('info', ""))
+        return True
+    
     def _on_year_change(self, value):
         """
         年份变化回调函数
@@ -278,11 +315,12 @@ class MapView(ctk.CTkFrame):
             # 获取选中的年份
             year = int(self.year_var.get())
             
-            # 获取数据
+            # 获取数据（get_all_data返回共享的缓存数据，这里只取所需列的副本再派生新列）
             all_data = self.data_loader.get_all_data()
             
             # 选择国家列和指定年份列
             country_col = all_data.columns[0]
+            all_data = all_data[[country_col, str(year)]].copy()
             export_data = all_data[[country_col, str(year)]].dropna()
             
             # 导出到CSV
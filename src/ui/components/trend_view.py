@@ -21,7 +21,7 @@ import plotly.graph_objects as go
 from data.data_loader import DataLoader
 from data.data_analyzer import DataAnalyzer
 from visualization.visualizer import Visualizer
-from utils.helpers import figure_to_photoimage, save_figure, create_export_filename, plotly_to_image
+from utils.helpers import figure_to_photoimage, save_figure, create_export_filename, plotly_to_image, create_chart_cache
 
 class TrendView(ctk.CTkFrame):
     """趋势视图组件类"""
@@ -44,8 +44,8 @@ class TrendView(ctk.CTkFrame):
         self.data_analyzer = data_analyzer
         self.visualizer = visualizer
         
-        # 图表缓存
-        self.chart_cache = {}
+        # 图表缓存（与数据共用加载器的缓存预算，替换或淘汰的图表自动关闭）
+        self.chart_cache = create_chart_cache(data_loader)
         
         # 创建视图内容
         self._create_widgets()
@@ -241,7 +241,7 @@ class TrendView(ctk.CTkFrame):
         chart_frame.draw()
         chart_frame.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
-        # 缓存图表
+        # 缓存图表（被替换的旧图表由缓存关闭）
         self.chart_cache['trend_chart'] = {
             'figure': fig,
             'canvas': chart_frame
@@ -250,6 +250,34 @@ class TrendView(ctk.CTkFrame):
         # 更新信息
         self.info_label.configure(text=f"显示 {start_year}-{end_year} 年间的全球军费支出趋势")
     
+    def _get_continent_trend(self, start_year: int, end_year: int,
+                             continents: List[str], continent_names: List[str]) -> pd.DataFrame:
+        """
+        获取各大洲在年份范围内的军费支出总额
+        
+        Args:
+            start_year: 起始年份
+            end_year: 结束年份
+            continents: 大洲名称列表
+            continent_names: 大洲显示名称列表，与continents一一对应
+            
+        Returns:
+            包含Year列和每个大洲显示名称一列的DataFrame，数据中不存在的年份为NaN
+        """
+        years = list(range(start_year, end_year + 1))
+        
+        try:
+            regional_trend = self.data_analyzer.calculate_regional_trend(start_year, end_year).set_index('Year')
+        except ValueError as e:
+            print(f"获取大洲趋势数据时出错: {e}")
+            regional_trend = pd.DataFrame(columns=continents, dtype=float)
+        
+        trend_data = regional_trend.reindex(index=years, columns=continents).reset_index(drop=True)
+        trend_data.columns = continent_names
+        trend_data.insert(0, 'Year', years)
+        
+        return trend_data
+    
     def _create_continent_trend_chart(self, start_year: int, end_year: int):
         """
         创建大洲趋势图表
@@ -262,26 +290,8 @@ class TrendView(ctk.CTkFrame):
         continents = ['african', 'american', 'aisan', 'europen', 'easternasian']
         continent_names = ['非洲', '美洲', '亚洲', '欧洲', '东亚']
         
-        # 准备数据
-        years = list(range(start_year, end_year + 1))
-        trend_data = pd.DataFrame()
-        trend_data['Year'] = years
-        
-        for continent, name in zip(continents, continent_names):
-            values = []
-            for year in years:
-                try:
-                    value = self.data_analyzer.calculate_regional_total(continent, year)
-                    values.append(float(value))  # 确保值为浮点数
-                except Exception as e:
-                    print(f"获取{continent}在{year}年的数据时出错: {e}")
-                    values.append(np.nan)
-            trend_data[name] = values
-        
-        # 确保所有数据列都是数值类型
-        for col in trend_data.columns:
-            if col != 'Year':
-                trend_data[col] = pd.to_numeric(trend_data[col], errors='coerce')
+        # 准备数据（大洲总额已预先汇总，一次取出整个年份范围；数据中不存在的年份为NaN）
+        trend_data = self._get_continent_trend(start_year, end_year, continents, continent_names)
         
         # 创建堆叠面积图
         fig = self.visualizer.create_stacked_area_chart(
@@ -319,7 +329,7 @@ class TrendView(ctk.CTkFrame):
         )
         chart_label.pack(fill=tk.BOTH, expand=True)
         
-        # 缓存图表
+        # 缓存图表（被替换的旧图表由缓存关闭）
         self.chart_cache['trend_chart'] = {
             'figure': fig,
             'image': chart_image,
@@ -341,32 +351,10 @@ class TrendView(ctk.CTkFrame):
         # 选择主要国家
         major_countries = ["China", "United States", "Russia", "India", "Japan"]
         
-        # 获取年份列表
-        years = list(range(start_year, end_year + 1))
-        
         # 获取比较数据
         try:
-            comparison_data = self.data_analyzer.compare_countries(major_countries, years)
-            
-            # 准备折线图数据
-            line_data = pd.DataFrame()
-            line_data['Year'] = years
-            
-            for country in major_countries:
-                country_data = comparison_data[comparison_data.iloc[:, 0] == country]
-                if not country_data.empty:
-                    for year in years:
-                        if str(year) in country_data.columns:
-                            try:
-                                value = float(country_data[str(year)].values[0])  # 确保值为浮点数
-                                line_data.loc[line_data['Year'] == year, country] = value
-                            except (ValueError, TypeError) as e:
-                                print(f"转换{country}在{year}年的数据时出错: {e}")
-            
-            # 确保所有数据列都是数值类型
-            for col in line_data.columns:
-                if col != 'Year':
-                    line_data[col] = pd.to_numeric(line_data[col], errors='coerce')
+            # 准备折线图数据（一次取出所有国家的年份切片）
+            line_data = self.data_loader.get_block(major_countries, start_year, end_year)
             
             # 创建折线图
             fig = self.visualizer.create_line_chart(
@@ -385,7 +373,7 @@ class TrendView(ctk.CTkFrame):
             chart_frame.draw()
             chart_frame.get_tk_widget().pack(fill=tk.BOTH, expand=True)
             
-            # 缓存图表
+            # 缓存图表（被替换的旧图表由缓存关闭）
             self.chart_cache['trend_chart'] = {
                 'figure': fig,
                 'canvas': chart_frame
@@ -418,7 +406,9 @@ class TrendView(ctk.CTkFrame):
     
     def _on_save_chart(self):
         """保存图表处理函数"""
-        if 'trend_chart' in self.chart_cache:
+        # 只取一次：图表可能在保存对话框打开期间被缓存淘汰
+        chart = self.chart_cache.get('trend_chart')
+        if chart is not None:
             # 创建文件名
             trend_type = self.trend_type_var.get()
             filename = create_export_filename(f"{trend_type.replace(' ', '_')}_trend", "png")
@@ -434,13 +424,13 @@ class TrendView(ctk.CTkFrame):
             if file_path:
                 try:
                     # 保存图表
-                    if 'figure' in self.chart_cache['trend_chart'] and 'canvas' in self.chart_cache['trend_chart']:
+                    if 'figure' in chart and 'canvas' in chart:
                         # Matplotlib图表
-                        fig = self.chart_cache['trend_chart']['figure']
+                        fig = chart['figure']
                         fig.savefig(file_path, dpi=300, bbox_inches='tight')
-                    elif 'image' in self.chart_cache['trend_chart']:
+                    elif 'image' in chart:
                         # Plotly图表
-                        self.chart_cache['trend_chart']['image'].save(file_path)
+                        chart['image'].save(file_path)
                     
                     messagebox.showinfo("保存成功", f"图表已成功保存到: {file_path}")
                 except Exception as e:
@@ -472,19 +462,7 @@ class TrendView(ctk.CTkFrame):
                 continent_names = ['非洲', '美洲', '亚洲', '欧洲', '东亚']
                 
                 # 准备数据
-                years = list(range(start_year, end_year + 1))
-                export_data = pd.DataFrame()
-                export_data['Year'] = years
-                
-                for continent, name in zip(continents, continent_names):
-                    values = []
-                    for year in years:
-                        try:
-                            value = self.data_analyzer.calculate_regional_total(continent, year)
-                            values.append(value)
-                        except:
-                            values.append(np.nan)
-                    export_data[name] = values
+                export_data = self._get_continent_trend(start_year, end_year, continents, continent_names)
             elif trend_type == "主要国家趋势":
                 # 选择主要国家
                 major_countries = ["China", "United States", "Russia", "India", "Japan"]
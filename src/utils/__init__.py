@@ -8,11 +8,13 @@
 from .helpers import (
     figure_to_image, figure_to_photoimage, save_figure, 
     format_number, get_year_range, create_export_filename,
-    plotly_to_image, get_continent_for_country, normalize_data
+    plotly_to_image, get_continent_for_country, normalize_data,
+    chart_nbytes, close_chart, create_chart_cache
 )
 
 __all__ = [
     'figure_to_image', 'figure_to_photoimage', 'save_figure', 
     'format_number', 'get_year_range', 'create_export_filename',
-    'plotly_to_image', 'get_continent_for_country', 'normalize_data'
+    'plotly_to_image', 'get_continent_for_country', 'normalize_data',
+    'chart_nbytes', 'close_chart', 'create_chart_cache'
 ] 
\ No newline at end of file
@@ -17,6 +17,9 @@ import io
 import base64
 from datetime import datetime
 
+# 图表缓存在数据加载器共享缓存中的命名空间
+CHART_NAMESPACE = 'charts'
+
 def figure_to_image(fig: Figure) -> Image.Image:
     """
     将matplotlib图表转换为PIL图像
@@ -254,4 +257,65 @@ def normalize_data(data: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
             else:
                 result[column] = 0
     
-    return result 
\ No newline at end of file
+    return result 
+
+def chart_nbytes(chart: Any) -> int:
+    """
+    估算图表缓存项占用的字节数
+    
+    matplotlib图表按画布的RGBA位图估算，PIL图像和PhotoImage按像素估算
+    
+    Args:
+        chart: 画布、Figure、图像，或包含它们的字典（如{'figure': ..., 'canvas': ...}）
+        
+    Returns:
+        字节数
+    """
+    items = chart.values() if isinstance(chart, dict) else [chart]
+    total = 0
+    figures = set()
+    for item in items:
+        figure = item if isinstance(item, Figure) else getattr(item, 'figure', None)
+        if isinstance(figure, Figure):
+            # 画布与Figure共用一块位图，同一图表只计一次
+            if id(figure) not in figures:
+                figures.add(id(figure))
+                width, height = figure.bbox.size
+                total += int(width) * int(height) * 4
+        elif isinstance(item, Image.Image):
+            total += item.width * item.height * len(item.getbands())
+        elif isinstance(item, ImageTk.PhotoImage):
+            total += item.width() * item.height() * 4
+    return total
+
+def close_chart(chart: Any):
+    """
+    关闭被移出图表缓存（替换或淘汰）的图表中的matplotlib Figure
+    
+    pyplot会一直持有创建过的Figure，不关闭时每次重绘都会留下一个无法回收的图表
+    
+    Args:
+        chart: 画布、Figure，或包含它们的字典（如{'figure': ..., 'canvas': ...}），为None时不做任何操作
+    """
+    if chart is None:
+        return
+    items = chart.values() if isinstance(chart, dict) else [chart]
+    for item in items:
+        figure = item if isinstance(item, Figure) else getattr(item, 'figure', None)
+        if isinstance(figure, Figure):
+            plt.close(figure)
+
+def create_chart_cache(data_loader: Any) -> Any:
+    """
+    获取视图使用的图表缓存
+    
+    各视图的图表放在数据加载器共享缓存的CHART_NAMESPACE命名空间中，
+    与数据共用字节预算；替换或被淘汰的图表自动关闭
+    
+    Args:
+        data_loader: 数据加载器
+        
+    Returns:
+        图表缓存（data.memory_cache.CacheNamespace）
+    """
+    return data_loader.cache_namespace(CHART_NAMESPACE, sizeof=chart_nbytes, on_remove=close_chart)
\ No newline at end of file
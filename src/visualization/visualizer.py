@@ -42,6 +42,30 @@ APPLE_COLORS = {
     'text': '#000000'
 }
 
+def _ensure_numeric(data: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """
+    确保指定列为数值类型
+    
+    数据来自MilexMatrix时各列已是数值类型，此时直接返回原数据，
+    只有需要转换时才复制
+    
+    Args:
+        data: 包含数据的DataFrame
+        columns: 需要为数值类型的列名列表
+        
+    Returns:
+        指定列均为数值类型的DataFrame
+    """
+    pending = [col for col in columns
+               if col in data.columns and not pd.api.types.is_numeric_dtype(data[col])]
+    if not pending:
+        return data
+    
+    data = data.copy()
+    for col in pending:
+        data[col] = pd.to_numeric(data[col], errors='coerce')
+    return data
+
 class Visualizer:
     """可视化器类，负责生成各种军事数据可视化图表"""
     
@@ -89,9 +113,7 @@ class Visualizer:
             matplotlib Figure对象
         """
         # 确保数据类型正确
-        data = data.copy()
-        if y_col in data.columns:
-            data[y_col] = pd.to_numeric(data[y_col], errors='coerce')
+        data = _ensure_numeric(data, [y_col])
         
         fig, ax = plt.subplots(figsize=figsize)
         
@@ -140,13 +162,7 @@ class Visualizer:
             matplotlib Figure对象
         """
         # 确保数据类型正确
-        data = data.copy()
-        if x_col in data.columns:
-            data[x_col] = pd.to_numeric(data[x_col], errors='coerce')
-        
-        for col in y_cols:
-            if col in data.columns:
-                data[col] = pd.to_numeric(data[col], errors='coerce')
+        data = _ensure_numeric(data, [x_col] + list(y_cols))
         
         fig, ax = plt.subplots(figsize=figsize)
         
@@ -195,9 +211,7 @@ class Visualizer:
             matplotlib Figure对象
         """
         # 确保数据类型正确
-        data = data.copy()
-        if value_col in data.columns:
-            data[value_col] = pd.to_numeric(data[value_col], errors='coerce')
+        data = _ensure_numeric(data, [value_col])
         
         # 删除缺失值
         data = data.dropna(subset=[value_col])
@@ -236,7 +250,7 @@ class Visualizer:
         return fig
     
     def create_map_chart(self, data: pd.DataFrame, country_col: str, value_col: str,
-                         title: str) -> Any:
+                         title: str, iso_col: str = None) -> Any:
         """
         创建世界地图可视化
         
@@ -245,14 +259,14 @@ class Visualizer:
             country_col: 国家列名
             value_col: 值列名
             title: 图表标题
+            iso_col: ISO-3代码列名，提供时按代码定位国家（不需要按名称匹配），
+                否则按国家名称定位
             
         Returns:
             plotly Figure对象
         """
         # 确保数据类型正确
-        data = data.copy()
-        if value_col in data.columns:
-            data[value_col] = pd.to_numeric(data[value_col], errors='coerce')
+        data = _ensure_numeric(data, [value_col])
         
         # 删除缺失值
         data = data.dropna(subset=[value_col])
@@ -261,8 +275,8 @@ class Visualizer:
             # 尝试创建标准的世界地图
             fig = px.choropleth(
                 data,
-                locations=data[country_col],  # 国家名称
-                locationmode='country names',  # 使用国家名称作为位置
+                locations=data[iso_col] if iso_col else data[country_col],  # ISO-3代码或国家名称
+                locationmode='ISO-3' if iso_col else 'country names',  # 使用代码或国家名称作为位置
                 color=data[value_col],  # 颜色映射的值
                 color_continuous_scale=px.colors.sequential.Blues,  # 颜色映射
                 title=title,
@@ -357,10 +371,7 @@ class Visualizer:
             plotly Figure对象
         """
         # 确保数据类型正确
-        data = data.copy()
-        for cat in categories:
-            if cat in data.columns:
-                data[cat] = pd.to_numeric(data[cat], errors='coerce')
+        data = _ensure_numeric(data, categories)
         
         # 创建雷达图
         fig = go.Figure()
@@ -424,11 +435,7 @@ class Visualizer:
             plotly Figure对象
         """
         # 确保数据类型正确
-        data = data.copy()
-        data[x_col] = pd.to_numeric(data[x_col], errors='coerce')
-        for col in y_cols:
-            if col in data.columns:
-                data[col] = pd.to_numeric(data[col], errors='coerce')
+        data = _ensure_numeric(data, [x_col] + list(y_cols))
         
         # 创建堆叠面积图
         fig = go.Figure()
@@ -485,13 +492,7 @@ class Visualizer:
             plotly Figure对象
         """
         # 确保数据类型正确
-        data = data.copy()
-        if x_col in data.columns:
-            data[x_col] = pd.to_numeric(data[x_col], errors='coerce')
-        if y_col in data.columns:
-            data[y_col] = pd.to_numeric(data[y_col], errors='coerce')
-        if size_col in data.columns:
-            data[size_col] = pd.to_numeric(data[size_col], errors='coerce')
+        data = _ensure_numeric(data, [x_col, y_col, size_col])
         
         # 创建气泡图
         fig = px.scatter(
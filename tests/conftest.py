@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+"""
+测试公共配置：将src加入导入路径，并提供与仓库数据隔离的数据目录
+"""
+
+import os
+import shutil
+import sys
+
+import openpyxl
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RBDATA_DIR = os.path.join(ROOT_DIR, 'rbdata')
+SIPRI_PATH = os.path.join(ROOT_DIR, 'SIPRI-Milex-data-1948-2023.xlsx')
+
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """复制rbdata中的Excel和CSV文件到临时目录，快照和数据文件都写在这里"""
+    target = tmp_path / 'rbdata'
+    target.mkdir()
+    for name in os.listdir(RBDATA_DIR):
+        if name.endswith(('.xlsx', '.csv')):
+            shutil.copy2(os.path.join(RBDATA_DIR, name), target / name)
+    return str(target)
+
+
+@pytest.fixture
+def edit_workbook():
+    """返回修改rbdata工作簿单元格的函数：edit(文件路径, 国家, 年份, 值)，年份列从1948年开始"""
+    def edit(file_path: str, country: str, year: int, value: float):
+        workbook = openpyxl.load_workbook(file_path)
+        sheet = workbook.active
+        for row in sheet.iter_rows(min_col=1, max_col=1):
+            if row[0].value == country:
+                sheet.cell(row=row[0].row, column=2 + year - 1948, value=value)
+                break
+        else:
+            raise KeyError(country)
+        workbook.save(file_path)
+    return edit
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+"""
+预先汇总结果测试
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.data_analyzer import DataAnalyzer
+from data.data_loader import DataLoader
+
+
+def _expected_continent_totals(loader: DataLoader) -> np.ndarray:
+    labels = loader.get_continent_labels()
+    values = np.nan_to_num(loader.get_matrix().values)
+    return np.stack([values[labels == code].sum(axis=0) for code in range(len(loader._continents))])
+
+
+def test_aggregates_share_continent_totals(data_dir):
+    loader = DataLoader(data_dir)
+    aggregates = loader.get_aggregates()
+
+    assert aggregates.continent_totals is loader.get_continent_totals()
+    np.testing.assert_allclose(aggregates.continent_totals.values, _expected_continent_totals(loader))
+    np.testing.assert_allclose(aggregates.global_totals, np.nansum(loader.get_matrix().values, axis=0))
+
+
+def test_aggregates_follow_incremental_updates(data_dir):
+    loader = DataLoader(data_dir)
+    analyzer = DataAnalyzer(loader)
+    before = analyzer.calculate_regional_total('african', 2010)
+
+    loader.patch_cells({('Algeria', 2010): 1e6})
+    aggregates = loader.get_aggregates()
+
+    assert aggregates.continent_totals is loader.get_continent_totals()
+    np.testing.assert_allclose(aggregates.continent_totals.values, _expected_continent_totals(loader))
+    assert analyzer.calculate_regional_total('african', 2010) > before
+    assert analyzer.get_top_countries(2010, 1)['Country'].tolist() == ['Algeria']
+
+    loader.append_year(2024, {'China': 300000.0})
+    aggregates = loader.get_aggregates()
+    assert aggregates.years[-1] == 2024
+    np.testing.assert_allclose(aggregates.continent_totals.values, _expected_continent_totals(loader))
+
+
+@pytest.mark.parametrize('year', [1970, 2000, 2022])
+def test_top_countries_match_raw_sort(data_dir, year):
+    loader = DataLoader(data_dir)
+    df = loader.get_all_data()
+    expected = df[['Country', str(year)]].dropna().sort_values(str(year), ascending=False, kind='stable').head(10)
+
+    result = DataAnalyzer(loader).get_top_countries(year, 10)
+    assert result['Country'].tolist() == expected['Country'].tolist()
+    np.testing.assert_allclose(result[str(year)].to_numpy(), expected[str(year)].to_numpy())
+
+
+def test_sqlite_backend_ranks_through_the_index(data_dir, monkeypatch):
+    loader = DataLoader(data_dir, backend='sqlite')
+    analyzer = DataAnalyzer(loader)
+    expected = DataAnalyzer(DataLoader(data_dir)).get_top_countries(2000, 10)
+
+    def fail():
+        raise AssertionError("SQLite后端的排名不应构建预先汇总")
+
+    monkeypatch.setattr(loader, 'get_aggregates', fail)
+    pd.testing.assert_frame_equal(analyzer.get_top_countries(2000, 10), expected)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+"""
+应用状态快照的保存、加载和恢复测试
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from data.app_state import APP_STATE_FILE, load_app_state, save_app_state
+from data.data_loader import DataLoader
+
+
+def _save(loader: DataLoader, tmp_path) -> str:
+    loader.get_all_data()
+    loader.get_continent_totals()
+    state = loader.export_state()
+    assert state is not None
+
+    file_path = str(tmp_path / 'state' / APP_STATE_FILE)
+    views = {'dashboard': {'meta': {'year': 2022}, 'images': {'bar_chart': b'\x89PNG-bytes'}}}
+    save_app_state(file_path, state, views)
+    return file_path
+
+
+def test_round_trip_restores_without_parsing(data_dir, tmp_path, monkeypatch):
+    loader = DataLoader(data_dir)
+    file_path = _save(loader, tmp_path)
+
+    state = load_app_state(file_path)
+    assert state is not None
+    assert state['views']['dashboard']['meta'] == {'year': 2022}
+    assert state['views']['dashboard']['images']['bar_chart'] == b'\x89PNG-bytes'
+
+    restored = DataLoader(data_dir, use_snapshots=False)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("恢复的状态不应重新解析源文件")
+
+    monkeypatch.setattr(restored, '_read_workbook', fail)
+    assert restored.restore_state(state['data'])
+
+    assert restored.data_version == loader.data_version
+    pd.testing.assert_frame_equal(restored.get_all_data(), loader.get_all_data(), check_dtype=False)
+    for continent in ('african', 'europen'):
+        pd.testing.assert_frame_equal(restored.get_continent_data(continent),
+                                      loader.get_continent_data(continent), check_dtype=False)
+    np.testing.assert_array_equal(restored.get_continent_labels(), loader.get_continent_labels())
+    np.testing.assert_allclose(restored.get_continent_totals().values, loader.get_continent_totals().values)
+
+
+def test_restore_rejects_other_config(data_dir, tmp_path):
+    file_path = _save(DataLoader(data_dir), tmp_path)
+    state = load_app_state(file_path)
+
+    assert not DataLoader(data_dir, compact=True).restore_state(state['data'])
+    assert not DataLoader(data_dir, year_window=(2000, 2022)).restore_state(state['data'])
+
+
+def test_modified_source_reloads_after_restore(data_dir, tmp_path, edit_workbook):
+    file_path = _save(DataLoader(data_dir), tmp_path)
+
+    # 保存状态后源文件被修改，恢复的缓存项按源文件签名校验后重新加载
+    edit_workbook(os.path.join(data_dir, 'african.xlsx'), 'Algeria', 2000, 12345.0)
+
+    restored = DataLoader(data_dir)
+    assert restored.restore_state(load_app_state(file_path)['data'])
+    african = restored.get_continent_data('african')
+    assert african.loc[african['Country'] == 'Algeria', '2000'].item() == 12345.0
+
+
+def test_missing_file_returns_none(tmp_path):
+    assert load_app_state(str(tmp_path / 'missing.npz')) is None
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+"""
+异步接口的并发查询合并测试
+"""
+
+import asyncio
+import threading
+
+import pandas as pd
+
+from data.async_access import AsyncDataLoader
+
+
+class _CountingLoader:
+    """记录调用次数的数据加载器替身，查询在放行前保持阻塞"""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self.frame = pd.DataFrame({'Country': ['China', 'India'], '2000': [1.0, 2.0]})
+
+    def get_all_data(self) -> pd.DataFrame:
+        self.calls += 1
+        self.release.wait(5)
+        return self.frame
+
+    def get_country_data(self, country_name: str) -> pd.DataFrame:
+        self.calls += 1
+        self.release.wait(5)
+        return self.frame[self.frame['Country'] == country_name]
+
+
+async def _gather(loader: _CountingLoader, *coroutines):
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    # 所有调用方都进入等待后再放行查询
+    await asyncio.sleep(0)
+    loader.release.set()
+    return await asyncio.gather(*tasks)
+
+
+def test_concurrent_calls_run_once():
+    loader = _CountingLoader()
+    async_loader = AsyncDataLoader(loader)
+
+    results = asyncio.run(_gather(loader, *(async_loader.get_all_data() for _ in range(5))))
+
+    assert loader.calls == 1
+    for result in results:
+        pd.testing.assert_frame_equal(result, loader.frame)
+
+
+def test_different_arguments_are_not_coalesced():
+    loader = _CountingLoader()
+    async_loader = AsyncDataLoader(loader)
+
+    china, india = asyncio.run(_gather(loader, async_loader.get_country_data('China'),
+                                       async_loader.get_country_data('India')))
+
+    assert loader.calls == 2
+    assert china['Country'].tolist() == ['China']
+    assert india['Country'].tolist() == ['India']
+
+
+def test_coalesced_callers_get_private_copies():
+    loader = _CountingLoader()
+    async_loader = AsyncDataLoader(loader)
+
+    first, second, third = asyncio.run(_gather(loader, *(async_loader.get_all_data() for _ in range(3))))
+
+    # 发起查询的调用方与同步接口一样得到原对象，其它调用方得到副本
+    assert first is loader.frame
+    assert second is not first and third is not first and second is not third
+    second.loc[0, '2000'] = 100.0
+    assert first.loc[0, '2000'] == 1.0
+    assert third.loc[0, '2000'] == 1.0
+
+
+def test_calls_after_completion_run_again():
+    loader = _CountingLoader()
+    loader.release.set()
+    async_loader = AsyncDataLoader(loader)
+
+    async def sequential():
+        await async_loader.get_all_data()
+        await async_loader.get_all_data()
+
+    asyncio.run(sequential())
+    assert loader.calls == 2
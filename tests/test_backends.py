@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+"""
+pandas、mmap、sqlite三种存储后端的结果一致性测试
+"""
+
+import threading
+
+import pandas as pd
+import pytest
+
+from data.data_analyzer import DataAnalyzer
+from data.data_loader import DataLoader
+
+BACKENDS = ['pandas', 'mmap', 'sqlite']
+
+
+@pytest.fixture
+def analyzers(data_dir):
+    return {backend: DataAnalyzer(DataLoader(data_dir, backend=backend)) for backend in BACKENDS}
+
+
+def test_merged_data_matches(analyzers):
+    # mmap和sqlite数据文件只保存国家列和年份列，不含Excel中多出的空白列
+    loader = analyzers['pandas'].data_loader
+    columns = ['Country'] + [str(year) for year in loader.get_years_list()]
+    expected = loader.get_all_data()[columns]
+    for backend in ('mmap', 'sqlite'):
+        pd.testing.assert_frame_equal(analyzers[backend].data_loader.get_all_data()[columns], expected)
+
+
+@pytest.mark.parametrize('year', [1960, 1990, 2022])
+def test_top_countries_match(analyzers, year):
+    expected = analyzers['pandas'].get_top_countries(year, 10)
+    for backend in ('mmap', 'sqlite'):
+        pd.testing.assert_frame_equal(analyzers[backend].get_top_countries(year, 10), expected)
+
+
+def test_queries_match(analyzers):
+    expected = analyzers['pandas']
+    for backend in ('mmap', 'sqlite'):
+        analyzer = analyzers[backend]
+        pd.testing.assert_frame_equal(
+            analyzer.compare_countries(['China', 'India', 'France'], [1990, 2000, 2020]),
+            expected.compare_countries(['China', 'India', 'France'], [1990, 2000, 2020])
+        )
+        pd.testing.assert_frame_equal(
+            analyzer.data_loader.get_data_by_year_range(1995, 2005),
+            expected.data_loader.get_data_by_year_range(1995, 2005)
+        )
+        pd.testing.assert_frame_equal(analyzer.calculate_global_trend(1960, 2022),
+                                      expected.calculate_global_trend(1960, 2022))
+
+
+def test_sqlite_store_concurrent_queries(data_dir):
+    loader = DataLoader(data_dir, backend='sqlite')
+    store = loader.get_sqlite_store()
+    expected = store.top_countries(2000, 10)
+
+    results = []
+    errors = []
+
+    def query():
+        try:
+            for _ in range(20):
+                results.append(store.top_countries(2000, 10))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=query) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(results) == 160
+    for result in results:
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_reload_keeps_old_sqlite_store_usable(data_dir):
+    loader = DataLoader(data_dir, backend='sqlite')
+    old_store = loader.get_sqlite_store()
+    expected = old_store.top_countries(2010, 5)
+
+    loader.patch_cells({('China', 2010): 1.0})
+    loader.reload_files(loader.get_watched_files())
+    loader.get_all_data()
+
+    pd.testing.assert_frame_equal(old_store.top_countries(2010, 5), expected)
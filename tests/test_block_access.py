@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""
+按国家和年份范围批量取数测试（get_block与get_countries_data）
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.data_loader import DataLoader
+
+COUNTRIES = ['India', 'Atlantis', 'China', 'France', 'India']
+
+
+@pytest.fixture
+def loader(data_dir):
+    return DataLoader(data_dir)
+
+
+def test_get_block_matches_get_countries_data(loader):
+    block = loader.get_block(COUNTRIES, 1990, 2000)
+    rows = loader.get_countries_data(COUNTRIES)
+
+    # 不存在的国家被跳过，重复的名称只保留一列，其余按输入顺序排列
+    assert list(block.columns) == ['Year', 'India', 'China', 'France']
+    assert block['Year'].tolist() == list(range(1990, 2001))
+
+    year_cols = [str(year) for year in range(1990, 2001)]
+    for country in ['India', 'China', 'France']:
+        expected = rows.loc[rows['Country'] == country, year_cols].to_numpy(dtype=np.float64)[0]
+        np.testing.assert_array_equal(block[country].to_numpy(), expected)
+
+
+def test_get_countries_data_keeps_data_order(loader):
+    rows = loader.get_countries_data(COUNTRIES)
+    all_data = loader.get_all_data()
+
+    # 行按数据中的位置排列，与按名称筛选原数据的结果一致
+    expected = all_data[all_data['Country'].isin(COUNTRIES)]
+    pd.testing.assert_frame_equal(rows, expected)
+    assert sorted(rows['Country']) == ['China', 'France', 'India']
+
+
+def test_get_block_fills_years_outside_the_data(loader):
+    block = loader.get_block(['China'], 2020, 2026)
+
+    assert block['Year'].tolist() == list(range(2020, 2027))
+    assert not np.isnan(block['China'].iloc[:4]).any()
+    assert np.isnan(block['China'].iloc[4:]).all()
+
+    with pytest.raises(ValueError):
+        loader.get_block(['China'], 2030, 2035)
+
+
+def test_get_block_returns_a_copy(loader):
+    block = loader.get_block(['China'], 2000, 2001)
+    block.loc[0, 'China'] = -1.0
+
+    assert loader.get_block(['China'], 2000, 2001).loc[0, 'China'] != -1.0
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+"""
+数据缓存按源文件签名校验的测试
+"""
+
+import os
+
+import pytest
+
+from data.data_loader import DataLoader
+
+
+@pytest.fixture
+def counted(data_dir, monkeypatch):
+    """返回数据加载器和记录源文件读取、内容哈希次数的字典"""
+    loader = DataLoader(data_dir)
+    calls = {'read': 0, 'digest': 0}
+
+    read_source = loader._read_source
+    file_digest = loader._file_digest
+
+    def counting_read(*args, **kwargs):
+        calls['read'] += 1
+        return read_source(*args, **kwargs)
+
+    def counting_digest(*args, **kwargs):
+        calls['digest'] += 1
+        return file_digest(*args, **kwargs)
+
+    monkeypatch.setattr(loader, '_read_source', counting_read)
+    monkeypatch.setattr(loader, '_file_digest', counting_digest)
+    return loader, calls
+
+
+def _touch(file_path: str):
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+
+def test_unchanged_files_use_the_cache(counted):
+    loader, calls = counted
+    df = loader.get_all_data()
+    reads, digests = calls['read'], calls['digest']
+
+    assert loader.get_all_data() is df
+    # mtime和size一致时不重新计算内容哈希
+    assert (calls['read'], calls['digest']) == (reads, digests)
+
+
+def test_touched_file_is_verified_by_content_hash(counted, data_dir):
+    loader, calls = counted
+    df = loader.get_continent_data('african')
+    version = loader.data_version
+    reads, digests = calls['read'], calls['digest']
+
+    _touch(os.path.join(data_dir, 'african.xlsx'))
+
+    assert loader.get_continent_data('african') is df
+    assert calls['read'] == reads
+    assert calls['digest'] == digests + 1
+    assert loader.data_version == version
+
+    # 哈希一致后记录新的mtime，之后不再重复计算
+    loader.get_continent_data('african')
+    assert calls['digest'] == digests + 1
+
+
+def test_changed_content_is_reloaded(counted, data_dir, edit_workbook):
+    loader, calls = counted
+    df = loader.get_continent_data('african')
+    reads = calls['read']
+
+    edit_workbook(os.path.join(data_dir, 'african.xlsx'), 'Algeria', 2000, 12345.0)
+
+    reloaded = loader.get_continent_data('african')
+    assert reloaded is not df
+    assert calls['read'] == reads + 1
+    assert reloaded.loc[reloaded['Country'] == 'Algeria', '2000'].item() == 12345.0
+    # 派生的军费矩阵随数据版本重建
+    matrix = loader.get_matrix('african')
+    assert matrix.values[matrix.row_of('Algeria'), matrix.col_of(2000)] == 12345.0
+
+
+def test_snapshot_survives_a_new_loader(data_dir, monkeypatch):
+    expected = DataLoader(data_dir).get_all_data()
+
+    # 第二个加载器从快照恢复，不解析Excel文件
+    loader = DataLoader(data_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("快照有效时不应解析Excel文件")
+
+    monkeypatch.setattr(loader, '_read_workbook', fail)
+    assert loader.get_all_data().equals(expected)
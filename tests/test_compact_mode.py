@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+"""
+紧凑存储模式测试
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.data_loader import DataLoader
+
+
+def _year_columns(df: pd.DataFrame):
+    return [col for col in df.columns[1:] if col.isdigit()]
+
+
+def _shares(df: pd.DataFrame, matrix) -> bool:
+    return np.shares_memory(df[str(matrix.years[0])].to_numpy(), matrix.values)
+
+
+def test_compact_dtypes_and_values(data_dir):
+    full = DataLoader(data_dir).get_all_data()
+    loader = DataLoader(data_dir, compact=True)
+    df = loader.get_all_data()
+    matrix = loader.get_matrix()
+
+    assert isinstance(df['Country'].dtype, pd.CategoricalDtype)
+    assert set(df[_year_columns(df)].dtypes) == {np.dtype(np.float32)}
+    assert matrix.values.dtype == np.float32
+    assert df['Country'].astype(str).tolist() == full['Country'].tolist()
+    np.testing.assert_allclose(df[_year_columns(df)].to_numpy(dtype=np.float64),
+                               full[_year_columns(full)].to_numpy(dtype=np.float64), rtol=1e-6)
+
+
+def test_compact_frame_is_a_view_over_the_matrix(data_dir):
+    loader = DataLoader(data_dir, compact=True)
+    for continent in (None, 'african'):
+        df = loader.get_all_data() if continent is None else loader.get_continent_data(continent)
+        assert _shares(df, loader.get_matrix(continent))
+
+    # 矩阵被淘汰后重建，缓存中的DataFrame随之替换，仍只保存一份数值
+    loader._matrix_cache.pop('all')
+    matrix = loader.get_matrix()
+    assert _shares(loader.get_all_data(), matrix)
+
+
+def test_compact_edits_keep_a_single_copy(data_dir):
+    loader = DataLoader(data_dir, compact=True)
+    before = loader.get_all_data()
+    old_value = before.loc[before['Country'] == 'China', '2010'].item()
+
+    loader.patch_cells({('China', 2010): 1.0})
+    after = loader.get_all_data()
+
+    assert _shares(after, loader.get_matrix())
+    assert after.loc[after['Country'] == 'China', '2010'].item() == 1.0
+    assert before.loc[before['Country'] == 'China', '2010'].item() == old_value
+
+
+@pytest.mark.parametrize('continent', [None, 'african'])
+def test_memory_report_shows_compact_below_default(data_dir, continent):
+    reports = {}
+    for compact in (False, True):
+        loader = DataLoader(data_dir, compact=compact)
+        loader.get_matrix(continent)
+        reports[compact] = loader.memory_report()
+
+    key = 'all' if continent is None else continent
+    for report in reports.values():
+        assert f"data:{key}" in report and f"matrix:{key}" in report
+    # 紧凑模式下数值只计入DataFrame一次，矩阵只剩缺失值位图和来源标记
+    assert reports[True][f"matrix:{key}"] < reports[True][f"data:{key}"] / 4
+    assert sum(reports[True].values()) < sum(reports[False].values()) / 2
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+"""
+并发加载测试：同一缓存键的并发请求只加载一次
+"""
+
+import threading
+import time
+
+import pandas as pd
+
+from data.data_loader import DataLoader
+
+
+def _count_reads(loader: DataLoader, monkeypatch, delay: float = 0.0) -> dict:
+    calls = {'read': 0}
+    read_source = loader._read_source
+    lock = threading.Lock()
+
+    def counting_read(*args, **kwargs):
+        with lock:
+            calls['read'] += 1
+        # 放慢解析，让其它线程在加载期间到达
+        time.sleep(delay)
+        return read_source(*args, **kwargs)
+
+    monkeypatch.setattr(loader, '_read_source', counting_read)
+    return calls
+
+
+def _run_concurrently(func, count: int = 8) -> list:
+    barrier = threading.Barrier(count)
+    results = [None] * count
+    errors = []
+
+    def worker(i):
+        try:
+            barrier.wait(5)
+            results[i] = func()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    return results
+
+
+def test_concurrent_loads_parse_once(data_dir, monkeypatch):
+    reference = DataLoader(data_dir, use_snapshots=False)
+    expected_calls = _count_reads(reference, monkeypatch)
+    expected = reference.get_all_data()
+
+    loader = DataLoader(data_dir, use_snapshots=False)
+    calls = _count_reads(loader, monkeypatch, delay=0.05)
+    results = _run_concurrently(loader.get_all_data)
+
+    assert calls['read'] == expected_calls['read']
+    # 所有调用方得到同一个缓存对象
+    assert all(result is results[0] for result in results)
+    pd.testing.assert_frame_equal(results[0], expected)
+
+
+def test_concurrent_derived_data_is_built_once(data_dir, monkeypatch):
+    loader = DataLoader(data_dir)
+    loader.get_all_data()
+    calls = _count_reads(loader, monkeypatch, delay=0.05)
+
+    totals = _run_concurrently(loader.get_continent_totals)
+    aggregates = _run_concurrently(loader.get_aggregates)
+
+    assert all(result is totals[0] for result in totals)
+    assert all(result is aggregates[0] for result in aggregates)
+    # 每个大洲文件只加载一次
+    assert calls['read'] == 5
+
+
+def test_concurrent_continents_load_independently(data_dir, monkeypatch):
+    loader = DataLoader(data_dir, use_snapshots=False)
+    calls = _count_reads(loader, monkeypatch, delay=0.05)
+    continents = ['african', 'american', 'aisan', 'europen', 'easternasian'] * 2
+
+    barrier = threading.Barrier(len(continents))
+    frames = {}
+
+    def load(continent):
+        barrier.wait(5)
+        frames.setdefault(continent, []).append(loader.get_continent_data(continent))
+
+    threads = [threading.Thread(target=load, args=(continent,)) for continent in continents]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls['read'] == 5
+    for continent, loaded in frames.items():
+        assert len(loaded) == 2 and loaded[0] is loaded[1]
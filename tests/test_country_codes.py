@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+"""
+国家名称到ISO-3代码索引测试
+"""
+
+import importlib.util
+import json
+import os
+
+import pytest
+
+from conftest import ROOT_DIR
+from data.country_codes import country_iso3, iso3_codes, normalize_country_name
+from data.data_loader import DataLoader
+
+# script/country_metadata.py改为复用代码表之前手写的映射，其结果必须保持不变
+_PREVIOUS_SCRIPT_CODES = {
+    'United States': 'USA', 'China': 'CHN', 'Russia': 'RUS', 'United Kingdom': 'GBR', 'UK': 'GBR',
+    'India': 'IND', 'France': 'FRA', 'Germany': 'DEU', 'Japan': 'JPN', 'South Korea': 'KOR',
+    'Korea, South': 'KOR', 'North Korea': 'PRK', 'Korea, North': 'PRK', 'Italy': 'ITA', 'Brazil': 'BRA',
+    'Canada': 'CAN', 'Australia': 'AUS', 'Spain': 'ESP', 'Turkey': 'TUR', 'Israel': 'ISR', 'Iran': 'IRN',
+    'Indonesia': 'IDN', 'Pakistan': 'PAK', 'Saudi Arabia': 'SAU', 'Poland': 'POL', 'Ukraine': 'UKR',
+    'Egypt': 'EGY', 'Thailand': 'THA', 'Colombia': 'COL', 'Mexico': 'MEX', 'Malaysia': 'MYS',
+    'Netherlands': 'NLD', 'Argentina': 'ARG', 'Sweden': 'SWE', 'Switzerland': 'CHE', 'Belgium': 'BEL',
+    'Norway': 'NOR', 'Vietnam': 'VNM', 'Portugal': 'PRT', 'Romania': 'ROU', 'Bangladesh': 'BGD',
+    'Greece': 'GRC', 'Czech Republic': 'CZE', 'Denmark': 'DNK', 'Finland': 'FIN', 'Austria': 'AUT',
+    'New Zealand': 'NZL', 'Singapore': 'SGP', 'South Africa': 'ZAF', 'Algeria': 'DZA', 'Chile': 'CHL',
+    'Hungary': 'HUN', 'Iraq': 'IRQ', 'Peru': 'PER', 'Philippines': 'PHL', 'Kazakhstan': 'KAZ',
+    'Morocco': 'MAR'
+}
+
+
+@pytest.mark.parametrize('name, code', [
+    ('United States of America', 'USA'),
+    ('United States', 'USA'),
+    ("Côte d'Ivoire", 'CIV'),
+    ("Cote d'Ivoire", 'CIV'),
+    ('Ivory Coast', 'CIV'),
+    ('Congo, DR', 'COD'),
+    ('DR Congo', 'COD'),
+    ('Congo, Republic', 'COG'),
+    ('Korea, South*', 'KOR'),
+    ('Türkiye', 'TUR'),
+    ('Sao Tome & Principe', 'STP'),
+])
+def test_aliases_resolve_to_the_same_code(name, code):
+    assert country_iso3(name) == code
+
+
+@pytest.mark.parametrize('name', ['USSR', 'Yugoslavia', 'German Democratic Republic', 'Czechoslovakia',
+                                  'Yemen, North', 'European Union', 'Middle East', 'Atlantis'])
+def test_defunct_states_and_regions_have_no_code(name):
+    assert country_iso3(name) is None
+
+
+def test_normalized_keys():
+    assert normalize_country_name('Korea, South*') == normalize_country_name('South Korea')
+    assert normalize_country_name("Côte d'Ivoire") == normalize_country_name("COTE D'IVOIRE")
+    assert iso3_codes(['China', 'USSR']).tolist() == ['CHN', None]
+
+
+def test_loaded_countries_have_codes(data_dir):
+    matrix = DataLoader(data_dir).get_matrix()
+    codes = dict(zip(matrix.countries, matrix.iso3))
+
+    assert codes['United States of America'] == 'USA'
+    assert codes["Cote d'Ivoire"] == 'CIV'
+    assert codes['Congo, DR'] == 'COD'
+    assert codes['USSR'] is None
+    assert sum(code is not None for code in codes.values()) > 150
+
+
+def _load_script():
+    file_path = os.path.join(ROOT_DIR, 'script', 'country_metadata.py')
+    spec = importlib.util.spec_from_file_location('country_metadata', file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_metadata_script_keeps_previous_codes():
+    codes = _load_script().generate_country_codes()
+
+    for name, code in _PREVIOUS_SCRIPT_CODES.items():
+        assert codes[name] == code, name
+
+
+def test_metadata_json_matches_the_shared_index():
+    with open(os.path.join(ROOT_DIR, 'web', 'public', 'data', 'country_metadata.json'), encoding='utf-8') as f:
+        metadata = json.load(f)
+
+    for country, entry in metadata.items():
+        assert entry['iso_code'] == (country_iso3(country) or ''), country
+        if country in _PREVIOUS_SCRIPT_CODES:
+            assert entry['iso_code'] == _PREVIOUS_SCRIPT_CODES[country], country
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+"""
+国家人口与贸易数据测试：分号分隔CSV的解析、按国家名称的连接和派生指标
+"""
+
+import numpy as np
+import pytest
+
+from data.country_stats import align_country_stats, derive_country_metrics, read_country_stats
+from data.data_loader import DataLoader
+from data.milex_matrix import MilexMatrix
+
+_PRIMARY = (
+    'Country;US 2024 Deficit;US 2024 Exports;US 2024 Imports (Customs Basis);'
+    'Trump Tariffs Alleged;Trump Response;Population\n'
+    'Algeria;-1,447.10;1,014.50;2,461.60;59%;29%;46164219\n'
+    'Korea, South*;-66,007.3;65,542.4;131,549.7;50%;25%;51712619\n'
+    'Anguilla;71.3;72.5;1.2;10%;10%;\n'
+    ';1;1;1;1%;1%;1\n'
+)
+# 没有人口列的文件：与第一个文件重复的国家取第一个文件的值
+_SECONDARY = (
+    'Country;US 2024 Deficit;US 2024 Exports;US 2024 Imports (Customs Basis);'
+    'Trump Tariffs Alleged;Trump Response\n'
+    'China;-295,401.6;143,545.7;438,947.4;67%;34%\n'
+    'Algeria;0;0;0;0%;0%\n'
+)
+
+
+@pytest.fixture
+def stats_files(tmp_path):
+    primary = tmp_path / 'primary.csv'
+    secondary = tmp_path / 'secondary.csv'
+    primary.write_text(_PRIMARY, encoding='utf-8-sig')
+    secondary.write_text(_SECONDARY, encoding='utf-8')
+    return [str(primary), str(tmp_path / 'missing.csv'), str(secondary)]
+
+
+def test_read_country_stats_parses_semicolon_csv(stats_files):
+    stats = read_country_stats(stats_files)
+
+    # 名称为空的行被删除，不存在的文件被跳过
+    assert stats['Country'].tolist() == ['Algeria', 'Korea, South*', 'Anguilla', 'China']
+    assert stats['key'].tolist()[1] == 'korea south'
+
+    algeria = stats.iloc[0]
+    # 千位分隔符被去除，百分数转为比例
+    assert algeria['us_trade_balance'] == -1447.1
+    assert algeria['us_exports'] == 1014.5
+    assert algeria['us_imports'] == 2461.6
+    assert algeria['tariff_alleged'] == pytest.approx(0.59)
+    assert algeria['tariff_response'] == pytest.approx(0.29)
+    assert algeria['population'] == 46164219
+
+    # 空单元格和文件中缺少的列为NaN
+    assert np.isnan(stats.loc[2, 'population'])
+    assert np.isnan(stats.loc[3, 'population'])
+    assert stats.loc[3, 'us_imports'] == 438947.4
+
+
+def test_read_country_stats_without_files(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        read_country_stats([str(tmp_path / 'missing.csv')])
+
+
+def test_align_country_stats_joins_by_normalized_name(stats_files):
+    stats = read_country_stats(stats_files)
+    countries = ['South Korea', 'Atlantis', 'Algeria', 'China']
+
+    aligned = align_country_stats(countries, stats)
+
+    # 按给定国家轴的顺序逐行对齐，别名和脚注标记不影响匹配
+    assert aligned['Country'].tolist() == countries
+    assert aligned['population'].tolist()[0] == 51712619
+    assert aligned['us_exports'].tolist()[2] == 1014.5
+    assert aligned['us_exports'].tolist()[3] == 143545.7
+    # 未匹配的国家各列为NaN
+    assert aligned.iloc[1, 1:].isna().all()
+
+
+def test_derive_country_metrics(stats_files):
+    aligned = align_country_stats(['Algeria', 'Atlantis', 'China'], read_country_stats(stats_files))
+    matrix = MilexMatrix(['Algeria', 'Atlantis', 'China'], [2020, 2021],
+                         np.array([[9708.3, 9112.0], [5.0, 6.0], [257973.4, 285930.5]]))
+
+    metrics = derive_country_metrics(matrix, aligned)
+
+    # 军费单位为百万美元，人均军费（美元）= 军费 / (人口 / 1e6)
+    per_capita = metrics['milex_per_capita']
+    assert per_capita.years == [2020, 2021]
+    np.testing.assert_allclose(per_capita.values[0], [9708.3 / 46.164219, 9112.0 / 46.164219])
+    assert per_capita.values[0, 0] == pytest.approx(210.30, abs=0.01)
+    # 未匹配的国家和人口缺失的国家为NaN
+    assert np.isnan(per_capita.values[1]).all()
+    assert np.isnan(per_capita.values[2]).all()
+
+    np.testing.assert_allclose(metrics['milex_to_us_exports'].values[0], [9708.3 / 1014.5, 9112.0 / 1014.5])
+    np.testing.assert_allclose(metrics['milex_to_us_imports'].values[2, 0], 257973.4 / 438947.4)
+    np.testing.assert_allclose(metrics['milex_to_us_trade'].values[2, 0], 257973.4 / (143545.7 + 438947.4))
+    assert np.isnan(metrics['milex_to_us_trade'].values[1]).all()
+
+
+def test_loader_aligns_country_stats_to_the_matrix(data_dir):
+    loader = DataLoader(data_dir)
+    matrix = loader.get_matrix()
+    aligned = loader.get_country_stats()
+    per_capita = loader.get_country_metric_store().matrix('milex_per_capita')
+
+    assert aligned['Country'].tolist() == matrix.countries
+    assert aligned['population'].notna().sum() > 100
+
+    row = matrix.row_of('China')
+    population = aligned.loc[row, 'population']
+    assert per_capita.values[row, per_capita.col_of(2020)] == pytest.approx(
+        matrix.values[row, matrix.col_of(2020)] / (population / 1e6))
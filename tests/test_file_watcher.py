@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+"""
+源文件监视测试：每个测试分别在inotify模式和强制轮询模式下运行
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from data.data_loader import DataLoader
+from data.file_watcher import FileWatcher, _load_inotify
+
+INTERVAL = 0.05
+DEBOUNCE = 0.3
+
+
+@pytest.fixture(params=['inotify', 'polling'])
+def mode(request):
+    if request.param == 'inotify' and _load_inotify() is None:
+        pytest.skip('当前平台不支持inotify')
+    return request.param
+
+
+class Recorder:
+    """记录监视器回调的参数（回调在监视线程中执行）"""
+
+    def __init__(self, handler=None):
+        self.handler = handler
+        self.calls = []
+        self.results = []
+        self.called = threading.Event()
+
+    def __call__(self, paths):
+        self.calls.append(paths)
+        if self.handler is not None:
+            self.results.append(self.handler(paths))
+        self.called.set()
+
+    def wait(self, timeout: float = 5.0):
+        assert self.called.wait(timeout), '未收到文件变化回调'
+        self.called.clear()
+
+
+@pytest.fixture
+def watch(mode):
+    """返回启动监视器的函数：watch(文件路径列表, 回调)，测试结束时停止所有监视器"""
+    watchers = []
+
+    def start(paths, on_change):
+        watcher = FileWatcher(lambda: paths, on_change, interval=INTERVAL, debounce=DEBOUNCE,
+                              use_inotify=(mode == 'inotify'))
+        watcher.start()
+        assert watcher.mode == mode
+        watchers.append(watcher)
+        return watcher
+
+    yield start
+    for watcher in watchers:
+        watcher.stop()
+
+
+@pytest.fixture
+def source(tmp_path):
+    file_path = tmp_path / 'data.xlsx'
+    file_path.write_bytes(b'original')
+    return str(file_path)
+
+
+def test_touched_file_is_reported(watch, source):
+    recorder = Recorder()
+    watch([source], recorder)
+
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+    recorder.wait()
+    assert recorder.calls == [[source]]
+
+
+def test_resized_file_is_reported(watch, source, tmp_path):
+    other = tmp_path / 'other.xlsx'
+    other.write_bytes(b'other')
+    recorder = Recorder()
+    watch([source, str(other)], recorder)
+
+    with open(source, 'ab') as f:
+        f.write(b' and more')
+    # 不在监视列表中的文件被忽略
+    (tmp_path / 'unwatched.xlsx').write_bytes(b'x')
+
+    recorder.wait()
+    assert recorder.calls == [[source]]
+
+
+def test_writes_within_debounce_are_reported_once(watch, source):
+    recorder = Recorder()
+    watch([source], recorder)
+
+    started = time.monotonic()
+    for i in range(5):
+        with open(source, 'ab') as f:
+            f.write(b'%d' % i)
+        time.sleep(DEBOUNCE / 5)
+
+    recorder.wait()
+    # 最后一次写入之后等待debounce时间才回调
+    assert time.monotonic() - started >= DEBOUNCE
+    time.sleep(DEBOUNCE * 2)
+    assert recorder.calls == [[source]]
+
+
+def test_stop_joins_the_thread(watch, source):
+    recorder = Recorder()
+    watcher = watch([source], recorder)
+    thread = watcher._thread
+
+    watcher.stop()
+
+    assert not thread.is_alive()
+    assert watcher._thread is None
+    assert watcher.mode == 'polling'
+    with open(source, 'ab') as f:
+        f.write(b' after stop')
+    time.sleep(DEBOUNCE * 2)
+    assert recorder.calls == []
+
+    # 停止后可以重新启动
+    watcher.start()
+    with open(source, 'ab') as f:
+        f.write(b' restarted')
+    recorder.wait()
+    assert recorder.calls == [[source]]
+
+
+def test_reload_only_touches_the_changed_file(watch, data_dir, edit_workbook):
+    loader = DataLoader(data_dir)
+    all_data = loader.get_all_data()
+    european = loader.get_continent_data('europen')
+    african = loader.get_continent_data('african')
+    loader.get_continent_totals()
+    snapshots = {name: os.stat(os.path.join(loader.snapshot_dir, name)).st_mtime_ns
+                 for name in os.listdir(loader.snapshot_dir)}
+
+    recorder = Recorder(loader.reload_files)
+    watch(loader.get_source_files(), recorder)
+    african_path = os.path.join(data_dir, 'african.xlsx')
+    edit_workbook(african_path, 'Algeria', 2000, 12345.0)
+
+    recorder.wait()
+    assert recorder.calls == [[african_path]]
+    assert recorder.results == [['african']]
+
+    # 只有变化的文件被重新解析，其它数据仍是原来的对象
+    assert loader.get_all_data() is all_data
+    assert loader.get_continent_data('europen') is european
+    reloaded = loader.get_continent_data('african')
+    assert reloaded is not african
+    assert reloaded.loc[reloaded['Country'] == 'Algeria', '2000'].item() == 12345.0
+
+    # 只有变化文件的快照被重写
+    changed = {name for name, mtime in snapshots.items()
+               if os.stat(os.path.join(loader.snapshot_dir, name)).st_mtime_ns != mtime}
+    assert changed == {'african.npz'}
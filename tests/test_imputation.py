@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+"""
+缺失值插补策略测试
+"""
+
+import numpy as np
+import pytest
+
+from data.data_loader import DataLoader
+from data.imputation import Imputer, forward_fill, linear, register_strategy, window_mean, IMPUTATION_STRATEGIES
+from data.milex_matrix import MilexMatrix, OBSERVED, MISSING_ELLIPSIS, MISSING_XX, MISSING_OTHER, IMPUTED
+
+nan = np.nan
+
+
+def test_forward_fill():
+    values = np.array([[nan, 1.0, nan, nan, 4.0, nan]])
+    np.testing.assert_array_equal(forward_fill(values), [[nan, 1.0, 1.0, 1.0, 4.0, 4.0]])
+
+
+def test_window_mean_excludes_the_cell_itself():
+    values = np.array([[1.0, 2.0, 3.0, nan, nan, nan, 9.0]])
+    result = window_mean(values, window=2)
+    np.testing.assert_allclose(result, [[nan, 1.0, 1.5, 2.5, 3.0, nan, nan]])
+
+
+def test_linear_interpolates_between_records():
+    values = np.array([[nan, 1.0, nan, nan, 4.0, nan],
+                       [2.0, nan, 6.0, 6.0, nan, nan]])
+    np.testing.assert_allclose(linear(values), [[nan, 1.0, 2.0, 3.0, 4.0, nan],
+                                                [2.0, 4.0, 6.0, 6.0, nan, nan]])
+
+
+def _matrix():
+    values = np.array([[10.0, nan, nan, 40.0],
+                       [1.0, nan, 3.0, nan]])
+    provenance = np.array([[OBSERVED, MISSING_ELLIPSIS, MISSING_XX, OBSERVED],
+                           [OBSERVED, MISSING_OTHER, OBSERVED, MISSING_XX]], dtype=np.uint8)
+    return MilexMatrix(['A', 'B'], [2000, 2001, 2002, 2003], values, provenance=provenance)
+
+
+def test_imputer_chooses_strategy_by_missing_kind():
+    matrix = _matrix()
+    imputed = Imputer().apply(matrix)
+
+    # "..."取此前窗口均值，"xx"沿用前一年的记录，"other"保持缺失
+    np.testing.assert_allclose(imputed.values, [[10.0, 10.0, 10.0, 40.0],
+                                                [1.0, nan, 3.0, 3.0]])
+    np.testing.assert_array_equal(imputed.provenance, [
+        [OBSERVED, MISSING_ELLIPSIS | IMPUTED, MISSING_XX | IMPUTED, OBSERVED],
+        [OBSERVED, MISSING_OTHER, OBSERVED, MISSING_XX | IMPUTED]
+    ])
+    # 原矩阵不变
+    assert np.isnan(matrix.values[0, 1])
+    assert matrix.provenance[0, 1] == MISSING_ELLIPSIS
+
+
+def test_imputed_values_do_not_feed_each_other():
+    imputed = Imputer({'...': 'linear', 'xx': 'linear', 'other': 'linear'}).apply(_matrix())
+    np.testing.assert_allclose(imputed.values, [[10.0, 20.0, 30.0, 40.0],
+                                                [1.0, 2.0, 3.0, nan]])
+
+
+def test_register_strategy():
+    register_strategy('zero', lambda values, window: np.zeros_like(values))
+    try:
+        imputed = Imputer({'other': 'zero'}).apply(_matrix())
+        assert imputed.values[1, 1] == 0.0
+        assert Imputer({'other': 'zero'}).key.startswith('other=zero#')
+        assert Imputer().key == '...=window_mean,xx=ffill;window=5'
+    finally:
+        del IMPUTATION_STRATEGIES['zero']
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        Imputer({'unknown': 'ffill'})
+    with pytest.raises(ValueError):
+        Imputer({'xx': 'unknown'})
+    with pytest.raises(ValueError):
+        Imputer(window=0)
+
+
+def test_loader_caches_imputed_matrix(data_dir):
+    loader = DataLoader(data_dir)
+    imputed = loader.get_imputed_matrix()
+
+    assert imputed is loader.get_imputed_matrix()
+    assert imputed is not loader.get_imputed_matrix(imputer=Imputer(window=3))
+    observed = (loader.get_matrix().provenance == OBSERVED)
+    np.testing.assert_array_equal(imputed.values[observed], loader.get_matrix().values[observed])
+
+
+def test_reregistered_strategy_is_not_served_from_cache(data_dir):
+    loader = DataLoader(data_dir)
+    register_strategy('constant', lambda values, window: np.full_like(values, 1.0))
+    try:
+        imputer = Imputer({'...': 'constant', 'xx': 'constant', 'other': 'constant'})
+        first = loader.get_imputed_matrix(imputer=imputer)
+        assert loader.get_imputed_matrix(imputer=imputer) is first
+
+        # 同名策略换成新函数后，同一插补器不再命中旧的缓存结果
+        register_strategy('constant', lambda values, window: np.full_like(values, 2.0))
+        second = loader.get_imputed_matrix(imputer=imputer)
+        imputed = (second.provenance & IMPUTED) != 0
+        assert imputed.any()
+        assert np.all(first.values[imputed] == 1.0)
+        assert np.all(second.values[imputed] == 2.0)
+    finally:
+        del IMPUTATION_STRATEGIES['constant']
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+"""
+append_year和patch_cells增量更新测试
+"""
+
+import numpy as np
+import pytest
+
+from data.data_analyzer import DataAnalyzer
+from data.data_loader import DataLoader
+from data.milex_matrix import IMPUTED, MISSING_OTHER, OBSERVED
+
+
+def _value(df, country, year):
+    return df.loc[df['Country'] == country, str(year)].item()
+
+
+def test_append_year_requires_the_next_year(data_dir):
+    loader = DataLoader(data_dir)
+    version = loader.data_version
+
+    with pytest.raises(ValueError):
+        loader.append_year(2026, {'China': 1.0})
+    with pytest.raises(ValueError):
+        loader.append_year(2023, {'China': 1.0})
+    with pytest.raises(ValueError):
+        loader.append_year(2024, {'Atlantis': 1.0})
+    assert loader.data_version == version
+
+
+def test_append_year_updates_every_dataset(data_dir):
+    loader = DataLoader(data_dir)
+    analyzer = DataAnalyzer(loader)
+    version = loader.data_version
+
+    new_version = loader.append_year(2024, {'China': 300000.0, 'Algeria': 10000.0})
+
+    assert new_version == loader.data_version != version
+    assert loader.get_years_list()[-1] == 2024
+    assert _value(loader.get_all_data(), 'China', 2024) == 300000.0
+    assert np.isnan(_value(loader.get_all_data(), 'France', 2024))
+    assert _value(loader.get_continent_data('african'), 'Algeria', 2024) == 10000.0
+
+    matrix = loader.get_matrix()
+    assert matrix.provenance[matrix.row_of('China'), -1] == OBSERVED
+    assert matrix.provenance[matrix.row_of('France'), -1] == MISSING_OTHER
+    assert analyzer.calculate_regional_total('african', 2024) == 10000.0
+    assert analyzer.get_top_countries(2024, 1)['Country'].tolist() == ['China']
+
+
+def test_patch_cells_is_copy_on_write(data_dir):
+    loader = DataLoader(data_dir)
+    before = loader.get_all_data()
+    old_value = _value(before, 'China', 2010)
+    version = loader.data_version
+
+    loader.patch_cells({('China', 2010): 1.0, ('France', 2011): None})
+
+    after = loader.get_all_data()
+    assert loader.data_version != version
+    assert _value(after, 'China', 2010) == 1.0
+    assert np.isnan(_value(after, 'France', 2011))
+    # 已返回的数据保持修改前的内容
+    assert _value(before, 'China', 2010) == old_value
+
+    matrix = loader.get_matrix()
+    assert matrix.provenance[matrix.row_of('France'), matrix.col_of(2011)] == MISSING_OTHER
+    assert not (matrix.provenance & IMPUTED).any()
+
+
+def test_patch_cells_validates_before_changing(data_dir):
+    loader = DataLoader(data_dir)
+    version = loader.data_version
+
+    with pytest.raises(ValueError):
+        loader.patch_cells({('China', 2010): 1.0, ('Atlantis', 2010): 1.0})
+    with pytest.raises(ValueError):
+        loader.patch_cells({('China', 1900): 1.0})
+    assert loader.data_version == version
+    assert loader.patch_cells({}) == version
+
+
+def test_versions_are_derived_from_the_changes(data_dir):
+    first, second = DataLoader(data_dir), DataLoader(data_dir)
+    assert first.data_version == second.data_version
+
+    assert first.patch_cells({('China', 2010): 1.0}) == second.patch_cells({('China', 2010): 1.0})
+    assert first.patch_cells({('China', 2011): 2.0}) != second.patch_cells({('China', 2011): 3.0})
+
+
+def test_continent_totals_are_updated_incrementally(data_dir):
+    loader = DataLoader(data_dir)
+    totals = loader.get_continent_totals().values.copy()
+    algeria = _value(loader.get_all_data(), 'Algeria', 2010)
+
+    loader.patch_cells({('Algeria', 2010): algeria + 500.0})
+
+    col = 2010 - 1948
+    updated = loader.get_continent_totals().values
+    assert updated[0, col] == pytest.approx(totals[0, col] + 500.0)
+    np.testing.assert_array_equal(np.delete(updated, col, axis=1), np.delete(totals, col, axis=1))
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+"""
+数据清洗步骤和JSON数据来源测试
+"""
+
+import os
+import shutil
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from conftest import ROOT_DIR
+from data.data_loader import DataLoader
+from data.ingest import header_rows, header_years, ingest_frame
+
+JSON_DIR = os.path.join(ROOT_DIR, 'web', 'public', 'data')
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=['Country', '1960', '1961', '1962', '1963'])
+
+
+def test_header_rows_detects_labels_and_year_runs():
+    df = _frame([
+        ['Country', 'x', 'y', 'z', 'w'],
+        [None, 1960, 1961, 1962, 1963],
+        ['China', 1960, 1962, 1963, 1964],
+        ['India', 1.5, 2.0, np.nan, 3.0],
+        ['France', 1999, 2000, np.nan, np.nan],
+    ])
+    # 连续递增的年份至少需要3个值，不连续或带小数的数值不是表头
+    assert header_rows(df).tolist() == [True, True, False, False, False]
+
+
+def test_header_years_reads_the_first_year_header():
+    df = _frame([
+        ['Country', 2001, 2002, None, 2004],
+        ['China', 1.0, 2.0, 3.0, 4.0],
+    ])
+    assert header_years(df) == [2001, 2002, None, 2004]
+    assert header_years(df.iloc[1:]) is None
+
+
+def test_ingest_frame_drops_header_blank_and_duplicates():
+    df = _frame([
+        ['Country', None, None, None, None],
+        ['China', 1.0, 2.0, 3.0, 4.0],
+        ['', 1.0, 1.0, 1.0, 1.0],
+        [None, 1.0, 1.0, 1.0, 1.0],
+        [' China ', 9.0, 9.0, 9.0, 9.0],
+        ['India', np.nan, 5.0, 6.0, 7.0],
+    ])
+    provenance = np.arange(len(df) * 4, dtype=np.uint8).reshape(len(df), 4)
+
+    cleaned, kept, dropped = ingest_frame(df, provenance)
+
+    assert dropped == {'header': 1, 'blank': 2, 'duplicate': 1}
+    # 重复的国家保留第一次出现的行
+    assert cleaned['Country'].tolist() == ['China', 'India']
+    assert cleaned.index.tolist() == [0, 1]
+    assert cleaned['1960'].tolist()[0] == 1.0
+    np.testing.assert_array_equal(kept, provenance[[1, 5]])
+
+
+def test_ingest_frame_returns_clean_input_unchanged():
+    df = _frame([['China', 1.0, 2.0, 3.0, 4.0], ['India', 5.0, 6.0, 7.0, 8.0]])
+    cleaned, provenance, dropped = ingest_frame(df)
+
+    assert cleaned is df
+    assert provenance is None
+    assert dropped == {'header': 0, 'blank': 0, 'duplicate': 0}
+
+
+def test_loaded_data_has_no_header_or_duplicate_rows(data_dir):
+    df = DataLoader(data_dir).get_all_data()
+
+    assert not header_rows(df).any()
+    assert not df['Country'].duplicated().any()
+
+
+def _year_columns(df: pd.DataFrame) -> pd.DataFrame:
+    return df[['Country'] + [str(year) for year in range(1948, 2024)]]
+
+
+def test_json_source_matches_excel(data_dir):
+    excel = DataLoader(data_dir)
+    json = DataLoader(data_dir, source='json', json_dir=JSON_DIR, use_snapshots=False)
+
+    pd.testing.assert_frame_equal(_year_columns(json.get_all_data()), _year_columns(excel.get_all_data()),
+                                  check_dtype=False)
+    for continent in ('african', 'europen'):
+        pd.testing.assert_frame_equal(_year_columns(json.get_continent_data(continent)),
+                                      _year_columns(excel.get_continent_data(continent)), check_dtype=False)
+
+
+def test_json_source_falls_back_to_merged_file(data_dir, tmp_path):
+    # 只有合并JSON文件时，合并数据和各大洲数据都从中取出
+    json_dir = tmp_path / 'json'
+    json_dir.mkdir()
+    shutil.copy2(os.path.join(JSON_DIR, 'all_military_data.json'), json_dir)
+
+    loader = DataLoader(data_dir, source='json', json_dir=str(json_dir), use_snapshots=False)
+    excel = DataLoader(data_dir)
+
+    assert sorted(loader.get_all_data()['Country']) == sorted(excel.get_all_data()['Country'])
+    pd.testing.assert_frame_equal(_year_columns(loader.get_continent_data('african')),
+                                  _year_columns(excel.get_continent_data('african')), check_dtype=False)
+
+
+def _write_workbook(file_path: str, rows):
+    workbook = openpyxl.Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    workbook.save(file_path)
+
+
+def test_year_header_names_the_columns(tmp_path):
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    _write_workbook(str(data_dir / 'current_data.xlsx'), [
+        ['Country', 2001, 2002, 2003],
+        ['China', 1.0, '...', 3.0],
+        ['India', 4.0, 5.0, 'xx'],
+    ])
+
+    # 第一个加载器解析Excel文件并写入快照，第二个加载器从快照读取
+    for _ in range(2):
+        loader = DataLoader(str(data_dir))
+        df = loader.get_all_data()
+        assert list(df.columns) == ['Country', '2001', '2002', '2003']
+        assert df['Country'].tolist() == ['China', 'India']
+        assert loader.get_matrix().years == [2001, 2002, 2003]
+        assert df.loc[1, '2002'] == 5.0
+
+    # 年份范围按列名选取：解析Excel文件和读取快照的结果一致
+    for use_snapshots in (False, True):
+        windowed = DataLoader(str(data_dir), year_window=(2002, 2003), use_snapshots=use_snapshots).get_all_data()
+        assert list(windowed.columns) == ['Country', '2002', '2003']
+        assert windowed.loc[0, '2003'] == 3.0
+
+
+def test_rbdata_years_follow_the_workbook_header(data_dir):
+    loader = DataLoader(data_dir)
+    df = loader.get_all_data()
+
+    # current_data.xlsx的表头为1948-2023，没有表头的各大洲文件与之对齐
+    assert loader.get_years_list() == list(range(1948, 2024))
+    assert not [col for col in df.columns if col.startswith('Column_')]
+    usa = df.loc[df['Country'] == 'United States of America']
+    assert usa['2008'].item() == 656756.0
+    american = loader.get_continent_data('american')
+    assert american.loc[american['Country'] == 'United States of America', '2008'].item() == 656756.0
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+"""
+按字节预算淘汰的缓存测试
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.memory_cache import MemoryCache, estimate_nbytes
+
+
+def _cache(budget, policy='lru'):
+    return MemoryCache(budget, policy, sizeof=lambda value: 10)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = _cache(30)
+    for key in 'abc':
+        cache.put(key, key)
+    cache.get('a')
+    cache.put('d', 'd')
+
+    assert 'b' not in cache
+    assert sorted(cache.keys()) == ['a', 'c', 'd']
+    assert cache.stats()['evictions'] == 1
+    assert cache.nbytes == 30
+
+
+def test_lfu_evicts_least_frequently_used():
+    cache = _cache(30, 'lfu')
+    for key in 'abc':
+        cache.put(key, key)
+    for _ in range(3):
+        cache.get('a')
+    cache.get('b')
+    cache.put('d', 'd')
+
+    assert 'c' not in cache
+    assert sorted(cache.keys()) == ['a', 'b', 'd']
+
+
+def test_pinned_entries_are_not_evicted():
+    cache = _cache(20)
+    cache.put('a', 'a', pinned=True)
+    cache.put('b', 'b')
+    cache.put('c', 'c')
+
+    assert cache.is_pinned('a')
+    assert 'a' in cache and 'b' not in cache
+
+    # 以pinned=False再次写入时解除固定
+    cache.put('a', 'a')
+    assert not cache.is_pinned('a')
+
+
+def test_new_entry_is_kept_even_over_budget():
+    cache = MemoryCache(5, sizeof=lambda value: 10)
+    cache.put('a', 'a')
+    assert 'a' in cache
+    cache.put('b', 'b')
+    assert list(cache.keys()) == ['b']
+
+
+def test_set_budget_evicts_immediately():
+    cache = _cache(None)
+    for key in 'abcd':
+        cache.put(key, key)
+    cache.set_budget(20)
+
+    assert sorted(cache.keys()) == ['c', 'd']
+    assert cache.nbytes == 20
+
+
+def test_stats_and_namespaces():
+    cache = _cache(None)
+    data = cache.namespace('data')
+    matrix = cache.namespace('matrix')
+    data['all'] = 1
+    matrix['all'] = 2
+
+    assert data['all'] == 1 and matrix['all'] == 2
+    assert data.get('missing') is None
+    assert data.keys() == ['all']
+    assert len(cache) == 2
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries'], stats['nbytes']) == (2, 1, 2, 20)
+    assert stats['hit_rate'] == pytest.approx(2 / 3)
+
+    del data['all']
+    assert 'all' not in data and 'all' in matrix
+    with pytest.raises(KeyError):
+        data['all']
+
+
+def test_namespace_on_remove_releases_removed_values():
+    cache = _cache(40)
+    released = []
+    charts = cache.namespace('charts', on_remove=released.append)
+    data = cache.namespace('data')
+
+    charts['bar'] = 'bar-1'
+    # 以同一个值重新写入不是替换
+    charts['bar'] = 'bar-1'
+    charts['bar'] = 'bar-2'
+    assert released == ['bar-1']
+
+    # 超出预算被淘汰的图表同样释放，其它命名空间的项不调用回调
+    charts['pie'] = 'pie-1'
+    for key in 'abc':
+        data[key] = key
+    assert released == ['bar-1', 'bar-2']
+    assert 'bar' not in charts and 'pie' in charts
+
+    cache.set_budget(10)
+    assert released == ['bar-1', 'bar-2', 'pie-1']
+    cache.set_budget(None)
+
+    charts['line'] = 'line-1'
+    assert charts.pop('line') == 'line-1'
+    charts['trend'] = 'trend-1'
+    cache.clear()
+    assert released == ['bar-1', 'bar-2', 'pie-1', 'line-1', 'trend-1']
+
+
+def test_namespace_sizeof_and_failing_on_remove(capsys):
+    cache = _cache(None)
+
+    def fail(value):
+        raise RuntimeError('boom')
+
+    charts = cache.namespace('charts', sizeof=len, on_remove=fail)
+    charts['bar'] = 'x' * 100
+    assert charts.size_of('bar') == 100
+    assert cache.nbytes == 100
+
+    # 回调出错时只打印错误，替换照常完成
+    charts['bar'] = 'y'
+    assert charts['bar'] == 'y'
+    assert 'boom' in capsys.readouterr().out
+
+
+def test_loader_shares_its_budget_with_other_namespaces(data_dir):
+    from data.data_loader import DataLoader
+
+    loader = DataLoader(data_dir)
+    loader.get_all_data()
+    released = []
+    charts = loader.cache_namespace('charts', sizeof=lambda value: 1 << 20, on_remove=released.append)
+    charts['bar'] = 'bar'
+
+    assert loader.cache_stats()['nbytes'] >= 1 << 20
+    # 预算不足时图表与数据按同一策略淘汰：之后又读取过数据，最久未使用的是图表
+    df = loader.get_all_data()
+    loader._cache.set_budget(loader.cache_stats()['nbytes'] - 1)
+    assert released == ['bar']
+    assert loader.get_all_data() is df
+    with pytest.raises(ValueError):
+        loader.cache_namespace('data')
+
+
+def test_get_does_not_take_the_lock():
+    cache = _cache(None)
+    cache.put('a', 'a')
+
+    locked = threading.Event()
+    release = threading.Event()
+
+    def hold_lock():
+        with cache._lock:
+            locked.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    locked.wait(5)
+    try:
+        # 其它线程持有缓存锁时读取仍立即返回
+        result = []
+        reader = threading.Thread(target=lambda: result.append((cache.get('a'), cache.peek('a'), 'a' in cache)))
+        reader.start()
+        reader.join(2)
+        assert not reader.is_alive()
+        assert result == [('a', 'a', True)]
+    finally:
+        release.set()
+        holder.join()
+
+
+def test_estimate_nbytes():
+    array = np.zeros((10, 10))
+    df = pd.DataFrame({'a': np.zeros(100)})
+
+    assert estimate_nbytes(array) == 800
+    assert estimate_nbytes((array, array)) == 1600
+    assert estimate_nbytes(df) >= 800
+    assert estimate_nbytes(None) == 0
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        MemoryCache(policy='fifo')
+    with pytest.raises(ValueError):
+        MemoryCache(-1)
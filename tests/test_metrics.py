@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+"""
+多指标查询测试：rbdata派生的指标与SIPRI指标使用同一年份轴
+"""
+
+import numpy as np
+import pytest
+
+from conftest import SIPRI_PATH
+from data.data_analyzer import DataAnalyzer
+from data.data_loader import DataLoader
+
+# 地图视图的指标选择（MapView.VIEW_METRICS）中两类指标各取一个或多个
+RBDATA_METRICS = [None, 'milex_per_capita', 'milex_to_us_trade', 'share_of_world']
+SIPRI_METRICS = ['share_of_gdp', 'current_usd', 'per_capita']
+
+
+@pytest.fixture
+def analyzer(data_dir):
+    return DataAnalyzer(DataLoader(data_dir, sipri_path=SIPRI_PATH))
+
+
+def _value(analyzer, metric, country, year):
+    df = analyzer.get_metric_by_year(metric, year)
+    return df.loc[df['Country'] == country, str(year)].item()
+
+
+def test_metric_families_share_the_year_axis(analyzer):
+    for metric in RBDATA_METRICS + SIPRI_METRICS:
+        years = analyzer._metric_matrix(metric).years
+        assert (years[0], years[-1]) == (1948, 2023), metric
+
+
+def test_one_country_and_year_across_metric_families(analyzer):
+    # rbdata的军费支出为SIPRI现价美元数据：同一年份的值必须一致（年份错位时2020年会取到2008年的值）
+    assert _value(analyzer, None, 'China', 2020) == pytest.approx(_value(analyzer, 'current_usd', 'China', 2020))
+    assert _value(analyzer, None, 'United States of America', 2008) == 656756.0
+
+    # 由rbdata和人口数据派生的人均军费与SIPRI的人均军费同一年份相近（人口为单一年份的数据）
+    assert _value(analyzer, 'milex_per_capita', 'China', 2020) == pytest.approx(
+        _value(analyzer, 'per_capita', 'China', 2020), rel=0.05)
+
+
+def test_rbdata_matches_sipri_current_usd(analyzer):
+    loader = analyzer.data_loader
+    matrix = loader.get_matrix()
+    sipri = loader.get_metric_store().matrix('current_usd')
+
+    common = [country for country in matrix.countries if sipri.has_country(country)]
+    rows = [matrix.row_of(country) for country in common]
+    sipri_rows = [sipri.row_of(country) for country in common]
+    cols = [sipri.col_of(year) for year in matrix.years]
+
+    assert len(common) > 150
+    np.testing.assert_allclose(matrix.values[rows], sipri.values[sipri_rows][:, cols])
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+"""
+SIPRI原始数据流式导入测试
+"""
+
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import SIPRI_PATH
+from data.data_loader import DataLoader
+from data.milex_matrix import OBSERVED, MISSING_OTHER, MISSING_ELLIPSIS, MISSING_XX
+from data.sipri_importer import DEFAULT_SIPRI_SHEET, import_sipri_sheet, list_sheets
+
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+# 共享字符串、内联字符串、缺少的单元格和Z之后的列（AA-AC为年份列）
+_SHARED_STRINGS = ['Country', 'Notes', 'Region', 'Beta', '...']
+_SHEET_ROWS = [
+    '<row r="1"><c r="A1" t="inlineStr"><is><t>Military expenditure</t></is></c></row>',
+    '<row r="2"><c r="A2" t="s"><v>0</v></c><c r="B2" t="s"><v>1</v></c>'
+    '<c r="AA2"><v>2001</v></c><c r="AB2"><v>2002</v></c><c r="AC2"><v>2003</v></c></row>',
+    '<row r="3"><c r="A3" t="s"><v>2</v></c></row>',
+    '<row r="4"><c r="A4" t="inlineStr"><is><r><t>Al</t></r><r><t>pha</t></r></is></c>'
+    '<c r="AA4"><v>1.5</v></c><c r="AC4" t="s"><v>4</v></c></row>',
+    '<row r="5"><c r="A5" t="s"><v>3</v></c><c r="AB5" t="inlineStr"><is><t>xxx</t></is></c>'
+    '<c r="AC5"><v>3.25</v></c></row>',
+    '<row r="6"/>',
+]
+
+
+def _write_workbook(file_path: str):
+    """写入只有一个工作表'Sheet'的最小xlsx文件"""
+    parts = {
+        '[Content_Types].xml': (
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '<Override PartName="/xl/sharedStrings.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+            '</Types>'
+        ),
+        '_rels/.rels': (
+            f'<Relationships xmlns="{_PKG_REL_NS}">'
+            f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ),
+        'xl/workbook.xml': (
+            f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+            '<sheets><sheet name="Sheet" sheetId="1" r:id="rId1"/></sheets></workbook>'
+        ),
+        'xl/_rels/workbook.xml.rels': (
+            f'<Relationships xmlns="{_PKG_REL_NS}">'
+            f'<Relationship Id="rId1" Type="{_REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+            f'<Relationship Id="rId2" Type="{_REL_NS}/sharedStrings" Target="sharedStrings.xml"/>'
+            '</Relationships>'
+        ),
+        'xl/sharedStrings.xml': (
+            f'<sst xmlns="{_MAIN_NS}">' + ''.join(f'<si><t>{text}</t></si>' for text in _SHARED_STRINGS) + '</sst>'
+        ),
+        'xl/worksheets/sheet1.xml': (
+            f'<worksheet xmlns="{_MAIN_NS}"><sheetData>' + ''.join(_SHEET_ROWS) + '</sheetData></worksheet>'
+        ),
+    }
+    with zipfile.ZipFile(file_path, 'w') as zf:
+        for name, content in parts.items():
+            zf.writestr(name, content)
+
+
+def _expected_from_read_excel(file_path: str, sheet_name: str):
+    """用pd.read_excel按导入规则取出国家行：表头行之后第一列为名称、年份列中有单元格的行"""
+    df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
+    header = df.index[df.iloc[:, 0] == 'Country'][0]
+    year_columns = [col for col in df.columns if isinstance(df.loc[header, col], (int, float))
+                    and not pd.isna(df.loc[header, col])]
+    body = df.loc[header + 1:]
+    names = body.iloc[:, 0]
+    keep = names.apply(lambda name: isinstance(name, str) and bool(name.strip())) & body[year_columns].notna().any(axis=1)
+    body = body[keep]
+
+    years = [int(df.loc[header, col]) for col in year_columns]
+    values = body[year_columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    return body.iloc[:, 0].str.strip().tolist(), years, values
+
+
+def test_small_workbook(tmp_path):
+    file_path = str(tmp_path / 'small.xlsx')
+    _write_workbook(file_path)
+
+    matrix = import_sipri_sheet(file_path, 'Sheet', first_year=2000, last_year=2010)
+
+    assert list_sheets(file_path) == {'Sheet': 'xl/worksheets/sheet1.xml'}
+    assert matrix.countries == ['Alpha', 'Beta']
+    assert matrix.years == [2001, 2002, 2003]
+    np.testing.assert_array_equal(matrix.values, [[1.5, np.nan, np.nan], [np.nan, np.nan, 3.25]])
+    np.testing.assert_array_equal(matrix.provenance, [[OBSERVED, MISSING_OTHER, MISSING_ELLIPSIS],
+                                                      [MISSING_OTHER, MISSING_XX, OBSERVED]])
+
+    countries, years, values = _expected_from_read_excel(file_path, 'Sheet')
+    assert (countries, years) == (matrix.countries, matrix.years)
+    np.testing.assert_array_equal(matrix.values, values)
+
+
+def test_unknown_sheet_is_rejected(tmp_path):
+    file_path = str(tmp_path / 'small.xlsx')
+    _write_workbook(file_path)
+
+    with pytest.raises(ValueError):
+        import_sipri_sheet(file_path, 'Missing')
+
+
+@pytest.mark.parametrize('sheet_name', [DEFAULT_SIPRI_SHEET, 'Share of GDP'])
+def test_sipri_workbook_matches_read_excel(sheet_name):
+    matrix = import_sipri_sheet(SIPRI_PATH, sheet_name)
+    countries, years, values = _expected_from_read_excel(SIPRI_PATH, sheet_name)
+
+    assert matrix.years == list(range(1948, 2024))
+    assert years == matrix.years
+    assert matrix.countries == countries
+    assert matrix.values.shape == (len(countries), 76)
+    np.testing.assert_array_equal(matrix.values, values)
+
+
+def test_sipri_known_cells():
+    matrix = import_sipri_sheet(SIPRI_PATH, 'Current US$')
+    countries, years, values = _expected_from_read_excel(SIPRI_PATH, 'Current US$')
+
+    for country, year in [('United States of America', 2008), ('China', 2020), ('Algeria', 1975)]:
+        expected = values[countries.index(country), years.index(year)]
+        assert matrix.values[matrix.row_of(country), matrix.col_of(year)] == expected
+    # 与rbdata中的现价美元数据一致
+    assert matrix.values[matrix.row_of('United States of America'), matrix.col_of(2008)] == pytest.approx(656756.0)
+
+
+def test_loader_caches_and_snapshots_the_sheet(data_dir):
+    loader = DataLoader(data_dir, sipri_path=SIPRI_PATH)
+    matrix = loader.get_sipri_matrix()
+    assert loader.get_sipri_matrix() is matrix
+
+    # 第二个加载器从快照读取
+    reloaded = DataLoader(data_dir, sipri_path=SIPRI_PATH).get_sipri_matrix()
+    assert reloaded.countries == matrix.countries
+    assert reloaded.years == matrix.years
+    np.testing.assert_array_equal(reloaded.values, matrix.values)
+    np.testing.assert_array_equal(reloaded.provenance, matrix.provenance)
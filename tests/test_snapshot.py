@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""
+二进制快照读写测试
+"""
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from data.data_loader import DataLoader
+from data.snapshot import load_snapshot, save_snapshot
+
+
+def test_round_trip_keeps_missing_names(tmp_path):
+    df = pd.DataFrame({'Country': ['China', None, np.nan, 'nan'], '2000': [1.0, 2.0, np.nan, 4.0]})
+    provenance = np.zeros((4, 1), dtype=np.uint8)
+    file_path = str(tmp_path / 'data.npz')
+
+    save_snapshot(file_path, df, 'digest', provenance)
+    loaded, loaded_provenance = load_snapshot(file_path, 'digest')
+
+    # 缺失的名称还原为缺失值，名称本身为"nan"的国家保持不变
+    assert loaded['Country'].isna().tolist() == [False, True, True, False]
+    assert loaded.loc[[0, 3], 'Country'].tolist() == ['China', 'nan']
+    pd.testing.assert_frame_equal(loaded[['2000']], df[['2000']])
+    np.testing.assert_array_equal(loaded_provenance, provenance)
+
+
+def test_blank_name_row_is_dropped_after_snapshot_reload(tmp_path):
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    workbook = openpyxl.Workbook()
+    for row in [['Country', 2001, 2002, 2003], ['China', 1.0, 2.0, 3.0], [None, 4.0, 5.0, 6.0]]:
+        workbook.active.append(row)
+    workbook.save(str(data_dir / 'current_data.xlsx'))
+
+    # 第一个加载器解析Excel文件并写入快照，第二个加载器从快照读取
+    parsed = DataLoader(str(data_dir)).get_all_data()
+    reloaded = DataLoader(str(data_dir)).get_all_data()
+
+    assert parsed['Country'].tolist() == ['China']
+    pd.testing.assert_frame_equal(reloaded, parsed, check_dtype=False)
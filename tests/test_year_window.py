@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+"""
+快照按列区间读取和部分年份加载测试
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.data_analyzer import DataAnalyzer
+from data.data_loader import DataLoader
+from data.snapshot import load_snapshot, save_snapshot
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    rng = np.random.default_rng(0)
+    values = rng.random((7, 12))
+    values[2, 3] = np.nan
+    df = pd.DataFrame(values, columns=[str(year) for year in range(2000, 2012)])
+    df.insert(0, 'Country', [f"C{i}" for i in range(7)])
+    provenance = rng.integers(0, 4, size=values.shape).astype(np.uint8)
+
+    file_path = str(tmp_path / 'data.npz')
+    save_snapshot(file_path, df, 'digest', provenance)
+    return file_path, df, provenance
+
+
+@pytest.mark.parametrize('column_range', [(0, 12), (0, 1), (3, 8), (11, 12), (5, 5)])
+def test_column_range_matches_full_read(snapshot, column_range):
+    file_path, df, provenance = snapshot
+    start, stop = column_range
+
+    loaded, loaded_provenance = load_snapshot(file_path, 'digest', column_range)
+
+    pd.testing.assert_frame_equal(loaded, df[['Country'] + list(df.columns[1 + start:1 + stop])])
+    np.testing.assert_array_equal(loaded_provenance, provenance[:, start:stop])
+
+
+def test_column_range_is_clamped(snapshot):
+    file_path, df, provenance = snapshot
+
+    loaded, loaded_provenance = load_snapshot(file_path, 'digest', (10, 40))
+
+    assert list(loaded.columns) == ['Country', '2010', '2011']
+    np.testing.assert_array_equal(loaded_provenance, provenance[:, 10:])
+
+
+def test_stale_digest_is_rejected(snapshot):
+    file_path, _, _ = snapshot
+    assert load_snapshot(file_path, 'other', (0, 3)) is None
+
+
+def test_window_matches_full_load(data_dir):
+    full = DataLoader(data_dir).get_all_data()
+    # 第一个加载器写入完整快照，这个加载器只读取快照中的部分列
+    windowed = DataLoader(data_dir, year_window=(1990, 2000)).get_all_data()
+
+    columns = ['Country'] + [str(year) for year in range(1990, 2001)]
+    assert list(windowed.columns) == columns
+    pd.testing.assert_frame_equal(windowed, full[columns])
+
+
+def test_window_widens_on_demand(data_dir):
+    full = DataAnalyzer(DataLoader(data_dir))
+    loader = DataLoader(data_dir, year_window=(2000, 2010))
+    analyzer = DataAnalyzer(loader)
+
+    pd.testing.assert_frame_equal(analyzer.get_top_countries(1995, 5), full.get_top_countries(1995, 5))
+    assert loader.year_window == (1995, 2010)
+    # 源数据中没有的年份不扩大范围
+    assert loader.ensure_years(1900)
+    assert loader.year_window == (1995, 2010)
+
+
+def test_window_is_not_widened_after_edits(data_dir):
+    loader = DataLoader(data_dir, year_window=(2000, 2010))
+    loader.patch_cells({('China', 2005): 1.0})
+
+    assert not loader.ensure_years(1990)
+    assert loader.year_window == (2000, 2010)
+    china = loader.get_all_data()
+    assert china.loc[china['Country'] == 'China', '2005'].item() == 1.0
+
+
+def test_edits_widen_the_window_first(data_dir):
+    loader = DataLoader(data_dir, year_window=(2000, 2010))
+    loader.patch_cells({('China', 2015): 2.0})
+    assert loader.year_window == (2000, 2015)
+
+    loader = DataLoader(data_dir, year_window=(2000, 2010))
+    loader.append_year(2024, {'China': 3.0})
+    assert loader.get_matrix().years == list(range(2000, 2025))
+
+    # 源数据中已有的年份不能追加
+    loader = DataLoader(data_dir, year_window=(2000, 2010))
+    with pytest.raises(ValueError):
+        loader.append_year(2011, {'China': 3.0})